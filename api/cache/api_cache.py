@@ -10,3 +10,13 @@ cache = Cache(
         'CACHE_DEFAULT_TIMEOUT': 60 * 20,
     },
 )
+
+# results of the yang-search queries kept in the memory of each API process, the index generation is part
+# of the keys, so results computed before the indices changed are never returned and just expire
+search_cache = Cache(
+    config={
+        'CACHE_TYPE': 'SimpleCache',
+        'CACHE_THRESHOLD': 500,
+        'CACHE_DEFAULT_TIMEOUT': 60 * 10,
+    },
+)
@@ -95,6 +95,7 @@ class MyFlask(Flask):
         self.config['S-OPENSEARCH-CREDENTIALS'] = self.config.s_opensearch_secret.strip('"').split()
         self.config['S-CONFD-CREDENTIALS'] = self.config.s_confd_credentials.strip('"').split()
         self.config['OPENSEARCH-MANAGER'] = OpenSearchManager()
+        self.config.setdefault('D-INDEX-GENERATION', '/var/yang/index_generation')
 
         celery_app.load_config()
         self.config['CELERY-APP'] = celery_app
@@ -0,0 +1,227 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+"""
+In-memory autocompletion of module names, organizations and drafts. The vocabularies are loaded from OpenSearch
+into compressed prefix tries in each API worker, and reloaded in the background when the generation
+of the indices changes, at most once per MIN_REBUILD_INTERVAL, as the generation is bumped after each indexing batch.
+"""
+
+import threading
+import time
+import typing as t
+from collections import Counter
+from logging import Logger
+
+from opensearch_indexing.index_generation import get_index_generation
+from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+from opensearch_indexing.opensearch_manager import OpenSearchManager
+
+COMPLETIONS_SIZE = 15
+MIN_REBUILD_INTERVAL = 5 * 60
+SEPARATORS = '-_.'
+
+
+class _Node:
+    __slots__ = ('children', 'term_ids', 'top')
+
+    def __init__(self):
+        # first character of the edge label -> (edge label, child node)
+        self.children: dict[str, tuple[str, _Node]] = {}
+        self.term_ids: list[int] = []
+        self.top: t.Optional[list[str]] = None
+
+
+class CompletionTrie:
+    """
+    Compressed prefix trie of terms, ranked by their weights. Terms are matched case-insensitively
+    from their start, and from the start of each of their parts delimited by the SEPARATORS,
+    e.g. 'ietf-yang-types' is completed for 'ietf-y', 'yang' and '-types'.
+    """
+
+    def __init__(self, weights: dict[str, int], size: int = COMPLETIONS_SIZE):
+        """
+        Arguments:
+            :param weights  (dict[str, int]) Terms with their weights, terms with higher weights are ranked first
+            :param size     (int) Maximal number of completions returned
+        """
+        self.size = size
+        self._root = _Node()
+        # terms are ranked by their weight and then alphabetically, like the terms aggregation of OpenSearch
+        self._terms = sorted(weights, key=lambda term: (-weights[term], term))
+        for term_id, term in enumerate(self._terms):
+            for key in self._keys(term.lower()):
+                self._insert(key, term_id)
+
+    def complete(self, pattern: str) -> list[str]:
+        """Return the best ranked terms matching the pattern."""
+        # parts are indexed without their leading separators, so '-types' is completed like 'types'
+        pattern = pattern.lower().lstrip(SEPARATORS) if pattern[:1] in SEPARATORS else pattern.lower()
+        node = self._find(pattern)
+        if node is None:
+            return []
+        if node.top is None:
+            # the ranking of a node is computed at its first lookup, and kept until the trie is rebuilt
+            node.top = [self._terms[term_id] for term_id in sorted(self._subtree_term_ids(node))[: self.size]]
+        return node.top
+
+    def _keys(self, term: str) -> set[str]:
+        keys = {term}
+        for position, character in enumerate(term):
+            if character in SEPARATORS:
+                keys.add(term[position + 1 :])
+        keys.discard('')
+        return keys
+
+    def _insert(self, key: str, term_id: int):
+        node = self._root
+        while key:
+            edge = node.children.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.children[key[0]] = (key, child)
+                node = child
+                break
+            label, child = edge
+            common = 0
+            while common < min(len(label), len(key)) and label[common] == key[common]:
+                common += 1
+            if common < len(label):
+                # split the edge at the end of the common part
+                middle = _Node()
+                middle.children[label[common]] = (label[common:], child)
+                node.children[key[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            key = key[common:]
+        node.term_ids.append(term_id)
+
+    def _find(self, pattern: str) -> t.Optional[_Node]:
+        node = self._root
+        while pattern:
+            edge = node.children.get(pattern[0])
+            if edge is None:
+                return None
+            label, child = edge
+            if pattern.startswith(label):
+                pattern = pattern[len(label) :]
+            elif label.startswith(pattern):
+                pattern = ''
+            else:
+                return None
+            node = child
+        return node
+
+    def _subtree_term_ids(self, node: _Node) -> set[int]:
+        term_ids = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            term_ids.update(node.term_ids)
+            stack.extend(child for _, child in node.children.values())
+        return term_ids
+
+
+class Completions:
+    """Completion tries of a single API worker, rebuilt in a background thread when the indices change."""
+
+    def __init__(
+        self,
+        opensearch_manager: OpenSearchManager,
+        index_generation_path: str,
+        logger: Logger,
+        min_rebuild_interval: float = MIN_REBUILD_INTERVAL,
+    ):
+        """
+        Arguments:
+            :param opensearch_manager       (OpenSearchManager) Manager used to load the vocabularies
+            :param index_generation_path    (str) Path to the file with the generation of the indices
+            :param logger                   (Logger)
+            :param min_rebuild_interval     (float) Minimal number of seconds between the starts of two rebuilds
+        """
+        self._opensearch_manager = opensearch_manager
+        self._index_generation_path = index_generation_path
+        self._logger = logger
+        self._tries: t.Optional[dict[str, CompletionTrie]] = None
+        self._generation: t.Optional[int] = None
+        self._min_rebuild_interval = min_rebuild_interval
+        self._rebuild_started_at: t.Optional[float] = None
+        self._lock = threading.Lock()
+
+    def complete(self, keyword: str, pattern: str) -> t.Optional[list[str]]:
+        """
+        Return the completions of the pattern, or None if the tries were not built yet.
+        Until a rebuild for the new generation of the indices finishes, completions come from the previous tries,
+        a new generation is loaded only once min_rebuild_interval passed since the start of the previous rebuild.
+
+        Arguments:
+            :param keyword  (str) Type of what we are autocompleting 'module', 'organization' or 'draft'
+            :param pattern  (str) Searched string - input from user
+        """
+        generation = get_index_generation(self._index_generation_path)
+        if generation != self._generation:
+            self._start_rebuild(generation)
+        tries = self._tries
+        if tries is None:
+            return None
+        return tries[keyword].complete(pattern)
+
+    def _start_rebuild(self, generation: int):
+        with self._lock:
+            if generation == self._generation:
+                return
+            now = time.monotonic()
+            if self._rebuild_started_at is not None and now - self._rebuild_started_at < self._min_rebuild_interval:
+                return
+            self._generation = generation
+            self._rebuild_started_at = now
+        threading.Thread(target=self._rebuild, args=(generation,), daemon=True).start()
+
+    def _rebuild(self, generation: int):
+        try:
+            names = Counter()
+            organizations = Counter()
+            for document in self._opensearch_manager.scan_all(
+                OpenSearchIndices.AUTOCOMPLETE,
+                source=['name', 'organization'],
+            ):
+                if document.get('name'):
+                    names[document['name']] += 1
+                if document.get('organization'):
+                    organizations[document['organization']] += 1
+            drafts = Counter(
+                document['draft']
+                for document in self._opensearch_manager.scan_all(OpenSearchIndices.DRAFTS, source=['draft'])
+                if document.get('draft')
+            )
+            tries = {
+                'module': CompletionTrie(names),
+                'organization': CompletionTrie(organizations),
+                'draft': CompletionTrie(drafts),
+            }
+        except Exception:
+            self._logger.exception(f'Problem while loading the completions of index generation {generation}')
+            with self._lock:
+                if self._generation == generation:
+                    # let the next request try again
+                    self._generation = None
+            return
+        with self._lock:
+            # a rebuild of an older generation which finished late must not replace newer tries
+            if self._tries is None or self._generation == generation:
+                self._tries = tries
+        self._logger.info(f'Completions of index generation {generation} loaded')
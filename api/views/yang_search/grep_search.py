@@ -9,6 +9,7 @@ from api.cache.api_cache import cache
 from api.views.yang_search.constants import GREP_SEARCH_CACHE_TIMEOUT
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
+from opensearch_indexing.query_templates import get_template
 from utility import log
 from utility.create_config import create_config
 from utility.staticVariables import ORGANIZATIONS
@@ -35,9 +36,7 @@ class GrepSearch:
 
         self.listdir_results_cache_key = f'listdir_{self.all_modules_directory}'
 
-        query_path = os.path.join(os.environ['BACKEND'], 'api', 'views', 'yang_search', 'json', 'grep_search.json')
-        with open(query_path) as query_file:
-            self.query = json.load(query_file)
+        self.query = get_template('api/views/yang_search/json/grep_search.json')
 
         log_file_path = os.path.join(config.get('Directory-Section', 'logs'), 'yang.log')
         self.logger = log.get_logger('yc-opensearch', log_file_path)
@@ -17,6 +17,7 @@ __copyright__ = 'Copyright The IETF Trust 2021, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
+import hashlib
 import json
 import os
 
@@ -26,6 +27,7 @@ import api.views.yang_search.search_params as sp
 from api.views.yang_search.response_row import ResponseRow
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
+from opensearch_indexing.query_templates import get_template
 from redisConnections.redisConnection import RedisConnection
 from utility import log
 from utility.staticVariables import OUTPUT_COLUMNS
@@ -60,9 +62,7 @@ class OpenSearchQuery:
             :param search_params    (SearchParams) Contains search parameters
         """
         self._search_params = search_params
-        search_query_path = os.path.join(os.environ['BACKEND'], 'api/views/yang_search/json/search.json')
-        with open(search_query_path, encoding='utf-8') as reader:
-            self.query: dict = json.load(reader)
+        self.query: dict = get_template('api/views/yang_search/json/search.json')
         self._opensearch_manager = opensearch_manager
         self._redis_connection = redis_connection
         self._latest_revisions = {}
@@ -165,6 +165,24 @@ class OpenSearchQuery:
                         },
                     )
 
+    def cache_key(self, index_generation: int) -> str:
+        """
+        Return the key of the search results in the search cache. Searches whose constructed queries
+        and post-processing options are the same share the key, as long as the indices don't change.
+
+        Argument:
+            :param index_generation     (int) Current generation of the OpenSearch indices
+        """
+        key = {
+            'index-generation': index_generation,
+            'query': self.query,
+            'latest-revision': self._search_params.latest_revision,
+            'include-mibs': self._search_params.include_mibs,
+            'yang-versions': sorted(set(self._search_params.yang_versions)),
+            'remove-columns': sorted(self._remove_columns),
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
     def search(self) -> tuple[list[dict], bool]:
         """
         Search using the query we've constructed.
@@ -201,21 +219,23 @@ class OpenSearchQuery:
         return hits
 
     def _process_hits(self, hits: list) -> list[dict]:
-        response_rows: list[dict] = []
-        reject: set[str] = set()
+        rows: list[tuple[ResponseRow, str]] = []
         for hit in hits:
             row = ResponseRow(source=hit['_source'])
             module_key = f'{row.module_name}@{row.revision}/{row.organization}'
-            if module_key in reject:
-                continue
-
             module_latest_revision = self._latest_revisions.get(row.module_name, '')
             if self._search_params.latest_revision and row.revision != module_latest_revision:
-                reject.add(module_key)
                 continue
+            rows.append((row, module_key))
+        # metadata of all the modules are fetched from Redis at once, instead of a request for each hit
+        modules_data = self._redis_connection.get_modules(list({module_key for _, module_key in rows}))
 
-            module_data = self._redis_connection.get_module(module_key)
-            module_data = json.loads(module_data)
+        response_rows: list[dict] = []
+        reject: set[str] = set()
+        for row, module_key in rows:
+            if module_key in reject:
+                continue
+            module_data = modules_data.get(module_key)
             if not module_data:
                 self.logger.error(f'Failed to get module from Redis, but found in OpenSearch: {module_key}')
                 reject.add(module_key)
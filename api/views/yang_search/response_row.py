@@ -17,7 +17,6 @@ __copyright__ = 'Copyright The IETF Trust 2022, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'slavomir.mazur@pantheon.tech'
 
-import hashlib
 import typing as t
 from collections import OrderedDict
 
@@ -41,14 +40,9 @@ class ResponseRow:
         self.row_representation = OrderedDict()
         self.output_row = {}
 
-    def get_row_hash_by_columns(self) -> str:
-        """Return hash which is created from individual row properties."""
-        row_hash = hashlib.sha256()
-
-        for value in self.output_row.values():
-            row_hash.update(str(value).encode('utf-8'))
-
-        return row_hash.hexdigest()
+    def get_row_hash_by_columns(self) -> tuple:
+        """Return hashable key which is created from individual row properties."""
+        return tuple(self.output_row.values())
 
     def create_representation(self) -> None:
         """Create dictionary representation of row."""
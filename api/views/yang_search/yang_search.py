@@ -34,20 +34,23 @@ from werkzeug.exceptions import abort
 
 import api.views.yang_search.search_params as sp
 import utility.log as log
-from api.cache.api_cache import cache
+from api.cache.api_cache import cache, search_cache
 from api.my_flask import app
+from api.views.yang_search.completions import Completions
 from api.views.yang_search.constants import GREP_SEARCH_CACHE_TIMEOUT
 from api.views.yang_search.grep_search import GrepSearch
 from api.views.yang_search.opensearch_query import OpenSearchQuery
+from opensearch_indexing.index_generation import get_index_generation
 from opensearch_indexing.models.keywords_names import KeywordsNames
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from utility.create_config import create_config
 from utility.staticVariables import MODULE_PROPERTIES_ORDER, OUTPUT_COLUMNS, SCHEMA_TYPES
-from utility.yangParser import create_context
+from utility.yangParser import create_context, get_unparsable_modules_recorder
 
 
 class YangSearchBlueprint(Blueprint):
     logger: Logger
+    completions: Completions
 
 
 bp = YangSearchBlueprint('yang_search', __name__)
@@ -58,6 +61,11 @@ def init_logger(state):
     bp.logger = log.get_logger('yang-search', f'{state.app.config.d_logs}/yang.log')
 
 
+@bp.record
+def init_completions(state):
+    bp.completions = Completions(state.app.config.opensearch_manager, state.app.config.d_index_generation, bp.logger)
+
+
 @bp.before_request
 def set_config():
     global app_config
@@ -258,12 +266,8 @@ def impact_analysis():
         'dependents': [],
         'dependencies': [],
     }
-    # this file is created and updated on yangParser exceptions
-    try:
-        with open(os.path.join(app_config.d_var, 'unparsable-modules.json')) as f:
-            unparsable_modules = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        unparsable_modules = []
+    # these files are created and updated on yangParser exceptions
+    unparsable_modules = get_unparsable_modules_recorder(app_config.d_var).modules()
 
     def unparsable(module):
         if 'revision' in module and f'{module["name"]}@{module["revision"]}.yang' in unparsable_modules:
@@ -319,18 +323,9 @@ def search():
         schema_types=is_list_in(payload, 'schema-types', SCHEMA_TYPES),
         output_columns=is_list_in(payload, 'output-columns', OUTPUT_COLUMNS),
     )
-    opensearch_search = OpenSearchQuery(
-        app_config.d_logs,
-        app_config.opensearch_manager,
-        app.redisConnection,
-        search_params,
-    )
-    response = {}
-    response['rows'], response['max-hits'] = opensearch_search.search()
+    response = run_search(search_params)
     if payload.get('sub-search'):
         response['max-hits'] = False
-    response['warning'] = opensearch_search.alerts()
-    response['timeout'] = opensearch_search.timeout
     return response
 
 
@@ -363,16 +358,33 @@ def advanced_search():
         output_columns=is_list_in(payload, 'output-columns', OUTPUT_COLUMNS),
         include_drafts=is_boolean(payload, 'include-drafts', True),
     )
+    return run_search(search_params)
+
+
+def run_search(search_params: sp.SearchParams) -> dict:
+    """
+    Run the search in OpenSearch, or return its results from the search cache
+    if the same search was already run since the last change of the indices.
+
+    Argument:
+        :param search_params    (SearchParams) Contains search parameters
+    :return: response with the rows, max-hits, warning and timeout
+    """
     opensearch_search = OpenSearchQuery(
         app_config.d_logs,
         app_config.opensearch_manager,
         app.redisConnection,
         search_params,
     )
+    cache_key = opensearch_search.cache_key(get_index_generation(app_config.d_index_generation))
+    if (response := search_cache.get(cache_key)) is not None:
+        return response
     response = {}
     response['rows'], response['max-hits'] = opensearch_search.search()
     response['warning'] = opensearch_search.alerts()
     response['timeout'] = opensearch_search.timeout
+    if not response['timeout']:
+        search_cache.set(cache_key, response)
     return response
 
 
@@ -391,6 +403,12 @@ def get_services_list(keyword: str, pattern: str):
     if not pattern:
         return make_response(jsonify(result), 200)
 
+    if keyword in ('module', 'organization', 'draft'):
+        # answered from the in-memory tries of this worker, OpenSearch is queried only until they are loaded
+        completions = bp.completions.complete(keyword, pattern)
+        if completions is not None:
+            return make_response(jsonify(completions), 200)
+
     if keyword == 'organization':
         result = app_config.opensearch_manager.autocomplete(
             OpenSearchIndices.AUTOCOMPLETE,
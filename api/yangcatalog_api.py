@@ -52,7 +52,7 @@ from flask_cors import CORS
 from werkzeug.exceptions import abort
 
 import api.authentication.auth as auth
-from api.cache.api_cache import cache
+from api.cache.api_cache import cache, search_cache
 from api.my_flask import MyFlask
 from api.views.admin import bp as admin_bp
 from api.views.admin import ietf_auth
@@ -73,6 +73,7 @@ if app_config.g_is_prod:
     ietf_auth.init_app(app)
 
 cache.init_app(app)
+search_cache.init_app(app)
 
 # Register blueprint(s)
 app.register_blueprint(admin_bp)
@@ -31,16 +31,9 @@ class BackendCeleryApp(Celery):
         self.redis_connection = RedisConnection(config=config)
         self.notify_indexing = config.get('General-Section', 'notify-index') == 'True'
         self.save_file_dir = config.get('Directory-Section', 'save-file-dir')
-        changes_cache_path = config.get('Directory-Section', 'changes-cache')
-        delete_cache_path = config.get('Directory-Section', 'delete-cache')
-        failed_changes_cache_path = config.get('Directory-Section', 'changes-cache-failed')
-        lock_file = config.get('Directory-Section', 'lock')
         self.yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
         self.indexing_paths = ESIndexingPaths(
-            cache_path=changes_cache_path,
-            deletes_path=delete_cache_path,
-            failed_path=failed_changes_cache_path,
-            lock_path=lock_file,
+            queue_path=config.get('Directory-Section', 'indexing-queue', fallback='/var/yang/indexing_queue.db'),
         )
         self.confd_credentials = tuple(config.get('Secrets-Section', 'confd-credentials').strip('"').split())
         self.logger.info('Config loaded succesfully')
@@ -20,9 +20,20 @@ __email__ = 'bohdan.konovalenko@pantheon.tech'
 import functools
 import json
 import shutil
+import time
 import typing as t
+from collections import defaultdict, deque
+
+from celery.signals import celeryd_init, task_postrun, task_prerun, worker_init
 
 from jobs.app import BackendCeleryApp
+from jobs.celery_configuration import (
+    TASK_CLASSES,
+    task_default_queue,
+    task_routes,
+    worker_class_options,
+    worker_class_queues,
+)
 from jobs.status_messages import StatusMessage
 from redisConnections.redisConnection import key_quote
 from utility.opensearch_util import prepare_for_es_removal, send_for_es_indexing
@@ -33,6 +44,85 @@ celery_app.config_from_object('jobs.celery_configuration')
 
 # celery_app.autodiscover_tasks()  # for celery versions higher than 5.0.1
 
+# number of finished tasks, and their total and maximum duration in seconds per task class
+task_class_metrics: dict[str, dict[str, float]] = defaultdict(lambda: {'count': 0, 'total': 0.0, 'max': 0.0})
+_task_start_times: dict[str, float] = {}
+
+
+def get_task_class(task_name: str) -> str:
+    return task_routes.get(task_name, {}).get('queue', task_default_queue)
+
+
+def get_worker_class(hostname: str) -> t.Optional[str]:
+    """Return the task class of a worker whose node name starts with it (e.g. interactive@hostname)."""
+    task_class = hostname.split('@')[0]
+    return task_class if task_class in TASK_CLASSES else None
+
+
+@celeryd_init.connect
+def configure_worker_class_queues(sender: str, instance, options: dict, **kwargs):
+    """
+    Make a worker of a task class consume only the queues of the class.
+    Queues passed with the -Q option take precedence.
+    """
+    task_class = get_worker_class(sender)
+    if task_class is None or options.get('queues'):
+        return
+    instance.app.amqp.queues.select(worker_class_queues[task_class])
+    celery_app.logger.info(f'Worker {sender} consumes the {", ".join(worker_class_queues[task_class])} queues')
+
+
+@worker_init.connect
+def configure_worker_class_options(sender, **kwargs):
+    """
+    Set the concurrency and prefetch multiplier of a worker of a task class.
+    They are set once the options of the command line are applied, but before the pool is created,
+    because the command line always passes its defaults read from the configuration, which override it.
+    """
+    task_class = get_worker_class(sender.hostname)
+    if task_class is None:
+        return
+    options = worker_class_options[task_class]
+    sender.concurrency = options['concurrency']
+    sender.prefetch_multiplier = options['prefetch_multiplier']
+    celery_app.logger.info(f'Worker {sender.hostname} configured for {task_class} tasks with options {options}')
+
+
+def serialize_catalog_writes(task):
+    """
+    Run the task while holding the write lock of the catalog. Used for tasks which read the catalog from Redis,
+    and write it back updated, so they don't interleave with the writes of tasks running in workers of other classes.
+    """
+
+    @functools.wraps(task)
+    def _serialized(*args, **kwargs):
+        with celery_app.redis_connection.catalog_write_lock():
+            return task(*args, **kwargs)
+
+    return _serialized
+
+
+@task_prerun.connect
+def start_task_timer(task_id: str, **kwargs):
+    _task_start_times[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_time(task_id: str, task, state: t.Optional[str] = None, **kwargs):
+    start = _task_start_times.pop(task_id, None)
+    if start is None:
+        return
+    duration = time.perf_counter() - start
+    task_class = get_task_class(task.name)
+    metrics = task_class_metrics[task_class]
+    metrics['count'] += 1
+    metrics['total'] += duration
+    metrics['max'] = max(metrics['max'], duration)
+    celery_app.logger.info(
+        f'Task {task.name} [{task_id}] of the {task_class} class finished with state {state} in {duration:.2f}s, '
+        f'{int(metrics["count"])} {task_class} tasks took {metrics["total"]:.2f}s in total',
+    )
+
 
 @celery_app.task
 def test_task(s: str, n: int):
@@ -65,6 +155,7 @@ def process(dir: str, sdo: bool, api: bool):
 
 
 @celery_app.task
+@serialize_catalog_writes
 def process_vendor_deletion(params: dict[str, str]):
     """
     Deleting vendors metadata. Deletes all the modules in the vendor branch of the yang-catalog.yang
@@ -88,62 +179,62 @@ def process_vendor_deletion(params: dict[str, str]):
     deleted_modules = []
     iterate_in_depth(vendor_data, modules_keys)
 
-    # Delete implementation
+    redis_keys = {}
     for mod_key in modules_keys:
-        try:
-            name, revision, organization = mod_key.split(',')
-            redis_key = f'{name}@{revision}/{organization}'
-            raw_data = celery_app.redis_connection.get_module(redis_key)
-            modules_data = json.loads(raw_data)
-            implementations = modules_data.get('implementations', {}).get('implementation', [])
-
-            count_of_implementations = len(implementations)
-            count_deleted = 0
-            for implementation in implementations:
-                imp_key = ''
-                for param_name in param_names:
-                    if not (param := params.get(param_name)) or param == implementation[param_name]:
-                        imp_key += f',{implementation[param_name]}'
-                imp_key = imp_key.removeprefix(',')
-
-                # Delete module implementation from Redis
-                if response := celery_app.redis_connection.delete_implementation(redis_key, imp_key):
-                    celery_app.logger.info(f'Implementation {imp_key} deleted from module {mod_key} successfully')
-                elif response == 0:
-                    celery_app.logger.debug(f'Implementation {imp_key} already deleted from module {mod_key}')
-                count_deleted += 1
-
-            if count_deleted == count_of_implementations and count_of_implementations != 0:
-                if organization == params['vendor']:
-                    deletion_problem = False
-
-                    # Delete module from Redis
-                    match celery_app.redis_connection.delete_modules([redis_key]):
-                        case 1:
-                            celery_app.logger.info(f'Module {redis_key} deleted successfully')
-                        case 0:
-                            celery_app.logger.debug(f'Module {redis_key} already deleted')
-                    if not deletion_problem:
-                        deleted_modules.append(redis_key)
-        except Exception:
-            celery_app.logger.exception(f'YANG file {mod_key} doesn\'t exist although it should exist')
+        name, revision, organization = mod_key.split(',')
+        redis_keys[mod_key] = f'{name}@{revision}/{organization}'
+    modules = celery_app.redis_connection.get_modules(list(redis_keys.values()))
+    updated_modules = {}
+
+    # Delete implementation
+    for mod_key, redis_key in redis_keys.items():
+        if (module := modules.get(redis_key)) is None:
+            celery_app.logger.error(f'YANG file {mod_key} doesn\'t exist although it should exist')
+            continue
+        implementations = module.get('implementations', {}).get('implementation', [])
+        remaining_implementations = []
+        for implementation in implementations:
+            if all(
+                not (param := params.get(param_name)) or param == implementation[param_name]
+                for param_name in param_names
+            ):
+                imp_key = ','.join(implementation[param_name] for param_name in param_names)
+                celery_app.logger.info(f'Implementation {imp_key} deleted from module {mod_key} successfully')
+            else:
+                remaining_implementations.append(implementation)
+        _, _, organization = mod_key.split(',')
+        if implementations and not remaining_implementations and organization == params['vendor']:
+            deleted_modules.append(redis_key)
+        elif len(remaining_implementations) != len(implementations):
+            module['implementations']['implementation'] = remaining_implementations
+            updated_modules[redis_key] = module
+
+    # Delete dependents
     raw_all_modules = celery_app.redis_connection.get_all_modules()
-    all_modules = json.loads(raw_all_modules)
-
-    # Delete dependets
-    for module_key in modules_keys:
-        name, revision, organization = module_key.split(',')
-        for existing_module in all_modules.values():
-            if existing_module.get('dependents') is not None:
-                dependents = existing_module['dependents']
-                for dependent in dependents:
-                    if dependent['name'] == name and dependent.get('revision') == revision:
-                        mod_key_redis = (
-                            f'{existing_module["name"]}@{existing_module["revision"]}/'
-                            f'{existing_module["organization"]}'
-                        )
-                        # Delete module's dependent from Redis
-                        celery_app.redis_connection.delete_dependent(mod_key_redis, dependent['name'])
+    dependents_index = build_dependents_index(json.loads(raw_all_modules))
+    removed_dependents = defaultdict(set)
+    for mod_key in modules_keys:
+        name, revision, _ = mod_key.split(',')
+        for redis_key in dependents_index.get((name, revision), ()):
+            removed_dependents[redis_key].add((name, revision))
+    deleted_keys = set(deleted_modules)
+    not_loaded_keys = [key for key in removed_dependents if key not in modules and key not in deleted_keys]
+    modules.update(celery_app.redis_connection.get_modules(not_loaded_keys))
+    for redis_key, removed in removed_dependents.items():
+        if redis_key in deleted_keys or (module := modules.get(redis_key)) is None:
+            continue
+        module['dependents'] = [
+            dependent
+            for dependent in module.get('dependents', [])
+            if (dependent['name'], dependent.get('revision')) not in removed
+        ]
+        updated_modules[redis_key] = module
+
+    for redis_key, response in celery_app.redis_connection.update_modules(updated_modules, deleted_modules).items():
+        if response:
+            celery_app.logger.info(f'Module {redis_key} deleted successfully')
+        else:
+            celery_app.logger.debug(f'Module {redis_key} already deleted')
 
     # Delete vendor branch from Redis
     celery_app.redis_connection.delete_vendor(redis_vendor_key)
@@ -161,6 +252,59 @@ def process_vendor_deletion(params: dict[str, str]):
     return StatusMessage.SUCCESS
 
 
+def build_dependents_index(all_modules: dict[str, dict]) -> dict[tuple[str, t.Optional[str]], list[str]]:
+    """Index the redis keys of the modules by the name and revision of each of their dependents."""
+    dependents_index = defaultdict(list)
+    for redis_key, module in all_modules.items():
+        for dependent in module.get('dependents') or []:
+            dependents_index[dependent['name'], dependent.get('revision')].append(redis_key)
+    return dependents_index
+
+
+def find_undeletable_modules(
+    candidates: set[tuple[str, str]],
+    all_modules: dict[str, dict],
+) -> dict[tuple[str, str], str]:
+    """
+    Find the modules which cannot be deleted, because they are a dependency or a submodule
+    of an existing module which is not going to be deleted.
+    A module referenced only by other deleted modules can be deleted too,
+    unless one of those modules cannot be deleted itself.
+
+    Arguments:
+        :param candidates   (set[tuple[str, str]]) name and revision of the modules requested for deletion
+        :param all_modules  (dict[str, dict]) all the existing modules by their redis key
+        :return             (dict[tuple[str, str], str]) reason for keeping each of the undeletable candidates
+    """
+    # candidates referenced by each deleted module, with the type of the reference
+    references: dict[tuple[str, str], list[tuple[tuple[str, str], str]]] = defaultdict(list)
+    undeletable_modules = {}
+    blocked = deque()
+    for redis_key, existing_module in all_modules.items():
+        existing_module_key = (existing_module['name'], existing_module['revision'])
+        for dep_type in ('dependencies', 'submodule'):
+            for reference in existing_module.get(dep_type, []):
+                referenced_module_key = (reference['name'], reference.get('revision'))
+                if referenced_module_key not in candidates or referenced_module_key in undeletable_modules:
+                    continue
+                if existing_module_key in candidates:
+                    references[existing_module_key].append((referenced_module_key, dep_type))
+                else:
+                    undeletable_modules[referenced_module_key] = (
+                        f'has reference in another module\'s {dep_type}: {redis_key}'
+                    )
+                    blocked.append(referenced_module_key)
+    while blocked:
+        name, revision = module_key = blocked.popleft()
+        for referenced_module_key, dep_type in references.get(module_key, ()):
+            if referenced_module_key not in undeletable_modules:
+                undeletable_modules[referenced_module_key] = (
+                    f'has reference in {dep_type} of {name}@{revision}, which cannot be deleted'
+                )
+                blocked.append(referenced_module_key)
+    return undeletable_modules
+
+
 def iterate_in_depth(value: dict, modules_keys: set[str]):
     """
     Iterates through the branch to get to the level with modules.
@@ -185,6 +329,7 @@ def iterate_in_depth(value: dict, modules_keys: set[str]):
 
 
 @celery_app.task
+@serialize_catalog_writes
 def process_module_deletion(modules: list[dict[str, str]]):
     """
     Delete modules. It deletes modules of given path from Redis.
@@ -198,33 +343,12 @@ def process_module_deletion(modules: list[dict[str, str]]):
         celery_app.logger.exception('Problem while processing arguments')
         return StatusMessage.FAIL
 
-    def module_in(name: str, revision: str, modules: list) -> bool:
-        for module in modules:
-            if module['name'] == name and module.get('revision') == revision:
-                return True
-        return False
-
-    @functools.lru_cache(maxsize=None)
-    def can_delete(name: str, revision: str) -> bool:
-        """
-        Check whether module with given 'name' and 'revison' which should be removed
-        is or is not depedency/submodule of some other existing module.
-        If module-to-be-deleted has reference in another existing module, it cannot be deleted.
-        However, it can be deleted if also referenced existing module will be deleted too.
-        """
-        for redis_key, existing_module in all_modules.items():
-            for dep_type in ['dependencies', 'submodule']:
-                is_dep = module_in(name, revision, existing_module.get(dep_type, []))
-                if is_dep:
-                    if module_in(existing_module['name'], existing_module['revision'], modules):
-                        if can_delete(existing_module['name'], existing_module['revision']):
-                            continue
-                    else:
-                        celery_app.logger.error(
-                            f'{name}@{revision} module has reference in another module\'s {dep_type}: {redis_key}',
-                        )
-                        return False
-        return True
+    undeletable_modules = find_undeletable_modules(
+        {(module.get('name'), module.get('revision')) for module in modules},
+        all_modules,
+    )
+    for (name, revision), reason in undeletable_modules.items():
+        celery_app.logger.error(f'{name}@{revision} module {reason}')
 
     modules_not_deleted = []
     modules_to_delete = []
@@ -233,24 +357,31 @@ def process_module_deletion(modules: list[dict[str, str]]):
     for module in modules:
         mod_key = f'{module["name"]},{module["revision"]},{module["organization"]}'
         redis_key = f'{module["name"]}@{module["revision"]}/{module["organization"]}'
-        if can_delete(module.get('name'), module.get('revision')):
+        if (module.get('name'), module.get('revision')) not in undeletable_modules:
             mod_keys_to_delete.append(mod_key)
             redis_keys_to_delete.append(redis_key)
             modules_to_delete.append(module)
         else:
             modules_not_deleted.append(mod_key)
 
+    dependents_index = build_dependents_index(all_modules)
+    removed_dependents = defaultdict(set)
     for mod in modules_to_delete:
-        for redis_key, existing_module in all_modules.items():
-            if existing_module.get('dependents') is not None:
-                dependents = existing_module['dependents']
-                dependents_dict = [f'{m["name"]}@{m.get("revision", "")}' for m in dependents]
-                searched_dependent = f'{mod["name"]}@{mod.get("revision", "")}'
-                if searched_dependent in dependents_dict:
-                    celery_app.redis_connection.delete_dependent(redis_key, mod['name'])
+        for redis_key in dependents_index.get((mod['name'], mod.get('revision')), ()):
+            removed_dependents[redis_key].add((mod['name'], mod.get('revision')))
+    deleted_keys = set(redis_keys_to_delete)
+    updated_modules = celery_app.redis_connection.get_modules(
+        [redis_key for redis_key in removed_dependents if redis_key not in deleted_keys],
+    )
+    for redis_key, module in updated_modules.items():
+        module['dependents'] = [
+            dependent
+            for dependent in module.get('dependents', [])
+            if (dependent['name'], dependent.get('revision')) not in removed_dependents[redis_key]
+        ]
+    deletion_responses = celery_app.redis_connection.update_modules(updated_modules, redis_keys_to_delete)
     modules_to_index = []
-    for mod_key, redis_key in zip(mod_keys_to_delete, redis_keys_to_delete):
-        response = celery_app.redis_connection.delete_modules([redis_key])
+    for redis_key, response in deletion_responses.items():
         if response == 1:
             celery_app.logger.info(f'Module {redis_key} deleted successfully')
         elif response == 0:
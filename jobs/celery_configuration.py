@@ -17,6 +17,8 @@ __copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'bohdan.konovalenko@pantheon.tech'
 
+from kombu import Exchange, Queue
+
 from utility.create_config import create_config
 
 config = create_config()
@@ -40,8 +42,51 @@ task_track_started = True
 # specify all folders with celery tasks for proper tasks' auto discovering, for example: ['job_runner.other_tasks']
 include = []
 
-# this setting specifies that we can have only one running task at a time (this is done intentionally)
+# Tasks are divided into classes, each class has its own queue, so short interactive tasks (user uploads and
+# deletions) are not blocked by long running bulk populates or maintenance scripts. Workers are started per class,
+# the class is taken from the worker's node name (for example "celery worker -n interactive@%h"), see jobs/README.md
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+MAINTENANCE = 'maintenance'
+TASK_CLASSES = (INTERACTIVE, BULK, MAINTENANCE)
+
+# queue of all the tasks before they were divided into classes, it is consumed by the interactive workers,
+# so the tasks queued there before an upgrade are not lost, and can be removed once it is empty
+LEGACY_QUEUE = 'celery'
+
+task_queues = [Queue(queue, Exchange(queue), routing_key=queue) for queue in (*TASK_CLASSES, LEGACY_QUEUE)]
+task_default_queue = INTERACTIVE
+# queues consumed by the workers of each task class
+worker_class_queues = {INTERACTIVE: [INTERACTIVE, LEGACY_QUEUE], BULK: [BULK], MAINTENANCE: [MAINTENANCE]}
+task_routes = {
+    'jobs.celery.test_task': {'queue': INTERACTIVE},
+    'jobs.celery.process': {'queue': INTERACTIVE},
+    'jobs.celery.process_vendor_deletion': {'queue': INTERACTIVE},
+    'jobs.celery.process_module_deletion': {'queue': INTERACTIVE},
+    'jobs.celery.github_populate': {'queue': BULK},
+    'jobs.celery.run_script': {'queue': MAINTENANCE},
+}
+
+# this setting specifies that we can have only one running task at a time per worker (this is done intentionally),
+# tasks of different classes still run concurrently, so their updates of the catalog in Redis are serialized
+# by RedisConnection.catalog_write_lock()
 worker_concurrency = 1
+# long tasks should not reserve messages which could be processed by other workers in the meantime
+worker_prefetch_multiplier = 1
+
+# concurrency and prefetch multiplier of the workers of each task class, they override the -c and
+# --prefetch-multiplier options of the command line, see jobs.celery.configure_worker_class_options()
+worker_class_options = {
+    task_class: {
+        'concurrency': config.getint('Celery-Section', f'{task_class}-concurrency', fallback=1),
+        'prefetch_multiplier': config.getint(
+            'Celery-Section',
+            f'{task_class}-prefetch-multiplier',
+            fallback=4 if task_class == INTERACTIVE else 1,
+        ),
+    }
+    for task_class in TASK_CLASSES
+}
 
 task_serializer = 'json'
 result_serializer = 'json'
@@ -17,16 +17,17 @@ __copyright__ = 'Copyright The IETF Trust 2021, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech, jclarke@cisco.com'
 
+import hashlib
 import io
 import json
 import logging
 import os.path
 
-from opensearchpy import ConnectionError, ConnectionTimeout, RequestError
+from opensearchpy import ConnectionError, ConnectionTimeout
 from pyang import plugin
 from pyang.util import get_latest_revision
 
-from opensearch_indexing.models.index_build import BuildYINDEXModule
+from opensearch_indexing.models.index_build import BuildYINDEXModule, ModuleIndices
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
 from opensearch_indexing.pyang_plugin.json_tree import emit_tree
@@ -44,6 +45,20 @@ def build_indices(
     json_ytree: str,
     logger: logging.Logger,
 ):
+    module_indices = parse_module_indices(module, save_file_dir, json_ytree, logger)
+    push_module_indices(opensearch_manager, module, module_indices, logger)
+
+
+def parse_module_indices(
+    module: BuildYINDEXModule,
+    save_file_dir: str,
+    json_ytree: str,
+    logger: logging.Logger,
+) -> ModuleIndices:
+    """
+    Parse the module and build its YINDEX data, the ytree of the module is written to the json_ytree directory.
+    This is the CPU bound part of indexing a module, it doesn't communicate with OpenSearch.
+    """
     name_revision = f'{module["name"]}@{module["revision"]}'
 
     plugin.init([])
@@ -78,36 +93,64 @@ def build_indices(
             logger.exception(f'Unable to create ytree for module {name_revision}')
             writer.write('')
 
+    return {
+        'yindexes': yindexes,
+        'submodules': [
+            {'name': subm.arg, 'revision': validate_revision(get_latest_revision(subm))} for subm in submodules
+        ],
+    }
+
+
+def push_module_indices(
+    opensearch_manager: OpenSearchManager,
+    module: BuildYINDEXModule,
+    module_indices: ModuleIndices,
+    logger: logging.Logger,
+):
+    """
+    Update the data of the module in the YINDEX and AUTOCOMPLETE indices with the parsed module_indices.
+    Only the YINDEX documents whose content changed are indexed again, and only the documents
+    of the nodes which no longer exist are deleted.
+    """
+    name_revision = f'{module["name"]}@{module["revision"]}'
+    documents = identify_documents(
+        [document for documents in module_indices['yindexes'].values() for document in documents],
+    )
     attempts = 3
     while attempts > 0:
         try:
-            # Remove exisiting modules from all indices
-            logger.debug('deleting data from index: modules')
-            opensearch_manager.delete_from_indices(module)
-
-            # Remove existing submodules from index: yindex
-            for subm in submodules:
-                subm_n = subm.arg
-                rev = get_latest_revision(subm)
-                subm_r = validate_revision(rev)
-                submodule = {'name': subm_n, 'revision': subm_r}
-                try:
-                    logger.debug('deleting data from index: yindex')
-                    opensearch_manager.delete_from_index(OpenSearchIndices.YINDEX, submodule)
-                except RequestError:
-                    logger.exception(f'Problem while deleting {subm_n}@{subm_r}')
-
-            # Bulk new modules to index: yindex
-            for key in yindexes:
-                chunks = [yindexes[key][i : i + ES_CHUNK_SIZE] for i in range(0, len(yindexes[key]), ES_CHUNK_SIZE)]
-                for idx, chunk in enumerate(chunks, start=1):
-                    logger.debug(f'Pushing data to index: yindex {idx} out of {len(chunks)}')
-                    opensearch_manager.bulk_modules(OpenSearchIndices.YINDEX, chunk)
+            indexed_hashes = opensearch_manager.get_content_hashes(
+                OpenSearchIndices.YINDEX,
+                [module, *module_indices['submodules']],
+            )
+            actions = [
+                {'_op_type': 'delete', '_id': document_id}
+                for document_id in indexed_hashes
+                if document_id not in documents
+            ]
+            deleted_count = len(actions)
+            actions += [
+                {'_id': document_id, **document}
+                for document_id, document in documents.items()
+                if indexed_hashes.get(document_id) != document['content-hash']
+            ]
+            logger.info(
+                f'Updating YINDEX documents of {name_revision}: {len(actions) - deleted_count} indexed, '
+                f'{deleted_count} deleted, {len(documents) + deleted_count - len(actions)} unchanged',
+            )
+            chunks = [actions[i : i + ES_CHUNK_SIZE] for i in range(0, len(actions), ES_CHUNK_SIZE)]
+            for idx, chunk in enumerate(chunks, start=1):
+                logger.debug(f'Pushing data to index: yindex {idx} out of {len(chunks)}')
+                opensearch_manager.bulk_modules(OpenSearchIndices.YINDEX, chunk)
 
             # Index new modules to index: autocomplete
             logger.debug('pushing data to index: autocomplete')
-            del module['path']
-            opensearch_manager.index_module(OpenSearchIndices.AUTOCOMPLETE, module)
+            module.pop('path', None)
+            autocomplete_hits = opensearch_manager.get_module_by_name_revision(OpenSearchIndices.AUTOCOMPLETE, module)
+            if any(hit['_id'] != name_revision for hit in autocomplete_hits):
+                # remove the documents indexed before they had deterministic IDs
+                opensearch_manager.delete_from_index(OpenSearchIndices.AUTOCOMPLETE, module)
+            opensearch_manager.index_module(OpenSearchIndices.AUTOCOMPLETE, module, document_id=name_revision)
             break
         except (ConnectionTimeout, ConnectionError) as e:
             attempts -= 1
@@ -118,6 +161,32 @@ def build_indices(
                 raise e
 
 
+def identify_documents(documents: list[dict]) -> dict[str, dict]:
+    """
+    Give each YINDEX document a deterministic ID derived from the node it describes,
+    and add the hash of its content to the document, so unchanged documents don't need to be indexed again.
+    Several documents describing the same node are told apart by the order in which they were emitted.
+    """
+    identified_documents = {}
+    for document in documents:
+        node = '\0'.join(
+            str(document.get(field))
+            for field in ('module', 'revision', 'organization', 'statement', 'path', 'argument')
+        )
+        node_id = hashlib.blake2b(node.encode('utf-8'), digest_size=16).hexdigest()
+        document_id = node_id
+        occurrence = 1
+        while document_id in identified_documents:
+            occurrence += 1
+            document_id = f'{node_id}-{occurrence}'
+        content = json.dumps(document, sort_keys=True)
+        identified_documents[document_id] = {
+            **document,
+            'content-hash': hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest(),
+        }
+    return identified_documents
+
+
 def _find_submodules(ctx, submodules, module):
     for i in module.search('include'):
         revision = i.search_one('revision-date')
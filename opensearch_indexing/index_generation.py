@@ -0,0 +1,58 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+"""
+Generation of the OpenSearch indices, a counter stored in a file which is incremented every time
+the content of the indices changes. Data derived from the indices, like cached search results,
+is valid only as long as the generation it was computed for is the current one.
+"""
+
+import fcntl
+import os
+
+
+def get_index_generation(path: str) -> int:
+    """
+    Return the current generation of the indices, 0 if it was never incremented.
+
+    Argument:
+        :param path     (str) Path to the generation file
+    """
+    try:
+        with open(path, 'r') as reader:
+            return int(reader.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def bump_index_generation(path: str) -> int:
+    """
+    Increment the generation of the indices and return the new one.
+    Concurrent increments are serialized by a lock file, and the generation file is replaced atomically,
+    so readers never see a partially written generation.
+
+    Argument:
+        :param path     (str) Path to the generation file
+    """
+    with open(f'{path}.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        generation = get_index_generation(path) + 1
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as writer:
+            writer.write(str(generation))
+        os.replace(temp_path, path)
+    return generation
@@ -8,3 +8,10 @@ class BuildYINDEXModule(t.TypedDict):
     revision: str
     organization: str
     path: str
+
+
+class ModuleIndices(t.TypedDict):
+    """Data of a parsed module which is pushed to the YINDEX"""
+
+    yindexes: dict[str, list[dict]]
+    submodules: list[dict[str, str]]
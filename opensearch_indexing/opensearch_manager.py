@@ -17,19 +17,23 @@ __copyright__ = 'Copyright The IETF Trust 2022, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'slavomir.mazur@pantheon.tech'
 
-import json
 import os
+import queue
+import threading
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 
 from opensearchpy import OpenSearch
 from opensearchpy.exceptions import AuthorizationException, NotFoundError, RequestError
-from opensearchpy.helpers import parallel_bulk
+from opensearchpy.helpers import parallel_bulk, scan
 
 import utility.log as log
 from opensearch_indexing.models.keywords_names import KeywordsNames
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+from opensearch_indexing.query_templates import get_template
 from utility.create_config import create_config
+from utility.util import chunked
 
 
 class OpenSearchManager:
@@ -39,6 +43,9 @@ class OpenSearchManager:
         log_directory = config.get('Directory-Section', 'logs')
         self.opensearch_repo_name = config.get('General-Section', 'opensearch-repo-name')
         self.opensearch_request_timeout = int(config.get('General-Section', 'opensearch-request-timeout', fallback=60))
+        self.scroll_page_size = config.getint('General-Section', 'opensearch-scroll-size', fallback=1000)
+        self.scroll_slices = config.getint('General-Section', 'opensearch-scroll-slices', fallback=1)
+        self.save_file_dir = config.get('Directory-Section', 'save-file-dir', fallback='/var/yang/all_modules')
         self._setup_opensearch(config, opensearch)
         log_file_path = os.path.join(log_directory, 'jobs', 'opensearch-manager.log')
         self.logger = log.get_logger('opensearch-manager', log_file_path)
@@ -77,10 +84,7 @@ class OpenSearchManager:
             :param index   (OpenSearchIndices) Index to be created
         """
         index_name = index.value
-        index_json_name = f'initialize_{index_name}_index.json'
-        index_json_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/', index_json_name)
-        with open(index_json_path, encoding='utf-8') as reader:
-            index_config = json.load(reader)
+        index_config = self._load_index_config(index_name)
 
         create_result = None
         try:
@@ -93,6 +97,73 @@ class OpenSearchManager:
             create_result = self.opensearch.indices.create(index=index_name, body=index_config, ignore=400)
         return create_result
 
+    def create_versioned_index(self, index: OpenSearchIndices, version: str) -> str:
+        """
+        Create a new version of the index behind the alias, without adding it to the alias,
+        with refresh and replicas disabled so the index can be filled at the maximal throughput.
+        Call finalize_versioned_index() once the index is filled.
+
+        Arguments:
+            :param index    (OpenSearchIndices) Alias whose index to create
+            :param version  (str) Version appended to the name of the index
+        :return (str) name of the created index
+        """
+        base_name = index.value.removesuffix('-alias')
+        index_config = self._load_index_config(base_name)
+        index_config.pop('aliases', None)
+        index_config.setdefault('settings', {}).setdefault('index', {}).update(
+            {'refresh_interval': '-1', 'number_of_replicas': 0},
+        )
+        index_name = f'{base_name}-{version}'
+        self.opensearch.indices.create(index=index_name, body=index_config)
+        return index_name
+
+    def finalize_versioned_index(self, index: OpenSearchIndices, index_name: str):
+        """
+        Restore the refresh interval and replicas of an index created by create_versioned_index()
+        and refresh it, so all of its documents are searchable before it is added to the alias.
+
+        Arguments:
+            :param index        (OpenSearchIndices) Alias of the index
+            :param index_name   (str) Name of the versioned index
+        """
+        index_settings = (
+            self._load_index_config(index.value.removesuffix('-alias')).get('settings', {}).get('index', {})
+        )
+        self.opensearch.indices.put_settings(
+            index=index_name,
+            body={
+                'index': {
+                    'refresh_interval': index_settings.get('refresh_interval'),
+                    'number_of_replicas': index_settings.get('number_of_replicas', 0),
+                },
+            },
+        )
+        self.opensearch.indices.refresh(index=index_name)
+
+    def get_alias_indices(self, index: OpenSearchIndices) -> list[str]:
+        """Returns the names of the indices currently behind the alias."""
+        try:
+            return list(self.opensearch.indices.get_alias(name=index.value).keys())
+        except NotFoundError:
+            return []
+
+    def swap_aliases(self, new_indices: dict[OpenSearchIndices, str]) -> dict[OpenSearchIndices, list[str]]:
+        """
+        Atomically point all the aliases to their new indices, in a single request.
+
+        Argument:
+            :param new_indices  (dict[OpenSearchIndices, str]) names of the new indices by their aliases
+        :return (dict[OpenSearchIndices, list[str]]) names of the indices removed from the aliases
+        """
+        old_indices = {index: self.get_alias_indices(index) for index in new_indices}
+        actions = []
+        for index, index_name in new_indices.items():
+            actions += [{'remove': {'index': old_index, 'alias': index.value}} for old_index in old_indices[index]]
+            actions.append({'add': {'index': index_name, 'alias': index.value}})
+        self.opensearch.indices.update_aliases(body={'actions': actions})
+        return old_indices
+
     def index_exists(self, index: OpenSearchIndices) -> bool:
         """
         Check if the index already exists.
@@ -154,9 +225,7 @@ class OpenSearchManager:
             :param keyword          (KeywordsNames)
             :param searched_term    (str) String entered by the user
         """
-        autocomplete_json_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/completion.json')
-        with open(autocomplete_json_path, encoding='utf-8') as reader:
-            autocomplete_query = json.load(reader)
+        autocomplete_query = get_template('opensearch_indexing/json/completion.json')
 
         autocomplete_query['query']['bool']['must'][0]['term'] = {keyword.value: searched_term.lower()}
         autocomplete_query['aggs']['groupby_module']['terms']['field'] = f'{keyword.value}.keyword'
@@ -183,13 +252,14 @@ class OpenSearchManager:
         for index in OpenSearchIndices:
             self.delete_from_index(index, module)
 
-    def index_module(self, index: OpenSearchIndices, document: dict) -> dict:
+    def index_module(self, index: OpenSearchIndices, document: dict, document_id: t.Optional[str] = None) -> dict:
         """
         Creates or updates a 'document' in a selected index.
 
         Arguments:
             :param index            (OpenSearchIndices) Target index to be indexed
             :param document         (dict) Document to index
+            :param document_id      (Optional[str]) ID of the document, generated by OpenSearch if not set
         """
         # TODO: Remove this IF after reindexing and unification of both indices
         if index in [OpenSearchIndices.MODULES, OpenSearchIndices.YINDEX]:
@@ -198,7 +268,12 @@ class OpenSearchManager:
             except KeyError:
                 pass
 
-        return self.opensearch.index(index=index.value, body=document, request_timeout=self.opensearch_request_timeout)
+        return self.opensearch.index(
+            index=index.value,
+            body=document,
+            id=document_id,
+            request_timeout=self.opensearch_request_timeout,
+        )
 
     def bulk_modules(self, index: OpenSearchIndices, chunk):
         for success, info in parallel_bulk(
@@ -211,49 +286,145 @@ class OpenSearchManager:
             if not success:
                 self.logger.error(f'OpenSearch document failed with info: {info}')
 
-    def match_all(self, index: OpenSearchIndices) -> dict:
+    def get_content_hashes(self, index: OpenSearchIndices, modules: list[dict]) -> dict[str, t.Optional[str]]:
         """
-        Return the dictionary of all modules that are in the index.
+        Return the content hashes of all the documents of the modules in the index by their IDs.
+        Documents indexed without a content hash have it set to None.
 
-        Argument:
+        Arguments:
             :param index    (OpenSearchIndices) Index in which to search
+            :param modules  (list[dict]) Modules with 'name' and 'revision' whose documents to search
+        """
+        query = {
+            'query': {
+                'bool': {
+                    'should': [self._get_name_revision_query(index, module)['query'] for module in modules],
+                    'minimum_should_match': 1,
+                },
+            },
+            '_source': ['content-hash'],
+        }
+        return {
+            hit['_id']: hit['_source'].get('content-hash')
+            for hit in scan(
+                self.opensearch,
+                query=query,
+                index=index.value,
+                size=1000,
+                request_timeout=self.opensearch_request_timeout,
+            )
+        }
+
+    def scan_all(
+        self,
+        index: OpenSearchIndices,
+        page_size: t.Optional[int] = None,
+        slices: t.Optional[int] = None,
+        source: t.Optional[list[str]] = None,
+    ) -> t.Iterator[dict]:
         """
+        Stream the sources of all the documents in the index.
+        With more than one slice, the index is split into sliced scrolls which are read in parallel threads,
+        so the documents are yielded in no particular order.
 
-        def _store_hits(hits: list, all_results: dict):
-            for hit in hits:
-                name = ''
-                revision = hit['_source']['revision']
-                organization = hit['_source']['organization']
-                try:
-                    name = hit['_source']['name']
-                except KeyError:
-                    name = hit['_source']['module']
-                new_path = f'/var/yang/all_modules/{name}@{revision}.yang'
-                if not os.path.exists(new_path):
-                    self.logger.error(f'{new_path} does not exists')
+        Arguments:
+            :param index        (OpenSearchIndices) Index in which to search
+            :param page_size    (Optional[int]) Number of documents fetched by one scroll request of each slice
+            :param slices       (Optional[int]) Number of slices scrolled in parallel
+            :param source       (Optional[list[str]]) Fields of the documents to fetch, all fields if not set
+        """
+        page_size = page_size or self.scroll_page_size
+        slices = slices or self.scroll_slices
+
+        def _scan_slice(slice_id: t.Optional[int] = None) -> t.Iterator[dict]:
+            query = {'query': {'match_all': {}}}
+            if slice_id is not None:
+                query['slice'] = {'id': slice_id, 'max': slices}
+            if source is not None:
+                query['_source'] = source
+            for hit in scan(
+                self.opensearch,
+                query=query,
+                index=index.value,
+                size=page_size,
+                scroll='5m',
+                request_timeout=self.opensearch_request_timeout,
+            ):
+                yield hit['_source']
+
+        if slices <= 1:
+            yield from _scan_slice()
+            return
 
-                key = f'{name}@{revision}/{organization}'
-                if key not in all_results:
-                    all_results[key] = hit['_source']
+        # pages are passed through a bounded queue, so slow consumers don't make the slices read the whole index
+        pages = queue.Queue(maxsize=2 * slices)
+        finished = object()
+        stop = threading.Event()
 
+        def _read_slice(slice_id: int):
+            try:
+                for page in chunked(_scan_slice(slice_id), page_size):
+                    if stop.is_set():
+                        return
+                    pages.put(page)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(finished)
+
+        with ThreadPoolExecutor(max_workers=slices) as executor:
+            futures = [executor.submit(_read_slice, slice_id) for slice_id in range(slices)]
+            try:
+                running_slices = slices
+                while running_slices:
+                    page = pages.get()
+                    if page is finished:
+                        running_slices -= 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield from page
+            finally:
+                stop.set()
+                # unblock the slices waiting for a free place in the queue, so they can exit
+                while not all(future.done() for future in futures):
+                    try:
+                        pages.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+    def match_all(
+        self,
+        index: OpenSearchIndices,
+        page_size: t.Optional[int] = None,
+        slices: t.Optional[int] = None,
+    ) -> dict:
+        """
+        Return the dictionary of all modules that are in the index.
+        Modules whose files are missing in the save-file-dir directory are logged.
+
+        Argument:
+            :param index        (OpenSearchIndices) Index in which to search
+            :param page_size    (Optional[int]) Number of documents fetched by one scroll request of each slice
+            :param slices       (Optional[int]) Number of slices scrolled in parallel
+        """
         all_results = {}
-        match_all_query = {'query': {'match_all': {}}}
-        total_index_docs = 0
-        opensearch_result = self.opensearch.search(index=index.value, body=match_all_query, scroll=u'1m', size=250)
-        scroll_id = opensearch_result.get('_scroll_id')
-        hits = opensearch_result['hits']['hits']
-        _store_hits(hits, all_results)
-        total_index_docs += len(hits)
-
-        while opensearch_result['hits']['hits']:
-            opensearch_result = self.scroll(scroll_id)
-
-            scroll_id = opensearch_result.get('_scroll_id')
-            hits = opensearch_result['hits']['hits']
-            _store_hits(hits, all_results)
-            total_index_docs += len(hits)
-
-        self.clear_scroll(scroll_id)
+        for document in self.scan_all(index, page_size, slices):
+            name = document.get('name', document.get('module'))
+            key = f'{name}@{document["revision"]}/{document["organization"]}'
+            if key not in all_results:
+                all_results[key] = document
+
+        # a single directory listing instead of a stat call for each document
+        try:
+            saved_files = set(os.listdir(self.save_file_dir))
+        except FileNotFoundError:
+            saved_files = set()
+        for document in all_results.values():
+            filename = f'{document.get("name", document.get("module"))}@{document["revision"]}.yang'
+            if filename not in saved_files:
+                self.logger.error(f'{os.path.join(self.save_file_dir, filename)} does not exists')
+
         return all_results
 
     def get_module_by_name_revision(self, index: OpenSearchIndices, module: dict) -> list:
@@ -264,9 +435,7 @@ class OpenSearchManager:
         return opensearch_result['hits']['hits']
 
     def get_sorted_module_revisions(self, index: OpenSearchIndices, name: str):
-        query_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/sorted_name_rev_query.json')
-        with open(query_path, encoding='utf-8') as reader:
-            sorted_name_rev_query = json.load(reader)
+        sorted_name_rev_query = get_template('opensearch_indexing/json/sorted_name_rev_query.json')
 
         # TODO: Remove this IF after reindexing and unification of both indices
         if index in [OpenSearchIndices.MODULES, OpenSearchIndices.YINDEX]:
@@ -283,9 +452,7 @@ class OpenSearchManager:
         return es_result['hits']['hits']
 
     def get_node(self, module: dict) -> dict:
-        query_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/show_node.json')
-        with open(query_path, encoding='utf-8') as reader:
-            show_node_query = json.load(reader)
+        show_node_query = get_template('opensearch_indexing/json/show_node.json')
 
         show_node_query['query']['bool']['must'][0]['match_phrase']['module.keyword']['query'] = module['name']
         show_node_query['query']['bool']['must'][1]['match_phrase']['path']['query'] = module['path']
@@ -347,10 +514,50 @@ class OpenSearchManager:
 
         return es_count['count'] > 0
 
+    def documents_exist(self, index: OpenSearchIndices, documents: list[dict], chunk_size: int = 1000) -> list[bool]:
+        """
+        Bulk version of document_exists(). Check which of the documents already exist in index,
+        using a single terms query on the keyword field of names (or drafts) per chunk of documents.
+
+        Arguments:
+            :param index        (OpenSearchIndices) Index in which to search
+            :param documents    (list[dict]) Documents to search, with 'name' and 'revision', or 'draft' in DRAFTS
+            :param chunk_size   (int) Maximal number of documents searched with one query
+        :return (list[bool]) whether each of the documents exists, in the order of documents
+        :raises (TransportError) if any of the queries fails, as the existence of the documents is then unknown
+        """
+        if index == OpenSearchIndices.DRAFTS:
+            document_fields = index_fields = ('draft',)
+        # TODO: Remove this IF after reindexing and unification of both indices
+        elif index in [OpenSearchIndices.MODULES, OpenSearchIndices.YINDEX]:
+            document_fields, index_fields = ('name', 'revision'), ('module', 'revision')
+        else:
+            document_fields = index_fields = ('name', 'revision')
+
+        existing = set()
+        for chunk in chunked(documents, chunk_size):
+            query = {
+                'query': {
+                    'terms': {f'{index_fields[0]}.keyword': list({document[document_fields[0]] for document in chunk})}
+                },
+                '_source': index_fields,
+            }
+            for hit in scan(
+                self.opensearch,
+                query=query,
+                index=index.value,
+                size=chunk_size,
+                request_timeout=self.opensearch_request_timeout,
+            ):
+                existing.add(tuple(hit['_source'].get(field) for field in index_fields))
+
+        return [tuple(document[field] for field in document_fields) in existing for document in documents]
+
+    def _load_index_config(self, index_name: str) -> dict:
+        return get_template(f'opensearch_indexing/json/initialize_{index_name}_index.json')
+
     def _get_name_revision_query(self, index: OpenSearchIndices, module: dict) -> dict:
-        module_search_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/module_search.json')
-        with open(module_search_path, encoding='utf-8') as reader:
-            name_revision_query = json.load(reader)
+        name_revision_query = get_template('opensearch_indexing/json/module_search.json')
 
         # TODO: Remove this IF after reindexing and unification of both indices
         if index in [OpenSearchIndices.MODULES, OpenSearchIndices.YINDEX]:
@@ -365,9 +572,7 @@ class OpenSearchManager:
         return name_revision_query
 
     def _get_draft_query(self, index: OpenSearchIndices, draft: dict) -> dict:
-        draft_search_path = os.path.join(os.environ['BACKEND'], 'opensearch_indexing/json/draft_search.json')
-        with open(draft_search_path, encoding='utf-8') as reader:
-            draft_query = json.load(reader)
+        draft_query = get_template('opensearch_indexing/json/draft_search.json')
 
         draft_query['query']['bool']['must'][0]['match_phrase']['draft']['query'] = draft['draft']
         return draft_query
@@ -24,6 +24,7 @@ __email__ = 'dmytro.kyrychenko@pantheon.tech'
 import logging
 import os
 
+from opensearch_indexing.index_generation import bump_index_generation
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
 from utility import log
@@ -55,32 +56,51 @@ def main(script_config: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[Job
     logger = log.get_logger('process_drafts', os.path.join(log_directory, 'process-drafts.log'))
     logger.info('Starting process-drafts.py script')
 
-    drafts = [filename[:-4] for filename in os.listdir(ietf_drafts_dir) if filename[-4:] == '.txt']
-
-    logger.info('Trying to initialize OpenSearch indices')
-    opensearch_manager = OpenSearchManager()
-    if not opensearch_manager.index_exists(OpenSearchIndices.DRAFTS):
-        error_message = 'Drafts index has not been created yet.'
+    lock_file_drafts = config.get('Directory-Section', 'lock-drafts', fallback='/var/yang/tmp/drafts.lock')
+    if os.path.exists(lock_file_drafts):
+        # the DRAFTS index is being rebuilt by blue_green_reindex.py, the new drafts are added by the next run
+        error_message = 'Drafts index is locked by another process.'
         logger.error(error_message)
         raise RuntimeError(error_message)
+    open(lock_file_drafts, 'w').close()
+    try:
+        drafts = [filename[:-4] for filename in os.listdir(ietf_drafts_dir) if filename[-4:] == '.txt']
+
+        logger.info('Trying to initialize OpenSearch indices')
+        opensearch_manager = OpenSearchManager()
+        if not opensearch_manager.index_exists(OpenSearchIndices.DRAFTS):
+            error_message = 'Drafts index has not been created yet.'
+            logger.error(error_message)
+            raise RuntimeError(error_message)
+
+        logging.getLogger('opensearch').setLevel(logging.ERROR)
 
-    logging.getLogger('opensearch').setLevel(logging.ERROR)
+        logger.info(f'Checking which of {len(drafts)} drafts are already indexed')
+        drafts_exist = opensearch_manager.documents_exist(
+            OpenSearchIndices.DRAFTS,
+            [{'draft': draft} for draft in drafts],
+        )
+        new_drafts = [draft_name for draft_name, exists in zip(drafts, drafts_exist) if not exists]
 
-    done = 0
-    for i, draft_name in enumerate(drafts, 1):
-        draft = {'draft': draft_name}
+        done = 0
+        for i, draft_name in enumerate(new_drafts, 1):
+            draft = {'draft': draft_name}
 
-        logger.info(f'Indexing draft {draft_name} - draft {i} out of {len(drafts)}')
+            logger.info(f'Indexing draft {draft_name} - draft {i} out of {len(new_drafts)}')
 
-        try:
-            # it takes an hour to do this with a request for each draft
-            # would be much more efficient to cache it in a file
-            if not opensearch_manager.document_exists(OpenSearchIndices.DRAFTS, draft):
+            try:
                 opensearch_manager.index_module(OpenSearchIndices.DRAFTS, draft)
                 logger.info(f'added {draft_name} to index')
                 done += 1
-        except Exception:
-            logger.exception(f'Problem while processing draft {draft_name}')
+            except Exception:
+                logger.exception(f'Problem while processing draft {draft_name}')
+        if done:
+            # the API reloads its completions of drafts when the generation of the indices changes
+            bump_index_generation(
+                config.get('Directory-Section', 'index-generation', fallback='/var/yang/index_generation'),
+            )
+    finally:
+        os.unlink(lock_file_drafts)
     logger.info('Job finished successfully')
     return [JobLogMessage(label='Successful', message=f'Added {done} drafts to Opensearch')]
 
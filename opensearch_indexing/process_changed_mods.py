@@ -19,15 +19,20 @@ __email__ = 'miroslav.kovac@pantheon.tech, jclarke@cisco.com'
 
 import json
 import logging
+import multiprocessing
 import os
-import shutil
 import sys
+import typing as t
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
-from opensearch_indexing.build_yindex import build_indices
+from opensearch_indexing.build_yindex import build_indices, parse_module_indices, push_module_indices
+from opensearch_indexing.index_generation import bump_index_generation
 from opensearch_indexing.models.index_build import BuildYINDEXModule
 from opensearch_indexing.opensearch_manager import OpenSearchManager
 from utility import log
 from utility.create_config import create_config
+from utility.indexing_queue import DELETE, INDEX, IndexingQueue, IndexingQueueItem
 from utility.script_config_dict import script_config_dict
 from utility.scriptConfig import ScriptConfig
 from utility.util import validate_revision
@@ -50,143 +55,215 @@ class ProcessChangedMods:
         self.changes_cache_path = self.config.get('Directory-Section', 'changes-cache')
         self.failed_changes_cache_path = self.config.get('Directory-Section', 'changes-cache-failed')
         self.delete_cache_path = self.config.get('Directory-Section', 'delete-cache')
-        self.lock_file = self.config.get('Directory-Section', 'lock')
+        self.indexing_queue_path = self.config.get(
+            'Directory-Section',
+            'indexing-queue',
+            fallback='/var/yang/indexing_queue.db',
+        )
+        self.index_generation_path = self.config.get(
+            'Directory-Section',
+            'index-generation',
+            fallback='/var/yang/index_generation',
+        )
         self.lock_file_cron = self.config.get('Directory-Section', 'lock-cron')
         self.json_ytree = self.config.get('Directory-Section', 'json-ytree')
         self.save_file_dir = self.config.get('Directory-Section', 'save-file-dir')
+        self.batch_size = self.config.getint('General-Section', 'indexing-batch-size', fallback=100)
+        self.max_attempts = self.config.getint('General-Section', 'indexing-max-attempts', fallback=3)
+        self.retry_delay = self.config.getint('General-Section', 'indexing-retry-delay', fallback=600)
+        self.parse_workers = self.config.getint('General-Section', 'indexing-parse-workers', fallback=1)
+        self.io_workers = self.config.getint('General-Section', 'indexing-io-workers', fallback=1)
 
         self.logger = log.get_logger(
             'process_changed_mods',
             os.path.join(self.log_directory, 'process_changed_mods.log'),
         )
+        self.opensearch_manager: t.Optional[OpenSearchManager] = None
 
     def start_processing_changed_mods(self):
         self.logger.info('Starting process_changed_mods.py script')
 
-        if os.path.exists(self.lock_file) or os.path.exists(self.lock_file_cron):
+        if os.path.exists(self.lock_file_cron):
             # we can exist since this is run by cronjob every 3 minutes of every day
             self.logger.warning('Temporary lock file used by something else. Exiting script !!!')
             sys.exit()
-        self._create_lock_files()
-
-        self.changes_cache = self._load_changes_cache(self.changes_cache_path)
-        self.delete_cache = self._load_delete_cache(self.delete_cache_path)
+        self._create_lock_file()
 
-        if not self.changes_cache and not self.delete_cache:
-            os.unlink(self.lock_file)
+        try:
+            self.indexing_queue = IndexingQueue(self.indexing_queue_path)
+            self._enqueue_cache_files()
+            while items := self.indexing_queue.claim(self.batch_size):
+                self._initialize_opensearch_manager()
+                self._process_items(items)
+                # invalidate the data derived from the indices in the API, like the cached search results
+                bump_index_generation(self.index_generation_path)
+        finally:
             os.unlink(self.lock_file_cron)
-            sys.exit()
-
-        self._initialize_opensearch_manager()
-
-        self.logger.info('Running cache files backup')
-        self._backup_cache_files(self.delete_cache_path)
-        self._backup_cache_files(self.changes_cache_path)
-        os.unlink(self.lock_file)
-
-        if self.delete_cache:
-            self._delete_modules_from_es()
-        if self.changes_cache:
-            self._change_modules_in_es()
-
-        os.unlink(self.lock_file_cron)
         self.logger.info('Job finished successfully')
 
-    def _create_lock_files(self):
+    def _create_lock_file(self):
         try:
-            open(self.lock_file, 'w').close()
             open(self.lock_file_cron, 'w').close()
         except Exception:
-            os.unlink(self.lock_file)
-            os.unlink(self.lock_file_cron)
             self.logger.error('Temporary lock file could not be created although it is not locked')
             sys.exit()
 
     def _initialize_opensearch_manager(self):
+        if self.opensearch_manager is not None:
+            return
         self.opensearch_manager = OpenSearchManager()
         logging.getLogger('opensearch').setLevel(logging.ERROR)
 
-    def _delete_modules_from_es(self):
-        for module in self.delete_cache:
-            name, rev_org = module.split('@')
-            revision, organization = rev_org.split('/')
-            revision = validate_revision(revision)
-            self.logger.info(f'Deleting {module} from opensearch indices')
-            module = {
-                'name': name,
-                'revision': revision,
-                'organization': organization,
-            }
-            self.opensearch_manager.delete_from_indices(module)
-
-    def _change_modules_in_es(self):
+    def _enqueue_cache_files(self):
+        """Move the modules left in the changes and delete cache files to the indexing queue."""
+        changes_cache = self._load_cache_file(self.changes_cache_path)
+        delete_cache = self._load_cache_file(self.delete_cache_path)
+        if not changes_cache and not delete_cache:
+            return
+        self.logger.info('Moving modules from the cache files to the indexing queue')
+        self.indexing_queue.enqueue(changes_cache, delete_cache or [])
+        for cache_path in (self.changes_cache_path, self.delete_cache_path):
+            if os.path.exists(cache_path):
+                os.replace(cache_path, f'{cache_path}.bak')
+
+    def _load_cache_file(self, cache_path: str):
+        try:
+            with open(cache_path, 'r') as reader:
+                return json.load(reader)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return None
+
+    def _process_items(self, items: list[IndexingQueueItem]):
+        """
+        Process the claimed items, only the latest item of each module is processed,
+        and all the deletions are processed before the changes.
+        Each item is acknowledged as soon as it is processed, failed items are retried later.
+        """
+        latest_items = {item.module_key: item for item in items}
+        self.indexing_queue.ack(item for item in items if latest_items[item.module_key] is not item)
+        deletions = [item for item in latest_items.values() if item.action == DELETE]
+        changes = [item for item in latest_items.values() if item.action == INDEX]
+        self.logger.info(f'Processing {len(deletions)} deleted and {len(changes)} changed modules')
+        for item in deletions:
+            self._process_item(item, self._delete_module_from_es)
+        if not changes:
+            return
         recursion_limit = sys.getrecursionlimit()
         sys.setrecursionlimit(50000)
         try:
-            for module_count, (module_key, module_path) in enumerate(self.changes_cache.items(), 1):
-                name, rev_org = module_key.split('@')
-                revision, organization = rev_org.split('/')
-                revision = validate_revision(revision)
-                name_revision = f'{name}@{revision}'
-
-                module = BuildYINDEXModule(name=name, revision=revision, organization=organization, path=module_path)
-                self.logger.info(
-                    f'yindex on module {name_revision}. module {module_count} out of {len(self.changes_cache)}',
-                )
-
-                try:
-                    build_indices(self.opensearch_manager, module, self.save_file_dir, self.json_ytree, self.logger)
-                except Exception:
-                    self.logger.exception(f'Problem while processing module {module_key}')
-                    try:
-                        with open(self.failed_changes_cache_path, 'r') as reader:
-                            failed_modules = json.load(reader)
-                    except (FileNotFoundError, json.decoder.JSONDecodeError):
-                        failed_modules = {}
-                    if module_key not in failed_modules:
-                        failed_modules[module_key] = module_path
-                    with open(self.failed_changes_cache_path, 'w') as writer:
-                        json.dump(failed_modules, writer)
-        except Exception:
+            if self.parse_workers <= 1 and self.io_workers <= 1:
+                indexed = 0
+                for module_count, item in enumerate(changes, 1):
+                    self.logger.info(f'yindex on module {item.module_key}. module {module_count} out of {len(changes)}')
+                    indexed += self._process_item(item, self._change_module_in_es)
+            else:
+                indexed = self._change_modules_in_parallel(changes)
+        finally:
             sys.setrecursionlimit(recursion_limit)
-            os.unlink(self.lock_file_cron)
-            self.logger.exception('Error while running build_yindex.py script')
-            self.logger.info('Job failed execution')
-            sys.exit()
-
-        sys.setrecursionlimit(recursion_limit)
-
-    def _load_changes_cache(self, changes_cache_path: str):
-        changes_cache = {}
-
+        self.logger.info(f'{indexed} out of {len(changes)} changed modules indexed')
+
+    def _change_modules_in_parallel(self, changes: list[IndexingQueueItem]) -> int:
+        """
+        Index the changed modules in two stages: modules are parsed in parse_workers processes
+        and their data are pushed to OpenSearch in io_workers threads.
+        At most twice as many modules as there are workers are in progress in each stage,
+        so parsing pauses while OpenSearch can't keep up with it.
+        """
+        pending = deque(changes)
+        parsing: dict[Future, tuple[IndexingQueueItem, BuildYINDEXModule]] = {}
+        pushing: dict[Future, IndexingQueueItem] = {}
+        indexed = 0
+        module_count = 0
+        with (
+            ProcessPoolExecutor(self.parse_workers, mp_context=multiprocessing.get_context('fork')) as parse_pool,
+            ThreadPoolExecutor(self.io_workers) as io_pool,
+        ):
+            while pending or parsing or pushing:
+                while pending and len(parsing) < 2 * self.parse_workers and len(pushing) < 2 * self.io_workers:
+                    item = pending.popleft()
+                    module_count += 1
+                    self.logger.info(f'yindex on module {item.module_key}. module {module_count} out of {len(changes)}')
+                    module = self._create_module(item)
+                    future = parse_pool.submit(
+                        parse_module_indices,
+                        module,
+                        self.save_file_dir,
+                        self.json_ytree,
+                        self.logger,
+                    )
+                    parsing[future] = (item, module)
+                done, _ = wait([*parsing, *pushing], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in parsing:
+                        item, module = parsing.pop(future)
+                        if (exception := future.exception()) is not None:
+                            self._handle_failed_item(item, exception)
+                            continue
+                        future = io_pool.submit(
+                            push_module_indices,
+                            self.opensearch_manager,
+                            module,
+                            future.result(),
+                            self.logger,
+                        )
+                        pushing[future] = item
+                    else:
+                        item = pushing.pop(future)
+                        if (exception := future.exception()) is not None:
+                            self._handle_failed_item(item, exception)
+                        else:
+                            self.logger.info(f'Module {item.module_key} indexed')
+                            self.indexing_queue.ack([item])
+                            indexed += 1
+        return indexed
+
+    def _process_item(self, item: IndexingQueueItem, process: t.Callable[[IndexingQueueItem], None]) -> bool:
         try:
-            with open(changes_cache_path, 'r') as reader:
-                changes_cache = json.load(reader)
-        except (FileNotFoundError, json.decoder.JSONDecodeError):
-            with open(changes_cache_path, 'w') as writer:
-                json.dump({}, writer)
-
-        return changes_cache
-
-    def _load_delete_cache(self, delete_cache_path: str):
-        delete_cache = []
-
-        try:
-            with open(delete_cache_path, 'r') as reader:
-                delete_cache = json.load(reader)
-        except (FileNotFoundError, json.decoder.JSONDecodeError):
-            with open(delete_cache_path, 'w') as writer:
-                json.dump([], writer)
-
-        return delete_cache
-
-    def _backup_cache_files(self, cache_path: str):
-        shutil.copyfile(cache_path, f'{cache_path}.bak')
-        empty = {}
-        if 'deletes' in cache_path:
-            empty = []
-        with open(cache_path, 'w') as writer:
-            json.dump(empty, writer)
+            process(item)
+        except Exception as e:
+            self._handle_failed_item(item, e)
+            return False
+        self.indexing_queue.ack([item])
+        return True
+
+    def _handle_failed_item(self, item: IndexingQueueItem, exception: Exception):
+        self.logger.error(f'Problem while processing module {item.module_key}', exc_info=exception)
+        if item.attempts + 1 < self.max_attempts:
+            self.indexing_queue.retry([item], delay=self.retry_delay)
+            return
+        self.logger.error(f'Giving up on module {item.module_key} after {self.max_attempts} attempts')
+        if item.action == INDEX:
+            try:
+                with open(self.failed_changes_cache_path, 'r') as reader:
+                    failed_modules = json.load(reader)
+            except (FileNotFoundError, json.decoder.JSONDecodeError):
+                failed_modules = {}
+            failed_modules[item.module_key] = item.path
+            with open(self.failed_changes_cache_path, 'w') as writer:
+                json.dump(failed_modules, writer)
+        self.indexing_queue.ack([item])
+
+    def _delete_module_from_es(self, item: IndexingQueueItem):
+        name, rev_org = item.module_key.split('@')
+        revision, organization = rev_org.split('/')
+        revision = validate_revision(revision)
+        self.logger.info(f'Deleting {item.module_key} from opensearch indices')
+        module = {
+            'name': name,
+            'revision': revision,
+            'organization': organization,
+        }
+        self.opensearch_manager.delete_from_indices(module)
+
+    def _change_module_in_es(self, item: IndexingQueueItem):
+        module = self._create_module(item)
+        build_indices(self.opensearch_manager, module, self.save_file_dir, self.json_ytree, self.logger)
+
+    def _create_module(self, item: IndexingQueueItem) -> BuildYINDEXModule:
+        name, rev_org = item.module_key.split('@')
+        revision, organization = rev_org.split('/')
+        revision = validate_revision(revision)
+        return BuildYINDEXModule(name=name, revision=revision, organization=organization, path=item.path)
 
 
 def main(script_config: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()):
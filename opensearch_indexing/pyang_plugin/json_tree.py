@@ -19,7 +19,9 @@ hierarchy of the YANG module(s).  This is based on the
 jstree output plugin.
 """
 
+import hashlib
 import json
+import typing as t
 
 from pyang import plugin, statements, util
 
@@ -320,3 +322,31 @@ def mk_path_str(s, with_prefixes=False):
     else:
         p = mk_path_str(s.parent, with_prefixes)
         return p + '/' + name(s)
+
+
+def tree_fingerprint(node: t.Any, ignored_keys: t.Container[str] = ('description',)) -> str:
+    """
+    Return a Merkle-style structural fingerprint of an emitted json tree node.
+    The fingerprint of a node is a hash over the fingerprints of its children, so two trees
+    have the same fingerprint only if all their subtrees are equal. Order of the dict keys
+    and of the list items is not significant, values of the ignored keys are not taken into account.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(node, dict):
+        digest.update(b'd')
+        for key in sorted(node):
+            if key in ignored_keys:
+                continue
+            digest.update(f'{key}\0{tree_fingerprint(node[key], ignored_keys)}\0'.encode())
+    elif isinstance(node, (list, tuple)):
+        digest.update(b'l')
+        for child_fingerprint in sorted(tree_fingerprint(child, ignored_keys) for child in node):
+            digest.update(child_fingerprint.encode())
+    elif isinstance(node, (set, frozenset)):
+        digest.update(b's')
+        for item in sorted(json.dumps(item) for item in node):
+            digest.update(f'{item}\0'.encode())
+    else:
+        digest.update(b'v')
+        digest.update(json.dumps(node).encode())
+    return digest.hexdigest()
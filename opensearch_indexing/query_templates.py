@@ -0,0 +1,42 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+"""
+Registry of the json templates of OpenSearch queries and index configurations.
+Each template is read from the disk only once per process, and callers get their own copy to fill in.
+"""
+
+import copy
+import functools
+import json
+import os
+
+
+@functools.cache
+def _load_template(relative_path: str) -> dict:
+    with open(os.path.join(os.environ['BACKEND'], relative_path), encoding='utf-8') as reader:
+        return json.load(reader)
+
+
+def get_template(relative_path: str) -> dict:
+    """
+    Return a copy of the json template, which can be modified without affecting the other callers.
+
+    Argument:
+        :param relative_path    (str) Path to the json file relative to the BACKEND directory
+    """
+    return copy.deepcopy(_load_template(relative_path))
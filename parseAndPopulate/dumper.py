@@ -19,6 +19,7 @@ __copyright__ = 'Copyright 2018 Cisco and its affiliates, Copyright The IETF Tru
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
+import gzip
 import json
 import os.path
 import typing as t
@@ -30,6 +31,10 @@ from parseAndPopulate.models.submodule import Submodule
 from parseAndPopulate.modules import Module
 from parseAndPopulate.nullJsonEncoder import NullJsonEncoder
 
+# Supported formats of the dumped files. 'json' writes a single json document,
+# the other formats write one json record per line, optionally gzip compressed.
+DUMP_FORMATS = ('json', 'jsonl', 'jsonl.gz')
+
 
 def get_deviations(deviations: t.Optional[list[Implementation.Deviation]]) -> t.Optional[list[dict]]:
     if deviations is None:
@@ -46,14 +51,18 @@ def get_dependencies(dependencies: t.Union[None, list[Dependency], list[Submodul
 class Dumper:
     """A dumper for yang module metadata."""
 
-    def __init__(self, log_directory: str, file_name: str):
+    def __init__(self, log_directory: str, file_name: str, dump_format: str = 'json'):
         """
         Arguments:
             :param log_directory:           (str) directory where the log file is saved
             :param file_name:               (str) name of the file to which the modules are dumped
+            :param dump_format:             (str) format of the dumped files, one of DUMP_FORMATS
         """
+        if dump_format not in DUMP_FORMATS:
+            raise ValueError(f'Unknown dump format: {dump_format}')
         self.logger = log.get_logger(__name__, os.path.join(log_directory, 'parseAndPopulate.log'))
         self.file_name = file_name
+        self.dump_format = dump_format
         self.yang_modules: dict[str, Module] = {}
 
     def add_module(self, yang: Module):
@@ -73,149 +82,216 @@ class Dumper:
     def dump_modules(self, directory: str):
         """
         Dump all module data into a json file.
+        With the line-delimited formats, each module is written as a separate record,
+        so the whole 'module' list is never built in memory.
 
         Argument:
             :param directory    (str) Absolute path to the directory where the .json file will be saved.
         """
-        self.logger.debug(f'Creating {self.file_name}.json file from sdo information')
-
-        with open(os.path.join(directory, f'{self.file_name}.json'), 'w') as prepare_model:
-            json.dump(
-                {
-                    'module': [
-                        {
-                            'name': (yang_module := self.yang_modules[key]).name,
-                            'revision': yang_module.revision,
-                            'organization': yang_module.organization,
-                            'schema': yang_module.schema,
-                            'generated-from': yang_module.generated_from,
-                            'maturity-level': yang_module.maturity_level,
-                            'document-name': yang_module.document_name,
-                            'author-email': yang_module.author_email,
-                            'reference': yang_module.reference,
-                            'module-classification': yang_module.module_classification,
-                            'compilation-status': yang_module.compilation_status,
-                            'compilation-result': yang_module.compilation_result,
-                            'expires': None,
-                            'expired': None,
-                            'prefix': yang_module.prefix,
-                            'yang-version': yang_module.yang_version,
-                            'description': yang_module.description,
-                            'contact': yang_module.contact,
-                            'module-type': yang_module.module_type,
-                            'belongs-to': yang_module.belongs_to,
-                            'tree-type': None,
-                            'yang-tree': yang_module.tree,
-                            'ietf': {'ietf-wg': yang_module.ietf_wg},
-                            'namespace': yang_module.namespace,
-                            'submodule': get_dependencies(yang_module.submodule),
-                            'dependencies': get_dependencies(yang_module.dependencies),
-                            'semantic-version': yang_module.semantic_version,
-                            'derived-semantic-version': None,
-                            'implementations': {
-                                'implementation': [
-                                    {
-                                        'vendor': implementation.vendor,
-                                        'platform': implementation.platform,
-                                        'software-version': implementation.software_version,
-                                        'software-flavor': implementation.software_flavor,
-                                        'os-version': implementation.os_version,
-                                        'feature-set': implementation.feature_set,
-                                        'os-type': implementation.os_type,
-                                        'feature': implementation.feature,
-                                        'deviation': get_deviations(implementation.deviations),
-                                        'conformance-type': implementation.conformance_type,
-                                    }
-                                    for implementation in yang_module.implementations
-                                ],
-                            },
-                        }
-                        for key in sorted(self.yang_modules.keys())
-                    ],
-                },
-                prepare_model,
-                cls=NullJsonEncoder,
-            )
+        self.logger.debug(f'Creating {self.file_name}.{self.dump_format} file from sdo information')
+
+        path = os.path.join(directory, f'{self.file_name}.{self.dump_format}')
+        records = (self._module_record(self.yang_modules[key]) for key in sorted(self.yang_modules.keys()))
+        if self.dump_format == 'json':
+            with open(path, 'w') as prepare_model:
+                json.dump({'module': list(records)}, prepare_model, cls=NullJsonEncoder)
+        else:
+            self._write_records(path, records)
 
     def dump_vendors(self, directory: str):
         """
         Dump vendor and implementation metadata into a normal.json file.
+        With the line-delimited formats, each vendor entry is written as a separate record.
 
         Argument:
             :param directory    (str) Absolute path to the directory where .json file will be saved.
         """
-        self.logger.debug('Creating normal.json file from vendor implementation information')
-
-        with open(os.path.join(directory, 'normal.json'), 'w') as f:
-            json.dump(
-                {
-                    'vendors': {
-                        'vendor': [
-                            {
-                                'name': impl.vendor,
-                                'platforms': {
-                                    'platform': [
-                                        {
-                                            'name': impl.platform,
-                                            'software-versions': {
-                                                'software-version': [
-                                                    {
-                                                        'name': impl.software_version,
-                                                        'software-flavors': {
-                                                            'software-flavor': [
-                                                                {
-                                                                    'name': impl.software_flavor,
-                                                                    'protocols': {
-                                                                        'protocol': [
-                                                                            {
-                                                                                'name': 'netconf',
-                                                                                'capabilities': impl.capabilities,
-                                                                                'protocol-version': (
-                                                                                    impl.netconf_versions
-                                                                                ),
-                                                                            },
-                                                                        ],
-                                                                    },
-                                                                    'modules': {
-                                                                        'module': [
-                                                                            {
-                                                                                'name': (
-                                                                                    yang_module := self.yang_modules[
-                                                                                        key
-                                                                                    ]
-                                                                                ).name,
-                                                                                'revision': yang_module.revision,
-                                                                                'organization': (
-                                                                                    yang_module.organization
-                                                                                ),
-                                                                                'os-version': impl.os_version,
-                                                                                'feature-set': impl.feature_set,
-                                                                                'os-type': impl.os_type,
-                                                                                'feature': impl.feature,
-                                                                                'deviation': get_deviations(
-                                                                                    impl.deviations,
-                                                                                ),
-                                                                                'conformance-type': (
-                                                                                    impl.conformance_type
-                                                                                ),
-                                                                            },
-                                                                        ],
-                                                                    },
-                                                                },
-                                                            ],
+        self.logger.debug(f'Creating normal.{self.dump_format} file from vendor implementation information')
+
+        path = os.path.join(directory, f'normal.{self.dump_format}')
+        records = (
+            self._vendor_record(self.yang_modules[key], impl)
+            for key in sorted(self.yang_modules.keys())
+            for impl in self.yang_modules[key].implementations
+        )
+        if self.dump_format == 'json':
+            with open(path, 'w') as f:
+                json.dump({'vendors': {'vendor': list(records)}}, f, cls=NullJsonEncoder)
+        else:
+            self._write_records(path, records)
+
+    def _write_records(self, path: str, records: t.Iterable[dict]):
+        with _open_dump_file(path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, cls=NullJsonEncoder))
+                f.write('\n')
+
+    def _module_record(self, yang_module: Module) -> dict:
+        return {
+            'name': yang_module.name,
+            'revision': yang_module.revision,
+            'organization': yang_module.organization,
+            'schema': yang_module.schema,
+            'generated-from': yang_module.generated_from,
+            'maturity-level': yang_module.maturity_level,
+            'document-name': yang_module.document_name,
+            'author-email': yang_module.author_email,
+            'reference': yang_module.reference,
+            'module-classification': yang_module.module_classification,
+            'compilation-status': yang_module.compilation_status,
+            'compilation-result': yang_module.compilation_result,
+            'expires': None,
+            'expired': None,
+            'prefix': yang_module.prefix,
+            'yang-version': yang_module.yang_version,
+            'description': yang_module.description,
+            'contact': yang_module.contact,
+            'module-type': yang_module.module_type,
+            'belongs-to': yang_module.belongs_to,
+            'tree-type': None,
+            'yang-tree': yang_module.tree,
+            'ietf': {'ietf-wg': yang_module.ietf_wg},
+            'namespace': yang_module.namespace,
+            'submodule': get_dependencies(yang_module.submodule),
+            'dependencies': get_dependencies(yang_module.dependencies),
+            'semantic-version': yang_module.semantic_version,
+            'derived-semantic-version': None,
+            'implementations': {
+                'implementation': [
+                    {
+                        'vendor': implementation.vendor,
+                        'platform': implementation.platform,
+                        'software-version': implementation.software_version,
+                        'software-flavor': implementation.software_flavor,
+                        'os-version': implementation.os_version,
+                        'feature-set': implementation.feature_set,
+                        'os-type': implementation.os_type,
+                        'feature': implementation.feature,
+                        'deviation': get_deviations(implementation.deviations),
+                        'conformance-type': implementation.conformance_type,
+                    }
+                    for implementation in yang_module.implementations
+                ],
+            },
+        }
+
+    def _vendor_record(self, yang_module: Module, impl: Implementation) -> dict:
+        return {
+            'name': impl.vendor,
+            'platforms': {
+                'platform': [
+                    {
+                        'name': impl.platform,
+                        'software-versions': {
+                            'software-version': [
+                                {
+                                    'name': impl.software_version,
+                                    'software-flavors': {
+                                        'software-flavor': [
+                                            {
+                                                'name': impl.software_flavor,
+                                                'protocols': {
+                                                    'protocol': [
+                                                        {
+                                                            'name': 'netconf',
+                                                            'capabilities': impl.capabilities,
+                                                            'protocol-version': impl.netconf_versions,
+                                                        },
+                                                    ],
+                                                },
+                                                'modules': {
+                                                    'module': [
+                                                        {
+                                                            'name': yang_module.name,
+                                                            'revision': yang_module.revision,
+                                                            'organization': yang_module.organization,
+                                                            'os-version': impl.os_version,
+                                                            'feature-set': impl.feature_set,
+                                                            'os-type': impl.os_type,
+                                                            'feature': impl.feature,
+                                                            'deviation': get_deviations(impl.deviations),
+                                                            'conformance-type': impl.conformance_type,
                                                         },
-                                                    },
-                                                ],
+                                                    ],
+                                                },
                                             },
-                                        },
-                                    ],
+                                        ],
+                                    },
                                 },
-                            }
-                            for key in sorted(self.yang_modules.keys())
-                            for impl in self.yang_modules[key].implementations
-                        ],
+                            ],
+                        },
                     },
-                },
-                f,
-                cls=NullJsonEncoder,
-            )
+                ],
+            },
+        }
+
+
+def find_dump_file(directory: str, file_name: str) -> t.Optional[str]:
+    """
+    Find the file dumped by the Dumper in any of the supported formats.
+    If files in several formats exist, e.g. a leftover of a run with a different format, the newest one is returned.
+
+    Arguments:
+        :param directory    (str) Directory where the dumped file is stored
+        :param file_name    (str) Name of the dumped file without an extension (e.g. 'prepare' or 'normal')
+        :return             (Optional[str]) Path to the dumped file or None if it doesn't exist
+    """
+    paths = [os.path.join(directory, f'{file_name}.{dump_format}') for dump_format in DUMP_FORMATS]
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return None
+    return max(paths, key=os.path.getmtime)
+
+
+def load_dumped_modules(directory: str, file_name: str = 'prepare') -> t.Iterator[dict]:
+    """
+    Iterate over the module records dumped by Dumper.dump_modules().
+    Line-delimited files are read record by record.
+
+    Arguments:
+        :param directory    (str) Directory where the dumped file is stored
+        :param file_name    (str) Name of the dumped file without an extension
+    """
+    path = find_dump_file(directory, file_name)
+    if path is not None:
+        yield from load_dump_file(path, ('module',))
+
+
+def load_dumped_vendors(directory: str) -> t.Iterator[dict]:
+    """
+    Iterate over the vendor records dumped by Dumper.dump_vendors().
+    Line-delimited files are read record by record.
+
+    Argument:
+        :param directory    (str) Directory where the dumped file is stored
+    """
+    path = find_dump_file(directory, 'normal')
+    if path is not None:
+        yield from load_dump_file(path, ('vendors', 'vendor'))
+
+
+def load_dump_file(path: str, json_keys: tuple[str, ...]) -> t.Iterator[dict]:
+    """
+    Iterate over the records of a file dumped in any of the supported formats.
+
+    Arguments:
+        :param path         (str) Path to the dumped file
+        :param json_keys    (tuple[str, ...]) Keys leading to the list of records in the single document .json format
+    """
+    if path.endswith('.json'):
+        with open(path, 'r') as f:
+            records = json.load(f)
+        for key in json_keys:
+            records = records.get(key) or {}
+        yield from records or []
+        return
+    with _open_dump_file(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _open_dump_file(path: str, mode: t.Literal['r', 'w']) -> t.TextIO:
+    if path.endswith('.gz'):
+        return gzip.open(path, f'{mode}t', encoding='utf-8')  # pyright: ignore
+    return open(path, mode)
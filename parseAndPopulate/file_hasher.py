@@ -20,6 +20,7 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 import hashlib
 import json
 import os
+import sqlite3
 import threading
 import typing as t
 from dataclasses import dataclass
@@ -29,6 +30,8 @@ import pyang
 from utility import log
 
 BLOCK_SIZE = 65536  # The size of each read from the file
+SQLITE_BATCH_SIZE = 1000  # Number of rows upserted per sqlite transaction
+SQLITE_TIMEOUT = 60  # Seconds to wait for a lock held by another process
 
 
 @dataclass
@@ -47,8 +50,101 @@ class VendorModuleHashCheckForParsing:
         return not (self.file_hash_exists and not self.new_implementations_detected)
 
 
+class SqliteHashesStore:
+    """
+    Hashes store backed by an sqlite database.
+    Each (path, hash, implementation) triple is stored as a separate row, so new entries can be upserted
+    one by one without rewriting the whole store, and several processes can share the same database file.
+    SDO modules don't have any implementations, their hashes are stored with an empty implementation.
+    """
+
+    def __init__(self, db_path: str, logger):
+        self.db_path = db_path
+        self.logger = logger
+        self._connection: t.Optional[sqlite3.Connection] = None
+        self._connection_pid: t.Optional[int] = None
+        self._initialize()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite connections must not be shared with forked processes, so every process opens its own connection
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _initialize(self):
+        with self.connection as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS file_hashes ('
+                'path TEXT NOT NULL, '
+                'hash TEXT NOT NULL, '
+                "implementation TEXT NOT NULL DEFAULT '', "
+                'PRIMARY KEY (path, hash, implementation)'
+                ') WITHOUT ROWID',
+            )
+
+    def get(self, path: str, default: t.Optional[dict] = None) -> dict[str, list[str]]:
+        """Return {hash: [implementations]} dictionary stored for the given path."""
+        cursor = self.connection.execute('SELECT hash, implementation FROM file_hashes WHERE path = ?', (path,))
+        hashes = {}
+        for file_hash, implementation in cursor:
+            implementations = hashes.setdefault(file_hash, [])
+            if implementation:
+                implementations.append(implementation)
+        if not hashes and default is not None:
+            return default
+        return hashes
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(DISTINCT path) FROM file_hashes').fetchone()[0]
+
+    def upsert(self, path: str, file_hash: str, implementations: t.Iterable[str] = ()):
+        """Store a single path/hash entry together with its implementations."""
+        self.merge({path: {file_hash: list(implementations)}})
+
+    def merge(self, new_hashes: dict, batch_size: int = SQLITE_BATCH_SIZE):
+        """
+        Merge {path: {hash: [implementations]}} dictionary into the store.
+        Rows are upserted in batches, each batch is committed in a separate transaction.
+        """
+        batch = []
+        for path, hashes in new_hashes.items():
+            for file_hash, implementations in hashes.items():
+                batch.append((path, file_hash, ''))
+                batch.extend((path, file_hash, implementation) for implementation in implementations)
+                if len(batch) >= batch_size:
+                    self._insert(batch)
+                    batch = []
+        if batch:
+            self._insert(batch)
+        self.logger.info(f'{len(new_hashes)} paths hashes successfully merged into {self.db_path}')
+
+    def import_json(self, json_path: str):
+        """Import hashes from the .json file used by the default FileHasher store."""
+        try:
+            with open(json_path, 'r') as f:
+                hashes = json.load(f)
+        except FileNotFoundError:
+            return
+        self.logger.info(f'Importing {len(hashes)} hashes from {json_path}')
+        self.merge(hashes)
+
+    def is_empty(self) -> bool:
+        return self.connection.execute('SELECT 1 FROM file_hashes LIMIT 1').fetchone() is None
+
+    def _insert(self, rows: list[tuple[str, str, str]]):
+        with self.connection as connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO file_hashes (path, hash, implementation) VALUES (?, ?, ?)',
+                rows,
+            )
+
+
 class FileHasher:
-    def __init__(self, file_name: str, cache_dir: str, is_active: bool, log_directory: str):
+    def __init__(self, file_name: str, cache_dir: str, is_active: bool, log_directory: str, backend: str = 'json'):
         """
         The format of the cache file is:
         {
@@ -63,16 +159,35 @@ class FileHasher:
             :param is_active        (bool) whether FileHasher is active or not
             (use hashes to skip module parsing or not)
             :param log_directory    (str) directory where the log file is saved
+            :param backend          (str) 'json' to keep all the hashes in a single .json file,
+            or 'sqlite' to store them in an sqlite database which is queried and updated per entry
         """
+        if backend not in ('json', 'sqlite'):
+            raise ValueError(f'Unknown FileHasher backend: {backend}')
         self.file_name = file_name
         self.cache_dir = cache_dir
         self.disabled = not is_active
+        self.backend = backend
         self.logger = log.get_logger(__name__, os.path.join(log_directory, 'parseAndPopulate.log'))
         self.lock = threading.Lock()
         self.validators_versions_bytes = self.get_versions()
-        self.files_hashes = self.load_hashed_files_data()
+        self.files_hashes: t.Union[dict, SqliteHashesStore]
+        if backend == 'sqlite':
+            self.files_hashes = self.load_sqlite_store()
+        else:
+            self.files_hashes = self.load_hashed_files_data()
         self.updated_hashes = {}
 
+    def load_sqlite_store(self) -> SqliteHashesStore:
+        """
+        Open the sqlite hashes store in the cache directory.
+        If the store is empty, hashes from the existing .json file are imported into it.
+        """
+        store = SqliteHashesStore(os.path.join(self.cache_dir, f'{self.file_name}.sqlite'), self.logger)
+        if store.is_empty():
+            store.import_json(os.path.join(self.cache_dir, f'{self.file_name}.json'))
+        return store
+
     def hash_file(self, path: str) -> str:
         """Create hash from content of the given file and validators versions.
         Each time either the content of the file or the validator version change,
@@ -122,12 +237,19 @@ class FileHasher:
     def merge_and_dump_hashed_files_list(self, new_hashes: dict, dst_dir: str = ''):
         """Dumped updated list of files content hashes into .json file.
         Several threads can access this file at once, so locking the file while accessing is necessary.
+        With the sqlite backend, the new hashes are upserted into the database instead.
 
         Arguments:
             :param new_hashes (dict) Dictionary of the hashes to be dumped
             :param dst_dir      (str) Optional - directory where the .json file with hashes is saved
         """
         dst_dir = self.cache_dir if dst_dir == '' else dst_dir
+        if self.backend == 'sqlite':
+            store = self.files_hashes
+            if dst_dir != self.cache_dir:
+                store = SqliteHashesStore(os.path.join(dst_dir, f'{self.file_name}.sqlite'), self.logger)
+            store.merge(new_hashes)
+            return
 
         # Load existing hashes, merge with new one, then dump all to the .json file
         self.lock.acquire()
@@ -32,6 +32,7 @@ from parseAndPopulate.models.implementation import Implementation
 from parseAndPopulate.models.submodule import Submodule
 from parseAndPopulate.models.vendor_modules import VendorInfo
 from parseAndPopulate.resolvers.basic import BasicResolver
+from parseAndPopulate.resolvers.extractor import ModuleExtractor
 from parseAndPopulate.resolvers.generated_from import GeneratedFromResolver
 from parseAndPopulate.resolvers.implementations import ImplementationResolver
 from parseAndPopulate.resolvers.imports import ImportsResolver
@@ -95,6 +96,8 @@ class Module:
         self.logger = log.get_logger('modules', os.path.join(dir_paths['log'], 'parseAndPopulate.log'))
         self._domain_prefix = config.get('Web-Section', 'domain-prefix', fallback='https://yangcatalog.org')
         self._nonietf_dir = config.get('Directory-Section', 'non-ietf-directory')
+        self._save_file_dir = config.get('Directory-Section', 'save-file-dir')
+        self._profile = config.getboolean('General-Section', 'profile-module-parsing', fallback=False)
         self.html_result_dir = dir_paths['result']
         self._path = path
         self.yang_models_path = dir_paths['yang_models']
@@ -132,21 +135,27 @@ class Module:
         if self._parsed_yang.arg is None:
             raise ValueError(f'{self._path} did not contain a module statement')
         self.name: str = self._parsed_yang.arg
-        revision_resolver = RevisionResolver(self._parsed_yang, self.logger)
-        self.revision = revision_resolver.resolve()
+        extractor = ModuleExtractor(self._parsed_yang, self.logger, self._save_file_dir, profile=self._profile)
+        parsed_yang = extractor.statement
+        self.revision = extractor.resolve('revision', RevisionResolver(parsed_yang, self.logger))
         name_revision = f'{self.name}@{self.revision}'
 
-        belongs_to_resolver = BasicResolver(self._parsed_yang, 'belongs_to')
-        self.belongs_to = belongs_to_resolver.resolve()
+        self.belongs_to = extractor.resolve('belongs-to', BasicResolver(parsed_yang, 'belongs_to'))
 
-        namespace_resolver = NamespaceResolver(self._parsed_yang, self.logger, name_revision, self.belongs_to)
-        self.namespace = namespace_resolver.resolve()
+        namespace_resolver = NamespaceResolver(
+            parsed_yang,
+            self.logger,
+            name_revision,
+            self.belongs_to,
+            find_yang=extractor.find_yang,
+            parse_yang=extractor.parse_yang,
+        )
+        self.namespace = extractor.resolve('namespace', namespace_resolver)
 
-        organization_resolver = OrganizationResolver(self._parsed_yang, self.logger, self.namespace)
-        self.organization = organization or organization_resolver.resolve()
+        organization_resolver = OrganizationResolver(parsed_yang, self.logger, self.namespace)
+        self.organization = organization or extractor.resolve('organization', organization_resolver)
 
-        module_type_resolver = ModuleTypeResolver(self._parsed_yang, self.logger)
-        self.module_type = module_type_resolver.resolve()
+        self.module_type = extractor.resolve('module-type', ModuleTypeResolver(parsed_yang, self.logger))
 
         key = f'{self.name}@{self.revision}/{self.organization}'
         if key in yang_modules:
@@ -161,32 +170,48 @@ class Module:
 
         self.schema = yang_url(self.name, self.revision)
 
-        submodule_resolver = SubmoduleResolver(self._parsed_yang, self.logger, self._domain_prefix)
-        self.dependencies, self.submodule = submodule_resolver.resolve()
+        submodule_resolver = SubmoduleResolver(
+            parsed_yang,
+            self.logger,
+            self._domain_prefix,
+            find_yang=extractor.find_yang,
+        )
+        self.dependencies, self.submodule = extractor.resolve('submodule', submodule_resolver)
 
         imports_resolver = ImportsResolver(
-            self._parsed_yang,
+            parsed_yang,
             self.logger,
             self._domain_prefix,
+            find_yang=extractor.find_yang,
         )
-        self.imports = imports_resolver.resolve()
+        self.imports = extractor.resolve('imports', imports_resolver)
         self.dependencies.extend(self.imports)
 
-        semantic_version_resolver = SemanticVersionResolver(self._parsed_yang, self.logger)
-        self.semantic_version = semantic_version_resolver.resolve()
+        semantic_version_resolver = SemanticVersionResolver(parsed_yang, self.logger)
+        self.semantic_version = extractor.resolve('semantic-version', semantic_version_resolver)
 
-        yang_version_resolver = YangVersionResolver(self._parsed_yang, self.logger)
-        self.yang_version = yang_version_resolver.resolve()
+        self.yang_version = extractor.resolve('yang-version', YangVersionResolver(parsed_yang, self.logger))
 
-        self.contact = BasicResolver(self._parsed_yang, 'contact').resolve()
-        self.description = BasicResolver(self._parsed_yang, 'description').resolve()
+        self.contact = extractor.resolve('contact', BasicResolver(parsed_yang, 'contact'))
+        self.description = extractor.resolve('description', BasicResolver(parsed_yang, 'description'))
 
-        self.generated_from = generated_from or GeneratedFromResolver(self.logger, self.name, self.namespace).resolve()
+        self.generated_from = generated_from or extractor.resolve(
+            'generated-from',
+            GeneratedFromResolver(self.logger, self.name, self.namespace),
+        )
 
-        prefix_resolver = PrefixResolver(self._parsed_yang, self.logger, name_revision, self.belongs_to)
-        self.prefix = prefix_resolver.resolve()
+        prefix_resolver = PrefixResolver(
+            parsed_yang,
+            self.logger,
+            name_revision,
+            self.belongs_to,
+            find_yang=extractor.find_yang,
+            parse_yang=extractor.parse_yang,
+        )
+        self.prefix = extractor.resolve('prefix', prefix_resolver)
 
         self.tree = self._resolve_tree(self.module_type)
+        extractor.report(name_revision)
 
     def _populate_information_from_db(self, module_data_from_db: dict):
         dependencies_keys = ('submodule', 'dependencies')
@@ -29,6 +29,7 @@ __email__ = 'miroslav.kovac@pantheon.tech'
 
 import io
 import json
+import multiprocessing
 import os
 import typing as t
 from collections import defaultdict
@@ -41,6 +42,8 @@ from pyang import plugin
 from pyang.plugins.tree import emit_tree
 
 from opensearch_indexing.pyang_plugin.json_tree import emit_tree as emit_json_tree
+from opensearch_indexing.pyang_plugin.json_tree import tree_fingerprint
+from parseAndPopulate.dumper import load_dumped_modules
 from redisConnections.redisConnection import RedisConnection
 from utility import log, message_factory
 from utility.confdService import ConfdService
@@ -53,6 +56,10 @@ MINOR = 1
 PATCH = 2
 
 
+# instance used by the forked semver worker processes, set only while the worker pool is running
+_semver_algorithms: t.Optional['ModulesComplicatedAlgorithms'] = None
+
+
 class ModuleMetadata(dict):
     """Module metadata as it can be found in the models subtree of yangcatalog."""
 
@@ -93,6 +100,31 @@ class DependencyMetadata(t.TypedDict):
 NameRevisionModuleTable = dict[str, dict[str, ModuleMetadata]]
 
 
+class ReverseDependencyIndex:
+    """
+    Index of modules by the names of their dependencies (import -> importers).
+    Modules are added one by one, so the index can be maintained while the modules are loaded,
+    and importers of a set of names are returned in the order in which they were added.
+    """
+
+    def __init__(self):
+        self._modules: list[ModuleMetadata] = []
+        self._importers: dict[str, list[int]] = defaultdict(list)
+
+    def add(self, module: ModuleMetadata):
+        position = len(self._modules)
+        self._modules.append(module)
+        for dependency_name in {dependency['name'] for dependency in module.get('dependencies', [])}:
+            self._importers[dependency_name].append(position)
+
+    def importers(self, names: t.Iterable[str]) -> list[ModuleMetadata]:
+        """Get all the modules depending on at least one of the named modules."""
+        positions = set()
+        for name in names:
+            positions.update(self._importers.get(name, ()))
+        return [self._modules[position] for position in sorted(positions)]
+
+
 class ModulesComplicatedAlgorithms:
     def __init__(
         self,
@@ -105,6 +137,7 @@ class ModulesComplicatedAlgorithms:
         yang_models_dir: str,
         temp_dir: str,
         json_ytree: str,
+        existing_modules: t.Optional[list[dict]] = None,
     ):
         """
         Arguments:
@@ -112,17 +145,18 @@ class ModulesComplicatedAlgorithms:
             :param yangcatalog_api_prefix   (str) URL of yangcatalog's api.
             :param credentials              (list[str]) Credentials of a registered yangcatalog user.
             :param save_file_dir            (str) Directory where all yang models are collected.
-            :param direc                    (str) Directory where to loook for a prepare.json file.
+            :param direc                    (str) Directory where to loook for a prepare file.
             :param all_modules              (Optional[dict]) The module subtree of yangcatalog.
             :param yang_models_dir          (str) Directory to be added to pyangs parsing context.
             :param temp_dir                 (str) Yangcatalog's temp directory.
             :param json_ytree               (str) Directory where json ytrees are stored.
+            :param existing_modules         (Optional[list[dict]]) All the modules of yangcatalog,
+                                            they are fetched if not provided.
         """
         global LOGGER
         LOGGER = log.get_logger('modulesComplicatedAlgorithms', f'{log_directory}/parseAndPopulate.log')
         if all_modules is None:
-            with open(f'{direc}/prepare.json', 'r') as f:
-                all_modules = json.load(f)
+            all_modules = {'module': list(load_dumped_modules(direc))}
         self._yangcatalog_api_prefix = yangcatalog_api_prefix
         self._all_modules: list[ModuleMetadata] = all_modules.get('module', [])  # pyright: ignore
         self.new_modules: NameRevisionModuleTable = defaultdict(dict)
@@ -132,13 +166,16 @@ class ModulesComplicatedAlgorithms:
         self.temp_dir = temp_dir
         self.json_ytree = json_ytree
         self._trees: dict[str, dict[str, str]] = defaultdict(dict)
+        self._tree_fingerprints: dict[str, str] = {}
         self._unavailable_modules = []
 
-        LOGGER.info('Fetching all existing modules.')
-        existing_modules = fetch_modules(LOGGER)
+        if existing_modules is None:
+            LOGGER.info('Fetching all existing modules.')
+            existing_modules = fetch_modules(LOGGER)
 
         self._existing_modules: NameRevisionModuleTable = defaultdict(dict)
         self._latest_revisions = {}
+        self._existing_importers = ReverseDependencyIndex()
         for module in existing_modules:
             # Store latest revision of each module - used in resolving tree-type
             latest_revision = self._latest_revisions.get(module['name'])
@@ -148,14 +185,15 @@ class ModulesComplicatedAlgorithms:
                 self._latest_revisions[module['name']] = max(module['revision'], latest_revision)
 
             self._existing_modules[module['name']][module['revision']] = module
+            self._existing_importers.add(module)
 
     def parse_non_requests(self):
         LOGGER.info('parsing tree types')
         self.resolve_tree_type(self._all_modules)
 
-    def parse_requests(self):
+    def parse_requests(self, semver_workers: int = 1):
         LOGGER.info('parsing semantic version')
-        self.parse_semver()
+        self.parse_semver(workers=semver_workers)
         LOGGER.info('parsing dependents')
         self.parse_dependents()
 
@@ -500,7 +538,64 @@ class ModulesComplicatedAlgorithms:
                 else:
                     self.new_modules[name][revision]['tree-type'] = module['tree-type']
 
-    def parse_semver(self):
+    def parse_semver(self, workers: int = 1):
+        """
+        Derive semantic versions of all the modules.
+        Module families (all the revisions of one module) are independent of each other,
+        so with more than one worker they are spread across a pool of forked processes.
+        Results are merged back in the order of the modules, so they don't depend on the number of workers.
+
+        Arguments:
+            :param workers  (int) Number of processes used to derive the semantic versions
+        """
+        if workers > 1:
+            self._parse_semver_in_parallel(workers)
+        else:
+            self._parse_semver_of_modules()
+        if len(self._unavailable_modules) != 0:
+            mf = message_factory.MessageFactory()
+            mf.send_github_unavailable_schemas(self._unavailable_modules)
+
+    def _parse_semver_in_parallel(self, workers: int):
+        global _semver_algorithms
+        families: dict[str, list[ModuleMetadata]] = defaultdict(list)
+        for module in self._all_modules:
+            families[module['name']].append(module)
+        LOGGER.info(f'Searching semver for {len(families)} module families using {workers} workers')
+        _semver_algorithms = self
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                results = pool.imap(_parse_family_semver, families.values())
+                for x, (family, (processed_family, family_new_modules)) in enumerate(
+                    zip(families.values(), results),
+                    start=1,
+                ):
+                    self._merge_family_semver(family, processed_family, family_new_modules)
+                    LOGGER.info(f'Semver resolved for {x} out of {len(families)} module families')
+        finally:
+            _semver_algorithms = None
+
+    def _merge_family_semver(
+        self,
+        family: list[ModuleMetadata],
+        processed_family: list[ModuleMetadata],
+        family_new_modules: dict[str, ModuleMetadata],
+    ):
+        """Copy the semantic versions derived in a worker process to the modules of this process."""
+        family_modules = {}
+        for module, processed_module in zip(family, processed_family):
+            if 'derived-semantic-version' in processed_module:
+                module['derived-semantic-version'] = processed_module['derived-semantic-version']
+            family_modules[module['revision']] = module
+        for revision, module in family_new_modules.items():
+            name = module['name']
+            if revision in self.new_modules[name]:
+                if 'derived-semantic-version' in module:
+                    self.new_modules[name][revision]['derived-semantic-version'] = module['derived-semantic-version']
+            else:
+                self.new_modules[name][revision] = family_modules.get(revision, module)
+
+    def _parse_semver_of_modules(self):
         def increment_semver(old: str, significance: int) -> str:
             """Increment a semver string at the specified position."""
             versions = old.split('.')
@@ -515,21 +610,15 @@ class ModulesComplicatedAlgorithms:
             new_module['derived-semantic-version'] = upgraded_version
             add_to_new_modules(new_module)
 
-        def trees_match(new, old) -> bool:
-            if type(new) != type(old):
-                return False
-            elif isinstance(new, dict):
-                new.pop('description', None)
-                old.pop('description', None)
-                return new.keys() == old.keys() and all((trees_match(new[i], old[i]) for i in new))
-            elif isinstance(new, list):
-                return len(new) == len(old) and all(any((trees_match(i, j) for j in old)) for i in new)
-            elif type(new) in (str, set, bool):
-                return new == old
-            else:
-                assert False
-
-        def get_trees(new: ModuleSemverMetadata, old: ModuleSemverMetadata) -> t.Optional[t.Tuple[str, str]]:
+        def get_tree_fingerprints(
+            new: ModuleSemverMetadata,
+            old: ModuleSemverMetadata,
+        ) -> t.Optional[t.Tuple[str, str]]:
+            """
+            Get structural fingerprints of the json trees of both revisions.
+            Fingerprints are cached, so the tree of each revision is loaded or emitted at most once.
+            Raises an exception if pyang finds an error while checking the update.
+            """
             new_name_revision = f'{new.name}@{new.revision}'
             old_name_revision = f'{old.name}@{old.revision}'
             new_schema = f'{self._save_file_dir}/{new_name_revision}.yang'
@@ -544,6 +633,8 @@ class ModulesComplicatedAlgorithms:
                 self._save_file_dir,
             )
             if len(ctx.errors) == 0:
+                if new_name_revision in self._tree_fingerprints and old_name_revision in self._tree_fingerprints:
+                    return self._tree_fingerprints[new_name_revision], self._tree_fingerprints[old_name_revision]
                 if os.path.exists(new_tree_path) and os.path.exists(old_tree_path):
                     with open(new_tree_path) as nf, open(old_tree_path) as of:
                         new_yang_tree = json.load(nf)
@@ -572,6 +663,7 @@ class ModulesComplicatedAlgorithms:
                         new_yang_tree = f.getvalue()
                         with open(new_tree_path, 'w') as f:
                             f.write(new_yang_tree)
+                        new_yang_tree = json.loads(new_yang_tree)
                     except Exception:
                         new_yang_tree = ''
                     try:
@@ -580,9 +672,17 @@ class ModulesComplicatedAlgorithms:
                         old_yang_tree = f.getvalue()
                         with open(old_tree_path, 'w') as f:
                             f.write(old_yang_tree)
+                        old_yang_tree = json.loads(old_yang_tree)
                     except Exception:
                         old_yang_tree = '2'
-                return (new_yang_tree, old_yang_tree)
+                new_fingerprint = tree_fingerprint(new_yang_tree)
+                old_fingerprint = tree_fingerprint(old_yang_tree)
+                # trees which could not be emitted are not cached, their fingerprints never match
+                if isinstance(new_yang_tree, dict):
+                    self._tree_fingerprints[new_name_revision] = new_fingerprint
+                if isinstance(old_yang_tree, dict):
+                    self._tree_fingerprints[old_name_revision] = old_fingerprint
+                return new_fingerprint, old_fingerprint
             else:
                 raise Exception
 
@@ -677,12 +777,15 @@ class ModulesComplicatedAlgorithms:
                             update_semver(newest_existing_module_semver_data, new_module, MAJOR)
                         else:
                             try:
-                                trees = get_trees(new_module_semver_data, newest_existing_module_semver_data)
-                                # if schemas do not exist, trees will be None
-                                if not trees:
+                                fingerprints = get_tree_fingerprints(
+                                    new_module_semver_data,
+                                    newest_existing_module_semver_data,
+                                )
+                                # if schemas do not exist, fingerprints will be None
+                                if not fingerprints:
                                     continue
-                                new_yang_tree, old_yang_tree = trees
-                                if trees_match(new_yang_tree, old_yang_tree):
+                                new_fingerprint, old_fingerprint = fingerprints
+                                if new_fingerprint == old_fingerprint:
                                     # yang trees are the same - update only the patch version
                                     update_semver(newest_existing_module_semver_data, new_module, PATCH)
                                 else:
@@ -715,12 +818,15 @@ class ModulesComplicatedAlgorithms:
                             else:
                                 # Both actual and previous revisions have the compilation status 'passed'
                                 try:
-                                    trees = get_trees(curr_module_semver_data, prev_module_semver_data)
-                                    # if schemas do not exist, trees will be None
-                                    if not trees:
+                                    fingerprints = get_tree_fingerprints(
+                                        curr_module_semver_data,
+                                        prev_module_semver_data,
+                                    )
+                                    # if schemas do not exist, fingerprints will be None
+                                    if not fingerprints:
                                         continue
-                                    new_yang_tree, old_yang_tree = trees
-                                    if trees_match(new_yang_tree, old_yang_tree):
+                                    new_fingerprint, old_fingerprint = fingerprints
+                                    if new_fingerprint == old_fingerprint:
                                         # yang trees are the same - update only the patch version
                                         update_semver(prev_module_semver_data, module, 2)
                                         curr_module_semver_data.semver = increment_semver(
@@ -739,10 +845,6 @@ class ModulesComplicatedAlgorithms:
                                     update_semver(prev_module_semver_data, module, 0)
                                     curr_module_semver_data.semver = increment_semver(prev_module_semver_data.semver, 0)
 
-        if len(self._unavailable_modules) != 0:
-            mf = message_factory.MessageFactory()
-            mf.send_github_unavailable_schemas(self._unavailable_modules)
-
     def parse_dependents(self):
         """
         Add new modules as dependents to existing modules that depend on them.
@@ -821,16 +923,22 @@ class ModulesComplicatedAlgorithms:
         new_modules_dict: NameRevisionModuleTable = defaultdict(dict)
         for i in new_modules:
             new_modules_dict[i['name']][i['revision']] = deepcopy(i)
-        both_dict = deepcopy(self._existing_modules)
-        for name, revisions in new_modules_dict.items():
-            both_dict[name].update(deepcopy(revisions))
-        existing_modules = [revision for name in self._existing_modules.values() for revision in name.values()]
+        # only the modules named as dependencies of the new modules can gain new dependents
+        dependency_names = {
+            dependency['name'] for module in new_modules for dependency in module.get('dependencies', [])
+        }
+        both_dict: NameRevisionModuleTable = {}
+        for name in dependency_names:
+            if name in self._existing_modules or name in new_modules_dict:
+                both_dict[name] = {**self._existing_modules.get(name, {}), **new_modules_dict.get(name, {})}
+        # only the existing modules depending on the new modules can be added to them as dependents
+        existing_modules = self._existing_importers.importers(new_modules_dict)
         LOGGER.info('Adding new modules as dependents')
         add_dependents(
             new_modules,
             both_dict,
         )  # New modules can be dependents both to existing modules, and other new modules
-        LOGGER.info('Adding existing modules as dependents')
+        LOGGER.info(f'Adding {len(existing_modules)} existing modules as dependents')
         add_dependents(
             existing_modules,
             new_modules_dict,
@@ -843,3 +951,13 @@ class ModulesComplicatedAlgorithms:
             :param module   (ModuleMetadata) Metadata of the currently parsed module
         """
         return module.get('revision', '') >= self._latest_revisions.get(module['name'], '')
+
+
+def _parse_family_semver(
+    family: list[ModuleMetadata],
+) -> tuple[list[ModuleMetadata], dict[str, ModuleMetadata]]:
+    """Derive semantic versions of a single module family in a forked worker process."""
+    assert _semver_algorithms is not None
+    _semver_algorithms._all_modules = family
+    _semver_algorithms._parse_semver_of_modules()
+    return family, _semver_algorithms.new_modules.get(family[0]['name'], {})
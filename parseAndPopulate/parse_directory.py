@@ -26,6 +26,8 @@ __email__ = 'miroslav.kovac@pantheon.tech'
 
 import fnmatch
 import glob
+import hashlib
+import json
 import os
 import shutil
 import time
@@ -38,11 +40,12 @@ from parseAndPopulate.dumper import Dumper
 from parseAndPopulate.file_hasher import FileHasher
 from parseAndPopulate.groupings import IanaDirectory, SdoDirectory, VendorCapabilities, VendorYangLibrary
 from parseAndPopulate.models.directory_paths import DirPaths
+from parseAndPopulate.resolvers.extractor import ModuleExtractor, format_timings
 from redisConnections.redisConnection import RedisConnection
 from utility.create_config import create_config
 from utility.script_config_dict import script_config_dict
 from utility.scriptConfig import ScriptConfig
-from utility.util import parse_name, parse_revision, strip_comments
+from utility.util import parse_name, parse_name_and_revision, parse_revision, strip_comments
 
 BASENAME = os.path.basename(__file__)
 FILENAME = BASENAME.split('.py')[0]
@@ -73,16 +76,26 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> tuple[int,
     redis_connection = RedisConnection(config=config)
 
     start = time.time()
-    dumper = Dumper(dir_paths['log'], 'prepare')
+    dumper = Dumper(
+        dir_paths['log'],
+        'prepare',
+        dump_format=config.get('Directory-Section', 'dump-format', fallback='json'),
+    )
     file_hasher = FileHasher(
         'backend_files_modification_hashes',
         dir_paths['cache'],
         args.save_file_hash,
         dir_paths['log'],
+        backend=config.get('Directory-Section', 'file-hashes-backend', fallback='json'),
     )
 
     logger.info('Saving all yang files so the save-file-dir')
-    file_mapping = save_files(args.dir, dir_paths['save'])
+    file_mapping = save_files(
+        args.dir,
+        dir_paths['save'],
+        incremental=config.getboolean('Directory-Section', 'incremental-save-files', fallback=False),
+        manifest_path=os.path.join(dir_paths['cache'], 'save_files_manifest.json'),
+    )
     logger.info('Starting to iterate through files')
     if args.sdo:
         stats = parse_sdo(
@@ -112,6 +125,8 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> tuple[int,
 
     end = time.time()
     logger.info(f'Time taken to parse all the files {int(end - start)} seconds')
+    if ModuleExtractor.total_timings:
+        logger.info(f'Time spent resolving module fields: {format_timings(ModuleExtractor.total_timings)}')
 
     # Dump updated hashes into temporary directory
     if len(file_hasher.updated_hashes) > 0:
@@ -123,17 +138,28 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> tuple[int,
 def save_files(
     search_directory: str,
     save_file_dir: str,
+    incremental: bool = False,
+    manifest_path: t.Optional[str] = None,
 ) -> dict[str, str]:
     """
     Copy all found yang files to the save_file_dir.
     Return dicts with data containing the original locations of the files,
     which is later needed for parsing.
 
+    In the incremental mode, the size, modification time and content hash of each found file are stored in the
+    manifest file. Files whose stats or content hash did not change since the last run are not parsed again,
+    the name and revision of the other files are parsed only from the header of the module,
+    and new files are hardlinked to the save_file_dir where the filesystem allows it.
+
     Arguments:
         :param search_directory     (str) Directory to process
         :param save_file_dir        (str) Directory to save yang files to
+        :param incremental          (bool) Whether to use the incremental mode
+        :param manifest_path        (Optional[str]) Path to the manifest file used in the incremental mode
         :return                     (dict[str, str]) Mapping of original to new file paths
     """
+    if incremental:
+        return _save_files_incremental(search_directory, save_file_dir, manifest_path)
     file_mapping = {}
     for yang_file in glob.glob(os.path.join(search_directory, '**/*.yang'), recursive=True):
         with open(yang_file) as f:
@@ -148,6 +174,60 @@ def save_files(
     return file_mapping
 
 
+def _save_files_incremental(
+    search_directory: str,
+    save_file_dir: str,
+    manifest_path: t.Optional[str],
+) -> dict[str, str]:
+    manifest: dict[str, dict] = {}
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    file_mapping = {}
+    for yang_file in glob.glob(os.path.join(search_directory, '**/*.yang'), recursive=True):
+        file_stat = os.stat(yang_file)
+        entry = manifest.get(yang_file)
+        if (
+            entry
+            and entry['size'] == file_stat.st_size
+            and entry['mtime_ns'] == file_stat.st_mtime_ns
+            and os.path.exists(entry['save_path'])
+        ):
+            file_mapping[yang_file] = entry['save_path']
+            continue
+        with open(yang_file, 'rb') as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        if entry and entry['hash'] == content_hash and os.path.exists(entry['save_path']):
+            save_file_path = entry['save_path']
+        else:
+            name, revision = parse_name_and_revision(content.decode('utf-8'))
+            save_file_path = os.path.join(save_file_dir, f'{name}@{revision}.yang')
+            if not os.path.exists(save_file_path):
+                _link_or_copy(yang_file, save_file_path)
+        file_mapping[yang_file] = save_file_path
+        manifest[yang_file] = {
+            'size': file_stat.st_size,
+            'mtime_ns': file_stat.st_mtime_ns,
+            'hash': content_hash,
+            'save_path': save_file_path,
+        }
+    if manifest_path:
+        tmp_manifest_path = f'{manifest_path}.{os.getpid()}.tmp'
+        with open(tmp_manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest_path, manifest_path)
+    return file_mapping
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink the file if both paths are on the same filesystem, copy it otherwise."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
 def parse_sdo(
     search_directory: str,
     dumper: Dumper,
@@ -26,7 +26,6 @@ __copyright__ = 'Copyright 2018 Cisco and its affiliates, Copyright The IETF Tru
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
-import json
 import multiprocessing
 import os
 import shutil
@@ -41,6 +40,7 @@ import requests
 
 import utility.log as log
 from parseAndPopulate import parse_directory
+from parseAndPopulate.dumper import find_dump_file, load_dumped_modules, load_dumped_vendors
 from parseAndPopulate.file_hasher import FileHasher
 from parseAndPopulate.modulesComplicatedAlgorithms import ModulesComplicatedAlgorithms
 from redisConnections.redisConnection import RedisConnection
@@ -51,6 +51,7 @@ from utility.opensearch_util import ESIndexingPaths, prepare_for_es_indexing, se
 from utility.script_config_dict import script_config_dict
 from utility.scriptConfig import ScriptConfig
 from utility.staticVariables import json_headers
+from utility.util import chunked
 
 BASENAME = os.path.basename(__file__)
 FILENAME = BASENAME.split('.py')[0]
@@ -59,6 +60,7 @@ DEFAULT_SCRIPT_CONFIG = ScriptConfig(
     args=script_config_dict[FILENAME].get('args'),
     arglist=None if __name__ == '__main__' else [],
 )
+POPULATE_CHUNK_SIZE = 1000
 
 
 class Populate:
@@ -79,11 +81,12 @@ class Populate:
         self.log_directory = self.config.get('Directory-Section', 'logs')
         self.yang_models = self.config.get('Directory-Section', 'yang-models-dir')
         self.temp_dir = self.config.get('Directory-Section', 'temp')
-        self.changes_cache_path = self.config.get('Directory-Section', 'changes-cache')
         self.cache_dir = self.config.get('Directory-Section', 'cache')
-        self.delete_cache_path = self.config.get('Directory-Section', 'delete-cache')
-        self.lock_file = self.config.get('Directory-Section', 'lock')
-        self.failed_changes_cache_path = self.config.get('Directory-Section', 'changes-cache-failed')
+        self.indexing_queue_path = self.config.get(
+            'Directory-Section',
+            'indexing-queue',
+            fallback='/var/yang/indexing_queue.db',
+        )
         self.json_ytree = self.config.get('Directory-Section', 'json-ytree')
         self.yangcatalog_api_prefix = self.config.get('Web-Section', 'yangcatalog-api-prefix')
 
@@ -110,7 +113,7 @@ class Populate:
             self._send_notification_about_running_script_by_api()
         self._initialize_json_dir()
         parsed, skipped = self._run_parse_directory_script()
-        modules = self._populate_modules_in_db()
+        modules_count = self._populate_modules_in_db()
         if not (parsed or skipped):
             self.logger.error(
                 'No files were parsed. This probably means the directory is missing capability xml files.',
@@ -118,7 +121,7 @@ class Populate:
         elif skipped and not parsed:
             self.logger.info('No new modules were parsed.')
         self._prepare_and_send_modules_for_es_indexing()
-        if modules:
+        if modules_count:
             self.process_reload_cache = multiprocessing.Process(target=self._reload_cache_in_parallel)
             self.process_reload_cache.start()
             if self.args.simple:
@@ -177,29 +180,32 @@ class Populate:
             raise e
         return stats
 
-    def _populate_modules_in_db(self) -> list:
+    def _populate_modules_in_db(self) -> int:
+        """
+        Populate ConfD and Redis with the modules and vendors dumped by the parse_directory script.
+        The dumped records are consumed incrementally in chunks of POPULATE_CHUNK_SIZE.
+
+        :return     (int) number of populated modules
+        """
         self.logger.info('Populating yang catalog with data. Starting to add modules')
-        with open(os.path.join(self.json_dir, 'prepare.json')) as data_file:
-            data = data_file.read()
-        modules = json.loads(data).get('module', [])
-        self.errors = self.confd_service.patch_modules(modules)
-        self.redis_connection.populate_modules(modules)
-        if not self.args.sdo and os.path.exists(os.path.join(self.json_dir, 'normal.json')):
+        modules_count = 0
+        for modules in chunked(load_dumped_modules(self.json_dir), POPULATE_CHUNK_SIZE):
+            modules_count += len(modules)
+            self.errors = self.confd_service.patch_modules(modules) or self.errors
+            self.redis_connection.populate_modules(modules)
+        if not self.args.sdo and find_dump_file(self.json_dir, 'normal'):
             self.logger.info('Starting to add vendors')
-            with open(os.path.join(self.json_dir, 'normal.json')) as data:
-                vendors = json.loads(data.read()).get('vendors', {}).get('vendor')
-            if not vendors:
-                return modules
-            self.errors = self.errors or self.confd_service.patch_vendors(vendors)
-            self.redis_connection.populate_implementation(vendors)
-        return modules
+            for vendors in chunked(load_dumped_vendors(self.json_dir), POPULATE_CHUNK_SIZE):
+                self.errors = self.confd_service.patch_vendors(vendors) or self.errors
+                self.redis_connection.populate_implementation(vendors)
+        return modules_count
 
     def _prepare_and_send_modules_for_es_indexing(self):
         body_to_send = None
         if self.args.notify_indexing:
             body_to_send = prepare_for_es_indexing(
                 self.yangcatalog_api_prefix,
-                os.path.join(self.json_dir, 'prepare.json'),
+                load_dumped_modules(self.json_dir),
                 self.logger,
                 self.args.save_file_dir,
                 force_indexing=self.args.force_indexing,
@@ -207,12 +213,7 @@ class Populate:
         if not body_to_send:
             return
         self.logger.info('Sending files for indexing')
-        indexing_paths = ESIndexingPaths(
-            cache_path=self.changes_cache_path,
-            deletes_path=self.delete_cache_path,
-            failed_path=self.failed_changes_cache_path,
-            lock_path=self.lock_file,
-        )
+        indexing_paths = ESIndexingPaths(queue_path=self.indexing_queue_path)
         send_for_es_indexing(body_to_send, self.logger, indexing_paths)
 
     def _reload_cache_in_parallel(self):
@@ -248,7 +249,9 @@ class Populate:
         complicated_algorithms.parse_non_requests()
         self.logger.info('Waiting for cache reload to finish')
         self.process_reload_cache.join()
-        complicated_algorithms.parse_requests()
+        complicated_algorithms.parse_requests(
+            semver_workers=self.config.getint('General-Section', 'semver-workers', fallback=1),
+        )
         sys.setrecursionlimit(recursion_limit)
         self.logger.info('Populating with new data of complicated algorithms')
         complicated_algorithms.populate()
@@ -260,6 +263,7 @@ class Populate:
             self.cache_dir,
             not self.args.force_parsing,
             self.log_directory,
+            backend=self.config.get('Directory-Section', 'file-hashes-backend', fallback='json'),
         )
         updated_hashes = file_hasher.load_hashed_files_data(path)
         if updated_hashes:
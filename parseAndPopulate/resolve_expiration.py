@@ -26,11 +26,13 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import utility.log as log
-from parseAndPopulate.resolvers.expiration import ExpirationResolver
+from parseAndPopulate.resolvers.expiration import DATATRACKER_URL, DatatrackerClient, ExpirationResolver
 from redisConnections.redisConnection import RedisConnection
 from utility.create_config import create_config
 from utility.fetch_modules import fetch_modules
@@ -53,6 +55,10 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
     credentials = config.get('Secrets-Section', 'confd-credentials', fallback='admin admin').strip('"').split()
     log_directory = config.get('Directory-Section', 'logs', fallback='/var/yang/logs')
     yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
+    cache_directory = config.get('Directory-Section', 'cache', fallback='/var/yang/cache')
+    datatracker_url = config.get('Web-Section', 'datatracker-url', fallback=DATATRACKER_URL)
+    workers = config.getint('General-Section', 'datatracker-workers', fallback=8)
+    cache_ttl = config.getint('General-Section', 'datatracker-cache-ttl', fallback=3600)
 
     logger = log.get_logger('resolve_expiration', f'{log_directory}/jobs/resolve_expiration.log')
 
@@ -63,21 +69,32 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
     logger.info('Starting Cron job resolve modules expiration')
     try:
         logger.info(f'Fetching all the modules from {yangcatalog_api_prefix}')
-        updated = False
 
         modules = fetch_modules(logger, config=config)
 
-        logger.debug('Starting to resolve modules')
-        for module in modules:
-            exp_res = ExpirationResolver(module, logger, datatracker_failures, redis_connection)
-            ret = exp_res.resolve()
-            if ret:
-                revision_updated_modules += 1
-            if not updated:
-                updated = ret
+        logger.debug(f'Starting to resolve modules using {workers} workers')
+        with requests.Session() as session:
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+            datatracker = DatatrackerClient(
+                logger,
+                session=session,
+                base_url=datatracker_url,
+                cache_ttl=cache_ttl,
+                cache_path=os.path.join(cache_directory, 'datatracker_documents.json'),
+            )
+
+            def resolve(module: dict):
+                return ExpirationResolver(module, logger, datatracker_failures, redis_connection, datatracker).resolve()
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(resolve, modules))
+            datatracker.save_cache()
+        updated_modules = [module for module, updated in zip(modules, results) if updated]
+        revision_updated_modules = len(updated_modules)
         logger.debug('All modules resolved')
-        if updated:
-            redis_connection.populate_modules(modules)
+        if updated_modules:
+            redis_connection.populate_modules(updated_modules)
             url = f'{yangcatalog_api_prefix}/load-cache'
             response = requests.post(url, None, auth=(credentials[0], credentials[1]))
             logger.info(f'Cache loaded with status {response.status_code}')
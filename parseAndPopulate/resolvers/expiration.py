@@ -1,6 +1,10 @@
+import json
 import logging
+import os
+import threading
 import time
 import typing as t
+from collections import defaultdict
 from datetime import datetime
 
 import requests
@@ -8,6 +12,130 @@ import requests
 from parseAndPopulate.resolvers.resolver import Resolver
 from redisConnections.redisConnection import RedisConnection
 
+DATATRACKER_URL = 'https://datatracker.ietf.org'
+DOCUMENT_FIELDS = ('rev', 'rfc', 'expires')
+
+
+class DatatrackerError(Exception):
+    pass
+
+
+class DatatrackerClient:
+    """
+    Client of the datatracker document API shared by all the ExpirationResolver instances of a run.
+    Documents are requested once per draft name, with the connections reused by the session.
+    If the cache TTL is set, responses are cached for that long, and stale entries are revalidated
+    with a conditional request. The cache can be persisted to a file between runs.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        session: t.Any = requests,
+        base_url: str = DATATRACKER_URL,
+        cache_ttl: int = 0,
+        cache_path: t.Optional[str] = None,
+        retries: int = 6,
+        retry_delay: float = 10,
+    ):
+        """
+        Arguments:
+            :param logger       (logging.Logger) formated logger with the specified name
+            :param session      (requests.Session) session used to send the requests, requests module by default
+            :param base_url     (str) URL of the datatracker, can point to a local stub in tests
+            :param cache_ttl    (int) number of seconds a cached response is fresh, 0 disables the cache
+            :param cache_path   (Optional[str]) path to the file the cache is loaded from and saved to
+            :param retries      (int) number of attempts before the datatracker is considered unavailable
+            :param retry_delay  (float) number of seconds to wait between the attempts
+        """
+        self.logger = logger
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.cache_ttl = cache_ttl
+        self.cache_path = cache_path
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._cache: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._name_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+        if cache_ttl and cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self.logger.warning(f'Could not load the datatracker cache from {cache_path}')
+
+    def document_url(self, draft_name: str) -> str:
+        return (
+            f'{self.base_url}/api/v1/doc/document/'
+            f'?name={draft_name}&states__type=draft&states__slug__in=active,RFC&format=json'
+        )
+
+    def get_documents(self, draft_name: str) -> t.Optional[list[dict]]:
+        """
+        Get the active or RFC documents of the draft.
+        Return None if the datatracker responded with an error status,
+        raise DatatrackerError if it could not be reached.
+        """
+        with self._lock:
+            name_lock = self._name_locks[draft_name]
+        with name_lock:
+            entry = self._cache.get(draft_name) if self.cache_ttl else None
+            if entry and time.time() - entry['fetched'] < self.cache_ttl:
+                return entry['documents']
+            headers = {}
+            if entry and entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry and entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            response = self._request(draft_name, headers)
+            if entry and response.status_code == 304:
+                entry['fetched'] = time.time()
+                return entry['documents']
+            if response.status_code != 200:
+                return None
+            documents = [
+                {field: document.get(field) for field in DOCUMENT_FIELDS}
+                for document in response.json().get('objects', [])
+            ]
+            if self.cache_ttl:
+                self._cache[draft_name] = {
+                    'fetched': time.time(),
+                    'etag': _header(response, 'ETag'),
+                    'last_modified': _header(response, 'Last-Modified'),
+                    'documents': documents,
+                }
+            return documents
+
+    def _request(self, draft_name: str, headers: dict):
+        url = self.document_url(draft_name)
+        for attempt in range(1, self.retries + 1):
+            try:
+                if headers:
+                    return self.session.get(url, headers=headers)
+                return self.session.get(url)
+            except Exception as e:
+                self.logger.warning(f'Failed to fetch file content of {draft_name}')
+                if attempt == self.retries:
+                    raise DatatrackerError(
+                        f'Failed to fetch file content of {draft_name} for {self.retries} times in a row',
+                    ) from e
+                time.sleep(self.retry_delay)
+
+    def save_cache(self):
+        if not (self.cache_ttl and self.cache_path):
+            return
+        with self._lock:
+            tmp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self.cache_path)
+
+
+def _header(response, name: str) -> t.Optional[str]:
+    value = response.headers.get(name)
+    return value if isinstance(value, str) else None
+
 
 class ExpirationResolver(Resolver):
     def __init__(
@@ -16,6 +144,7 @@ class ExpirationResolver(Resolver):
         logger: logging.Logger,
         datatracker_failures: list,
         redis_connection: RedisConnection,
+        datatracker: t.Optional[DatatrackerClient] = None,
     ) -> None:
         """Walks through all the modules and updates them if necessary
 
@@ -24,15 +153,14 @@ class ExpirationResolver(Resolver):
             :param LOGGER               (logging.Logger) formated logger with the specified name
             :param datatracker_failures (list) list of url that failed to get data from Datatracker
             :param redis_connection     (RedisConnection) Connection used to communication with Redis
+            :param datatracker          (Optional[DatatrackerClient]) Client shared by the resolvers of a run,
+                                        an uncached client using the requests module is created if not provided
         """
         self.module = module
         self.logger = logger
         self.datatracker_failures = datatracker_failures
         self.redis_connection = redis_connection
-        self.__datatracker_url = (
-            'https://datatracker.ietf.org/api/v1/doc/document/'
-            '?name={}&states__type=draft&states__slug__in=active,RFC&format=json'
-        )
+        self.datatracker = datatracker or DatatrackerClient(logger)
 
     def resolve(self) -> t.Optional[bool]:
         reference = self.module.get('reference')
@@ -47,33 +175,22 @@ class ExpirationResolver(Resolver):
             if ref.isdigit():
                 ref = reference.split('/')[-2]
                 rev = reference.split('/')[-1]
-            url = self.__datatracker_url.format(ref)
-            retry = 6
-            while True:
-                try:
-                    response = requests.get(url)
-                    break
-                except Exception as e:
-                    retry -= 1
-                    self.logger.warning(f'Failed to fetch file content of {ref}')
-                    time.sleep(10)
-                    if retry == 0:
-                        self.logger.error(f'Failed to fetch file content of {ref} for 6 times in a row - SKIPPING.')
-                        self.logger.error(e)
-                        self.datatracker_failures.append(url)
-                        return None
-
-            if response.status_code == 200:
-                data = response.json()
-                objs = data.get('objects', [])
-
+            try:
+                documents = self.datatracker.get_documents(ref)
+            except DatatrackerError as e:
+                self.logger.error(f'{e} - SKIPPING.')
+                self.logger.error(e.__cause__)
+                self.datatracker_failures.append(self.datatracker.document_url(ref))
+                return None
+
+            if documents is not None:
                 expired = True
                 expires = None
-                if len(objs) == 1:
-                    if rev == objs[0].get('rev'):
-                        rfc = objs[0].get('rfc')
+                if len(documents) == 1:
+                    if rev == documents[0].get('rev'):
+                        rfc = documents[0].get('rfc')
                         if rfc is None:
-                            expires = objs[0]['expires']
+                            expires = documents[0]['expires']
                             expired = False
 
         expired_changed = self.__expired_change(self.module.get('expired'), expired)
@@ -0,0 +1,147 @@
+import glob
+import logging
+import os
+import time
+import typing as t
+from collections import defaultdict
+
+from pyang.statements import Statement
+
+from parseAndPopulate.resolvers.resolver import Resolver
+from utility import yangParser
+
+"""
+Extraction engine used to resolve all the properties of a single yang module.
+Top-level statements of the module are indexed by their keyword in a single traversal,
+so resolvers plugged into the engine as field handlers don't need to scan the statement tree again.
+"""
+
+
+class IndexedStatement:
+    """Read-only view of a parsed module with the top-level substatements indexed by keyword."""
+
+    def __init__(self, statement: Statement):
+        self.statement = statement
+        self.arg = statement.arg
+        self.keyword = statement.keyword
+        self.substmts = statement.substmts
+        self._index: dict[t.Union[str, tuple], list[Statement]] = defaultdict(list)
+        for substatement in statement.substmts:
+            self._index[substatement.keyword].append(substatement)
+
+    def search(self, keyword: t.Union[str, tuple], children: t.Optional[list] = None, arg=None) -> list[Statement]:
+        if children is not None:
+            return self.statement.search(keyword, children=children, arg=arg)
+        substatements = self._index.get(keyword, [])
+        if arg is None:
+            return list(substatements)
+        return [substatement for substatement in substatements if substatement.arg == arg]
+
+    def search_one(self, keyword: t.Union[str, tuple], arg=None, children: t.Optional[list] = None):
+        found = self.search(keyword, children=children, arg=arg)
+        return found[0] if found else None
+
+
+class YangFileFinder:
+    """
+    Replacement of utility.util.get_yang which lists the save-file-dir once instead of globbing it on every call.
+    The listing is refreshed whenever the modification time of the directory changes.
+    """
+
+    def __init__(self, save_file_dir: str):
+        self.save_file_dir = save_file_dir
+        self._latest: dict[str, str] = {}
+        self._directory_mtime: t.Optional[int] = None
+
+    def __call__(self, name: str, revision: t.Optional[str] = None) -> t.Optional[str]:
+        if revision:
+            return os.path.join(self.save_file_dir, f'{name}@{revision}.yang')
+        self._refresh()
+        return self._latest.get(name)
+
+    def _refresh(self):
+        try:
+            directory_mtime = os.stat(self.save_file_dir).st_mtime_ns
+        except FileNotFoundError:
+            self._latest = {}
+            return
+        if directory_mtime == self._directory_mtime:
+            return
+        latest = {}
+        for path in glob.glob(os.path.join(self.save_file_dir, '*@*.yang')):
+            name = os.path.basename(path).split('@')[0]
+            if name not in latest or path > latest[name]:
+                latest[name] = path
+        self._latest = latest
+        self._directory_mtime = directory_mtime
+
+
+_yang_file_finders: dict[str, YangFileFinder] = {}
+
+
+def get_yang_file_finder(save_file_dir: str) -> YangFileFinder:
+    """Return the process-wide YangFileFinder of the save_file_dir."""
+    finder = _yang_file_finders.get(save_file_dir)
+    if finder is None:
+        finder = _yang_file_finders[save_file_dir] = YangFileFinder(save_file_dir)
+    return finder
+
+
+class ModuleExtractor:
+    """
+    Resolves the properties of a single parsed yang module.
+    Each property is resolved by the resolver passed to the resolve() method as its field handler.
+    If profiling is enabled, the time spent in each field is measured and added to the process-wide totals.
+    """
+
+    total_timings: dict[str, float] = defaultdict(float)
+
+    def __init__(
+        self,
+        parsed_yang: Statement,
+        logger: logging.Logger,
+        save_file_dir: str,
+        profile: bool = False,
+    ):
+        """
+        Arguments:
+            :param parsed_yang      (Statement) parsed yang module
+            :param logger           (Logger) logger used to report the profiling results
+            :param save_file_dir    (str) directory where all the yang modules are stored
+            :param profile          (bool) whether to measure the time spent in each field
+        """
+        self.statement = IndexedStatement(parsed_yang)
+        self.logger = logger
+        self.profile = profile
+        self.find_yang = get_yang_file_finder(save_file_dir)
+        self.timings: dict[str, float] = defaultdict(float)
+        self._parsed_modules: dict[str, Statement] = {}
+
+    def resolve(self, field: str, resolver: Resolver) -> t.Any:
+        """Resolve the field using the resolver, measuring the time spent if profiling is enabled."""
+        if not self.profile:
+            return resolver.resolve()
+        start = time.perf_counter()
+        try:
+            return resolver.resolve()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[field] += elapsed
+            self.total_timings[field] += elapsed
+
+    def parse_yang(self, path: str) -> Statement:
+        """Parse the yang module on the path, every module is parsed only once per extracted module."""
+        parsed_module = self._parsed_modules.get(path)
+        if parsed_module is None:
+            parsed_module = self._parsed_modules[path] = yangParser.parse(path)
+        return parsed_module
+
+    def report(self, name_revision: str):
+        if self.profile:
+            self.logger.debug(f'Fields of {name_revision} resolved in: {format_timings(self.timings)}')
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    return ', '.join(
+        f'{field} {elapsed * 1000:.2f}ms' for field, elapsed in sorted(timings.items(), key=lambda item: -item[1])
+    )
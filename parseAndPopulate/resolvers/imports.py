@@ -1,4 +1,5 @@
 import logging
+import typing as t
 
 from pyang.statements import Statement
 
@@ -19,10 +20,12 @@ class ImportsResolver(Resolver):
         parsed_yang: Statement,
         logger: logging.Logger,
         domain_prefix: str,
+        find_yang: t.Optional[t.Callable[..., t.Optional[str]]] = None,
     ) -> None:
         self.parsed_yang = parsed_yang
         self.logger = logger
         self.domain_prefix = domain_prefix
+        self.find_yang = find_yang or get_yang
 
     def resolve(self):
         imports = []
@@ -37,7 +40,7 @@ class ImportsResolver(Resolver):
                 parsed_revision = None
             new_dependency.revision = parsed_revision
 
-            yang_file = get_yang(new_dependency.name, new_dependency.revision)
+            yang_file = self.find_yang(new_dependency.name, new_dependency.revision)
             if not yang_file:
                 self.logger.error('Import {} can not be found'.format(new_dependency.name))
                 imports.append(new_dependency)
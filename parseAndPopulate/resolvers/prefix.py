@@ -22,9 +22,13 @@ class PrefixResolver(Resolver):
         logger: logging.Logger,
         name_revision: str,
         belongs_to: t.Optional[str],
+        find_yang: t.Optional[t.Callable[..., t.Optional[str]]] = None,
+        parse_yang: t.Optional[t.Callable[[str], Statement]] = None,
     ) -> None:
         self.parsed_yang = parsed_yang
         self.logger = logger
+        self.find_yang = find_yang or get_yang
+        self.parse_yang = parse_yang or yangParser.parse
         self.name_revision = name_revision
         self.belongs_to = belongs_to
         self.property_name = 'prefix'
@@ -41,13 +45,13 @@ class PrefixResolver(Resolver):
             self.logger.error('Belongs to not defined - unable to resolve namespace')
             return DEFAULT
 
-        yang_file = get_yang(self.belongs_to)
+        yang_file = self.find_yang(self.belongs_to)
         if yang_file is None:
             self.logger.error(f'Parent module not found - unable to resolve namespace - {self.name_revision}')
             return DEFAULT
 
         try:
-            parsed_yang_parent = yangParser.parse(os.path.abspath(yang_file))
+            parsed_yang_parent = self.parse_yang(os.path.abspath(yang_file))
             return parsed_yang_parent.search(self.property_name)[0].arg
         except IndexError:
             self.logger.error(f'Cannot parse out {self.property_name} property - {self.name_revision}')
@@ -15,10 +15,17 @@ Default value: [] -> no submodules
 
 
 class SubmoduleResolver(Resolver):
-    def __init__(self, parsed_yang: Statement, logger: logging.Logger, domain_prefix: str) -> None:
+    def __init__(
+        self,
+        parsed_yang: Statement,
+        logger: logging.Logger,
+        domain_prefix: str,
+        find_yang: t.Optional[t.Callable[..., t.Optional[str]]] = None,
+    ) -> None:
         self.parsed_yang = parsed_yang
         self.logger = logger
         self.domain_prefix = domain_prefix
+        self.find_yang = find_yang or get_yang
 
     def resolve(self) -> t.Tuple[list, list]:
         submodules = []
@@ -36,7 +43,7 @@ class SubmoduleResolver(Resolver):
                 parsed_revision = None
             new_submodule.revision = new_dependency.revision = parsed_revision
 
-            yang_file = get_yang(new_submodule.name, new_submodule.revision)
+            yang_file = self.find_yang(new_submodule.name, new_submodule.revision)
             if not yang_file:
                 self.logger.error('Submodule {} can not be found'.format(new_submodule.name))
                 continue
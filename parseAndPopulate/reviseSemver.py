@@ -8,12 +8,18 @@ parser_semver() method is then called, which will reevaluate semver for
 each module (and all of the revisions).
 Lastly, populate() method will send PATCH request to ConfD and
 cache will be re-loaded using api/load-cache endpoint.
+In the incremental mode, only module families (all the revisions of one module) whose revisions
+were added, removed or changed since the last successful run are revised.
 """
 
+import hashlib
 import json
 import os
 import sys
 import time
+import typing as t
+from collections import defaultdict
+from copy import deepcopy
 
 import utility.log as log
 from parseAndPopulate.modulesComplicatedAlgorithms import ModulesComplicatedAlgorithms
@@ -74,6 +80,43 @@ def load_from_json(path: str):
         return json.load(reader)
 
 
+def get_family_signatures(all_existing_modules: list) -> dict[str, str]:
+    """Get a signature of the revisions and their compilation statuses for each module family."""
+    families = defaultdict(list)
+    for module in all_existing_modules:
+        families[module['name']].append(
+            [module['revision'], module.get('organization') or '', module.get('compilation-status') or 'PENDING'],
+        )
+    return {
+        name: hashlib.sha256(json.dumps(sorted(revisions)).encode('utf-8')).hexdigest()
+        for name, revisions in families.items()
+    }
+
+
+def load_watermark(watermark_path: str) -> dict[str, str]:
+    # Load family signatures stored by the last successful run
+    if not os.path.exists(watermark_path):
+        return {}
+    with open(watermark_path, 'r') as reader:
+        return json.load(reader).get('families', {})
+
+
+def save_watermark(watermark_path: str, family_signatures: dict[str, str]):
+    tmp_path = f'{watermark_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as writer:
+        json.dump({'updated': int(time.time()), 'families': family_signatures}, writer)
+    os.replace(tmp_path, watermark_path)
+
+
+def get_changed_families(family_signatures: dict[str, str], watermark: dict[str, str]) -> t.Set[str]:
+    """
+    Get names of the families changed since the watermark, or not revised yet.
+    Families revised by an earlier run are in the watermark even if the semver of some of their revisions
+    could not be derived, so they are revised again only once their revisions change.
+    """
+    return {name for name, signature in family_signatures.items() if watermark.get(name) != signature}
+
+
 @job_log(file_basename=BASENAME)
 def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLogMessage]:
     start_time = int(time.time())
@@ -86,6 +129,9 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
     credentials = config.get('Secrets-Section', 'confd-credentials', fallback='admin admin').strip('"').split(' ')
     json_ytree = config.get('Directory-Section', 'json-ytree', fallback='/var/yang/ytrees')
     yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
+    cache_dir = config.get('Directory-Section', 'cache', fallback='/var/yang/cache')
+    incremental = config.getboolean('General-Section', 'incremental-revise-semver', fallback=False)
+    semver_workers = config.getint('General-Section', 'semver-workers', fallback=1)
 
     logger = log.get_logger('sandbox', f'{log_directory}/sandbox.log')
 
@@ -98,6 +144,17 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
     all_modules = get_list_of_unique_modules(all_existing_modules)
     logger.info(f'Number of unique modules: {len(all_modules["module"])}')
 
+    watermark_path = os.path.join(cache_dir, 'revise_semver_watermark.json')
+    family_signatures = get_family_signatures(all_existing_modules)
+    new_watermark = {}
+    if incremental:
+        watermark = load_watermark(watermark_path)
+        changed_families = get_changed_families(family_signatures, watermark)
+        all_modules['module'] = [module for module in all_modules['module'] if module['name'] in changed_families]
+        # families removed from yangcatalog are dropped from the watermark
+        new_watermark = {name: signature for name, signature in watermark.items() if name in family_signatures}
+        logger.info(f'Number of module families changed since the last run: {len(all_modules["module"])}')
+
     # Uncomment the next line to read data from the file semver_prepare.json
     # all_modules = load_from_json(path)
 
@@ -110,7 +167,7 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
     for i in range(chunks):
         try:
             logger.info(f'Proccesing chunk {i} out of {chunks}')
-            batch = all_modules['module'][i * chunk_size : (i + 1) * chunk_size]
+            batch = deepcopy(all_modules['module'][i * chunk_size : (i + 1) * chunk_size])
             batch_modules = {'module': batch}
             recursion_limit = sys.getrecursionlimit()
             sys.setrecursionlimit(50000)
@@ -124,14 +181,18 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLo
                 yang_models,
                 temp_dir,
                 json_ytree,
+                existing_modules=all_existing_modules,
             )
-            complicated_algorithms.parse_semver()
+            complicated_algorithms.parse_semver(workers=semver_workers)
             sys.setrecursionlimit(recursion_limit)
             complicated_algorithms.populate()
+            for module in batch:
+                new_watermark[module['name']] = family_signatures[module['name']]
         except Exception:
             logger.exception('Exception occured during running ModulesComplicatedAlgorithms')
             continue
 
+    save_watermark(watermark_path, new_watermark)
     end = time.time()
     logger.info(f'Populate took {int(end - start_time)} seconds with the main and complicated algorithm')
     logger.info('Job finished successfully')
@@ -29,7 +29,7 @@ import sys
 
 import utility.log as log
 from utility.create_config import create_config
-from utility.fetch_modules import fetch_modules
+from utility.fetch_modules import iter_modules
 from utility.script_config_dict import script_config_dict
 from utility.scriptConfig import ScriptConfig
 
@@ -51,25 +51,26 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()):
     log_directory = config.get('Directory-Section', 'logs', fallback='/var/yang/logs')
     logger = log.get_logger('sandbox', f'{log_directory}/sandbox.log')
 
-    logger.info('Fetching all of the modules from API.')
+    names = set(args.names.split(',')) if args.names else None
+    organizations = set(args.organizations.split(',')) if args.organizations else None
+
+    logger.info('Fetching the modules of the catalog.')
+    modules_dict = {}
     try:
-        all_modules = fetch_modules(logger, config=config)
+        for module in iter_modules(logger, config=config, names=names, organizations=organizations):
+            name = module['name']
+            org = module['organization']
+            revision = module['revision']
+            if '' in [name, revision, org]:
+                logger.warning(f'module: {module} wrong data')
+                continue
+            key = f'{name}@{revision}/{org}'
+            value = f'{save_file_dir}/{name}@{revision}.yang'
+            modules_dict[key] = value
     except RuntimeError:
         logger.error('Failed to get list of modules from response')
         sys.exit(1)
 
-    modules_dict = {}
-    for module in all_modules:
-        name = module['name']
-        org = module['organization']
-        revision = module['revision']
-        if '' in [name, revision, org]:
-            logger.warning(f'module: {module} wrong data')
-            continue
-        key = f'{name}@{revision}/{org}'
-        value = f'{save_file_dir}/{name}@{revision}.yang'
-        modules_dict[key] = value
-
     output_path = os.path.join(temp, 'opensearch_data.json')
     with open(output_path, 'w') as writer:
         json.dump(modules_dict, writer)
@@ -19,17 +19,22 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 
 import json
 import os
+import re
 import typing as t
 from configparser import ConfigParser
 from urllib.parse import quote, unquote
 
 from redis import Redis
+from redis.lock import Lock
 
 import utility.log as log
 from redisConnections.redis_enum import RedisEnum
 from utility.create_config import create_config
 
 DEFAULT_VALUES = {'compilation-status': 'unknown', 'compilation-result': ''}
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# the write lock expires if its holder dies without releasing it
+CATALOG_WRITE_LOCK_TIMEOUT = 60 * 60
 
 
 class RedisConnection:
@@ -86,6 +91,15 @@ class RedisConnection:
 
         return existing_module
 
+    def catalog_write_lock(self) -> Lock:
+        """
+        Lock shared by all the processes which update the modules and vendors stored in Redis.
+        Read-modify-write updates of the catalog are done while holding it,
+        so concurrent updates, e.g. by Celery workers of different task classes, don't overwrite each other.
+        The lock is not reentrant.
+        """
+        return self.modulesDB.lock('catalog-write-lock', timeout=CATALOG_WRITE_LOCK_TIMEOUT)
+
     def populate_modules(self, new_modules: list[dict]):
         """Merge new data of each module in 'new_modules' list with existing data already stored in Redis.
         Set updated data to Redis under created key in format: <name>@<revision>/<organization>
@@ -93,25 +107,70 @@ class RedisConnection:
         Argument:
             :param new_modules  (list) list of modules which need to be stored into Redis cache
         """
-        for new_module in new_modules:
-            redis_key = self._create_module_key(new_module)
-            redis_module = self.get_module(redis_key)
-            temp_module_data = self.get_temp_module(redis_key)
-            if redis_module == '{}':
-                updated_module = new_module
-            else:
-                updated_module = self.update_module_properties(new_module, json.loads(redis_module))
+        with self.catalog_write_lock():
+            for new_module in new_modules:
+                redis_key = self._create_module_key(new_module)
+                redis_module = self.get_module(redis_key)
+                temp_module_data = self.get_temp_module(redis_key)
+                if redis_module == '{}':
+                    updated_module = new_module
+                else:
+                    updated_module = self.update_module_properties(new_module, json.loads(redis_module))
 
-            if temp_module_data != '{}':
-                updated_module = self.update_module_properties(json.loads(temp_module_data), updated_module)
-                self.delete_temporary([redis_key])
+                if temp_module_data != '{}':
+                    updated_module = self.update_module_properties(json.loads(temp_module_data), updated_module)
+                    self.delete_temporary([redis_key])
 
-            self.set_module(updated_module, redis_key)
+                self.set_module(updated_module, redis_key)
 
     def get_all_modules(self) -> str:
         data = self.modulesDB.get('modules-data')
         return (data or b'{}').decode('utf-8')
 
+    def iter_modules_snapshot(
+        self,
+        names: t.Optional[t.Container[str]] = None,
+        organizations: t.Optional[t.Container[str]] = None,
+    ) -> t.Iterator[dict]:
+        """
+        Stream the modules of the catalog snapshot stored under the 'modules-data' key,
+        which is the same data the /search/modules endpoint of the API responds with.
+        The snapshot is read with a single GET, so it is consistent. Its text is kept in memory while iterating,
+        but the modules are decoded one at a time, so modules filtered out by their name or organization,
+        or already processed by a caller consuming the iterator, are not kept in memory.
+
+        Arguments:
+            :param names            (Optional[Container[str]]) Names of the modules to yield, all if None
+            :param organizations    (Optional[Container[str]]) Organizations of the modules to yield, all if None
+            :return                 (Iterator[dict]) Iterator of the modules in the snapshot
+        """
+        data = self.modulesDB.get('modules-data')
+        if not data:
+            return
+        text = data.decode('utf-8')
+        # release the raw snapshot, only its decoded text is needed
+        del data
+        decoder = json.JSONDecoder()
+        end = len(text)
+        position = _skip_whitespace(text, 0)
+        if text[position] != '{':
+            raise ValueError('modules-data is not a JSON object')
+        position = _skip_whitespace(text, position + 1)
+        while position < end and text[position] != '}':
+            key, position = decoder.raw_decode(text, position)
+            position = _skip_whitespace(text, position)
+            if text[position] != ':':
+                raise ValueError(f'Expected ":" after the {key} key of modules-data')
+            module, position = decoder.raw_decode(text, _skip_whitespace(text, position + 1))
+            position = _skip_whitespace(text, position)
+            if position < end and text[position] == ',':
+                position = _skip_whitespace(text, position + 1)
+            if names is not None and module.get('name') not in names:
+                continue
+            if organizations is not None and module.get('organization') not in organizations:
+                continue
+            yield module
+
     def get_module(self, key: str) -> str:
         data = self.modulesDB.get(key)
         return (data or b'{}').decode('utf-8')
@@ -139,6 +198,45 @@ class RedisConnection:
 
         return result
 
+    def get_modules(self, keys: list[str]) -> dict[str, dict]:
+        """Get the modules stored under the keys in a single round trip, missing modules are left out."""
+        if not keys:
+            return {}
+        return {key: json.loads(data) for key, data in zip(keys, self.modulesDB.mget(keys)) if data is not None}
+
+    def update_modules(
+        self,
+        modules: dict[str, dict],
+        deleted_keys: t.Iterable[str] = (),
+        batch_size: int = 500,
+    ) -> dict[str, int]:
+        """
+        Set the modules and delete the modules stored under the deleted_keys,
+        using transactions of at most batch_size commands.
+
+        Arguments:
+            :param modules          (dict[str, dict]) modules to set, by their redis key
+            :param deleted_keys     (Iterable[str]) keys of the modules to delete
+            :param batch_size       (int) maximum number of commands in a single transaction
+            :return                 (dict[str, int]) number of deleted keys (0 or 1) for each of the deleted_keys
+        """
+        operations: list[tuple[str, t.Optional[dict]]] = [*modules.items(), *((key, None) for key in deleted_keys)]
+        deleted = {}
+        for start in range(0, len(operations), batch_size):
+            batch = operations[start : start + batch_size]
+            with self.modulesDB.pipeline(transaction=True) as pipeline:
+                for redis_key, module in batch:
+                    if module is None:
+                        pipeline.delete(redis_key)
+                    else:
+                        pipeline.set(redis_key, json.dumps(module))
+                results = pipeline.execute()
+            for (redis_key, module), result in zip(batch, results):
+                if module is None:
+                    deleted[redis_key] = result
+            self.LOGGER.info(f'{len(batch)} keys updated in a single transaction')
+        return deleted
+
     def delete_modules(self, modules_keys: list):
         result = self.modulesDB.delete(*modules_keys)
         return result
@@ -234,15 +332,16 @@ class RedisConnection:
                             data[key]['modules'] = {'module': []}
                         data[key]['modules']['module'] += software_flavor.get('modules', {}).get('module', [])
 
-        for key, new_data in data.items():
-            existing_json = self.get_implementation(key)
-            if existing_json == '{}':
-                merged_data = new_data
-            else:
-                existing_data = json.loads(existing_json)
-                self.merge_data(existing_data.get('modules'), new_data.get('modules'))
-                merged_data = existing_data
-            self.vendorsDB.set(key, json.dumps(merged_data))
+        with self.catalog_write_lock():
+            for key, new_data in data.items():
+                existing_json = self.get_implementation(key)
+                if existing_json == '{}':
+                    merged_data = new_data
+                else:
+                    existing_data = json.loads(existing_json)
+                    self.merge_data(existing_data.get('modules'), new_data.get('modules'))
+                    merged_data = existing_data
+                self.vendorsDB.set(key, json.dumps(merged_data))
 
     def reload_vendors_cache(self):
         vendors_data = self.create_vendors_data_dict()
@@ -314,5 +413,9 @@ class RedisConnection:
             old[data_type] = list(old_data.values())
 
 
+def _skip_whitespace(text: str, position: int) -> int:
+    return WHITESPACE.match(text, position).end()  # pyright: ignore
+
+
 def key_quote(key: str) -> str:
     return quote(key, safe='')
@@ -0,0 +1,146 @@
+"""
+Rebuild OpenSearch indices without affecting the search.
+A new version of each index is created next to the live one, with refresh and replicas disabled,
+and the documents are copied into it by server-side reindex tasks. Once all the copies are done
+and their document counts match the live indices, all the aliases are swapped to the new indices
+in a single atomic request.
+Indexing of changed modules and of new drafts is paused for the duration of the rebuild by holding
+the cron and drafts locks, the changes wait in the indexing queue and the drafts are added by the next run
+of process-drafts.py after the rebuild finishes.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import utility.log as log
+from opensearch_indexing.index_generation import bump_index_generation
+from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+from opensearch_indexing.opensearch_manager import OpenSearchManager
+from utility.create_config import create_config
+
+ALIASES = {
+    'modules': OpenSearchIndices.MODULES,
+    'yindex': OpenSearchIndices.YINDEX,
+    'autocomplete': OpenSearchIndices.AUTOCOMPLETE,
+    'drafts': OpenSearchIndices.DRAFTS,
+}
+
+
+def reindex(
+    opensearch_manager: OpenSearchManager,
+    indices: list[OpenSearchIndices],
+    version: str,
+    logger,
+    batch_size: int = 5000,
+) -> dict[OpenSearchIndices, str]:
+    """
+    Copy the documents of the indices into their new versions and validate the document counts.
+
+    Arguments:
+        :param opensearch_manager   (OpenSearchManager) Manager of the OpenSearch connection
+        :param indices              (list[OpenSearchIndices]) Aliases whose indices to rebuild
+        :param version              (str) Version appended to the names of the new indices
+        :param logger               (Logger)
+        :param batch_size           (int) Number of documents copied in one batch of each reindex slice
+    :return (dict[OpenSearchIndices, str]) names of the new indices by their aliases
+    """
+    opensearch = opensearch_manager.opensearch
+    new_indices = {}
+    tasks = {}
+    try:
+        for index in indices:
+            new_indices[index] = opensearch_manager.create_versioned_index(index, version)
+            tasks[index] = opensearch.reindex(
+                body={
+                    'source': {'index': index.value, 'size': batch_size},
+                    'dest': {'index': new_indices[index]},
+                },
+                slices='auto',
+                wait_for_completion=False,
+            )['task']
+            logger.info(f'Copying {index.value} into {new_indices[index]}')
+
+        while tasks:
+            time.sleep(10)
+            for index, task_id in list(tasks.items()):
+                task_info = opensearch.tasks.get(task_id=task_id)
+                status = task_info['task']['status']
+                logger.info(f'{index.value}: {status["created"]} out of {status["total"]}')
+                if not task_info['completed']:
+                    continue
+                del tasks[index]
+                if failures := task_info.get('response', {}).get('failures'):
+                    raise RuntimeError(f'Copying {index.value} failed: {failures}')
+
+        for index, index_name in new_indices.items():
+            opensearch_manager.finalize_versioned_index(index, index_name)
+            new_count = opensearch.count(index=index_name)['count']
+            live_count = opensearch.count(index=index.value)['count']
+            if new_count != live_count:
+                raise RuntimeError(f'{index_name} has {new_count} documents, but {index.value} has {live_count}')
+            logger.info(f'{index_name} contains all {new_count} documents of {index.value}')
+    except Exception:
+        for task_id in tasks.values():
+            opensearch.tasks.cancel(task_id=task_id)
+        for index_name in new_indices.values():
+            opensearch.indices.delete(index=index_name, ignore=[404])
+        raise
+    return new_indices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--indices',
+        nargs='+',
+        choices=ALIASES.keys(),
+        default=list(ALIASES.keys()),
+        help='Indices to rebuild, all of them by default',
+    )
+    parser.add_argument(
+        '--version',
+        type=str,
+        default=datetime.utcnow().strftime('%Y%m%d%H%M%S'),
+        help='Version appended to the names of the new indices, current timestamp by default',
+    )
+    parser.add_argument('--batch-size', type=int, default=5000, help='Number of documents copied in one batch')
+    parser.add_argument('--delete', action='store_true', help='Delete the old indices after the aliases are swapped')
+    args = parser.parse_args()
+    config = create_config()
+    log_directory = config.get('Directory-Section', 'logs', fallback='/var/yang/logs')
+    lock_file_cron = config.get('Directory-Section', 'lock-cron')
+    lock_file_drafts = config.get('Directory-Section', 'lock-drafts', fallback='/var/yang/tmp/drafts.lock')
+    index_generation_path = config.get('Directory-Section', 'index-generation', fallback='/var/yang/index_generation')
+    logger = log.get_logger('reindex', '{}/sandbox.log'.format(log_directory))
+
+    if os.path.exists(lock_file_cron):
+        logger.error('Indexing of changed modules is running, try again later')
+        sys.exit(1)
+    if os.path.exists(lock_file_drafts):
+        logger.error('Indexing of drafts is running, try again later')
+        sys.exit(1)
+    lock_files = (lock_file_cron, lock_file_drafts)
+    for lock_file in lock_files:
+        open(lock_file, 'w').close()
+    try:
+        opensearch_manager = OpenSearchManager()
+        indices = [ALIASES[index] for index in args.indices]
+        new_indices = reindex(opensearch_manager, indices, args.version, logger, args.batch_size)
+        old_indices = opensearch_manager.swap_aliases(new_indices)
+        logger.info(f'Aliases swapped to {", ".join(new_indices.values())}')
+        bump_index_generation(index_generation_path)
+        if args.delete:
+            for index_names in old_indices.values():
+                for index_name in index_names:
+                    opensearch_manager.opensearch.indices.delete(index=index_name)
+                    logger.info(f'{index_name} deleted')
+    finally:
+        for lock_file in lock_files:
+            os.unlink(lock_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,6 @@ Finally, all the information are dumped into json file, so they can be reviewed
 import json
 import os
 
-from opensearchpy.exceptions import RequestError
 from redis import Redis
 
 import utility.log as log
@@ -21,17 +20,18 @@ from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
 from redisConnections.redis_enum import RedisEnum
 from utility.create_config import create_config
+from utility.util import chunked, validate_revision
 
 
-def check_module_in_redis(hits: dict, redis: Redis):
+def check_module_in_redis(hits: dict, redis: Redis, chunk_size: int = 1000):
     redis_missing = []
     redis_missing_count = 0
 
-    for key in hits:
-        data = redis.get(key)
-        if data == '{}':
-            redis_missing.append(key)
-            redis_missing_count += 1
+    for keys in chunked(hits, chunk_size):
+        for key, data in zip(keys, redis.mget(keys)):
+            if data is None or data == b'{}':
+                redis_missing.append(key)
+                redis_missing_count += 1
 
     if redis_missing_count:
         LOGGER.info('{} out of {} missing in Redis'.format(redis_missing_count, len(hits)))
@@ -55,47 +55,42 @@ def main():
     opensearch_manager = OpenSearchManager()
 
     # Set up variables and counters
-    opensearch_missing_modules = []
     redis_missing_modules = []
     incorrect_format_modules = []
     modules_to_index_dict = {}
     modules_to_index_list = []
-    redis_modules = 0
 
     # PHASE I: Check modules from Redis in OpenSearch
     LOGGER.info('Starting PHASE I')
+    redis_modules_by_key = {}
     for redis_key in redis.scan_iter():
         try:
             key = redis_key.decode('utf-8')
             name, rev_org = key.split('@')
             revision, organization = rev_org.split('/')
-            redis_modules += 1
-            module = {'name': name, 'revision': revision, 'organization': organization}
         except ValueError:
             continue
-        try:
-            in_es = opensearch_manager.document_exists(OpenSearchIndices.AUTOCOMPLETE, module)
-            if in_es:
-                continue
-
-            opensearch_missing_modules.append(key)
-            module_raw = redis.get(redis_key)
-            module = json.loads(module_raw or '{}')
-            # Check if this file is in /var/yang/all_modules folder
-            all_modules_path = '{}/{}@{}.yang'.format(save_file_dir, name, revision)
-            if not os.path.isfile(all_modules_path):
-                LOGGER.warning('Trying to retreive file content from Github for module {}'.format(key))
-                modules_to_index_dict[key] = all_modules_path
-                modules_to_index_list.append(module)
-            else:
-                modules_to_index_dict[key] = all_modules_path
-                modules_to_index_list.append(module)
-        except RequestError:
+        if validate_revision(revision) != revision:
             incorrect_format_modules.append(key)
-            LOGGER.exception('Problem with module {}@{}. SKIPPING'.format(name, revision))
-            continue
-        except Exception:
+            LOGGER.error('Problem with module {}@{}. SKIPPING'.format(name, revision))
             continue
+        redis_modules_by_key[key] = {'name': name, 'revision': revision, 'organization': organization}
+    redis_modules = len(redis_modules_by_key) + len(incorrect_format_modules)
+
+    in_opensearch = opensearch_manager.documents_exist(
+        OpenSearchIndices.AUTOCOMPLETE,
+        list(redis_modules_by_key.values()),
+    )
+    opensearch_missing_modules = [key for key, in_es in zip(redis_modules_by_key, in_opensearch) if not in_es]
+    for key in opensearch_missing_modules:
+        name, revision = redis_modules_by_key[key]['name'], redis_modules_by_key[key]['revision']
+        module = json.loads(redis.get(key) or '{}')
+        # Check if this file is in /var/yang/all_modules folder
+        all_modules_path = '{}/{}@{}.yang'.format(save_file_dir, name, revision)
+        if not os.path.isfile(all_modules_path):
+            LOGGER.warning('Trying to retreive file content from Github for module {}'.format(key))
+        modules_to_index_dict[key] = all_modules_path
+        modules_to_index_list.append(module)
 
     # PHASE II: Check modules from OpenSearch in Redis
     LOGGER.info('Starting PHASE II')
@@ -0,0 +1,192 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import tempfile
+import unittest
+from configparser import ConfigParser
+from unittest import mock
+
+from opensearchpy.exceptions import NotFoundError
+
+import sandbox.blue_green_reindex as bgr
+from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+from opensearch_indexing.opensearch_manager import OpenSearchManager
+
+
+class TestVersionedIndicesClass(unittest.TestCase):
+    def setUp(self):
+        self.opensearch = mock.MagicMock()
+        self.opensearch_manager = OpenSearchManager(self.opensearch)
+
+    def test_create_versioned_index(self):
+        index_name = self.opensearch_manager.create_versioned_index(OpenSearchIndices.MODULES, '20240101000000')
+
+        self.assertEqual(index_name, 'modules-20240101000000')
+        self.opensearch.indices.create.assert_called_once()
+        create_kwargs = self.opensearch.indices.create.call_args.kwargs
+        self.assertEqual(create_kwargs['index'], index_name)
+        # the new index is added to the alias only once it is filled
+        self.assertNotIn('aliases', create_kwargs['body'])
+        self.assertEqual(create_kwargs['body']['settings']['index']['refresh_interval'], '-1')
+        self.assertEqual(create_kwargs['body']['settings']['index']['number_of_replicas'], 0)
+        self.assertEqual(create_kwargs['body']['settings']['index']['number_of_shards'], 2)
+
+    def test_finalize_versioned_index(self):
+        self.opensearch_manager.finalize_versioned_index(OpenSearchIndices.MODULES, 'modules-20240101000000')
+
+        self.opensearch.indices.put_settings.assert_called_once_with(
+            index='modules-20240101000000',
+            body={'index': {'refresh_interval': None, 'number_of_replicas': 0}},
+        )
+        self.opensearch.indices.refresh.assert_called_once_with(index='modules-20240101000000')
+
+    def test_swap_aliases(self):
+        def get_alias(name: str) -> dict:
+            if name == OpenSearchIndices.DRAFTS.value:
+                raise NotFoundError(404, 'aliases_not_found_exception', {})
+            return {f'{name.removesuffix("-alias")}-old': {}}
+
+        self.opensearch.indices.get_alias.side_effect = get_alias
+        new_indices = {OpenSearchIndices.MODULES: 'modules-new', OpenSearchIndices.DRAFTS: 'drafts-new'}
+
+        old_indices = self.opensearch_manager.swap_aliases(new_indices)
+
+        self.assertEqual(old_indices, {OpenSearchIndices.MODULES: ['modules-old'], OpenSearchIndices.DRAFTS: []})
+        # all the aliases are swapped in a single request
+        self.opensearch.indices.update_aliases.assert_called_once_with(
+            body={
+                'actions': [
+                    {'remove': {'index': 'modules-old', 'alias': 'modules-alias'}},
+                    {'add': {'index': 'modules-new', 'alias': 'modules-alias'}},
+                    {'add': {'index': 'drafts-new', 'alias': 'drafts-alias'}},
+                ],
+            },
+        )
+
+
+class TestReindexClass(unittest.TestCase):
+    def setUp(self):
+        self.opensearch_manager = mock.MagicMock()
+        self.opensearch_manager.create_versioned_index.side_effect = lambda index, version: f'{index.name}-{version}'
+        self.opensearch = self.opensearch_manager.opensearch
+        self.opensearch.reindex.side_effect = lambda body, **kwargs: {'task': f'task-{body["dest"]["index"]}'}
+        self.opensearch.count.return_value = {'count': 10}
+        self.tasks = {}
+        self.opensearch.tasks.get.side_effect = lambda task_id: self.tasks[task_id]
+        self.indices = [OpenSearchIndices.MODULES, OpenSearchIndices.DRAFTS]
+        sleep_patcher = mock.patch('sandbox.blue_green_reindex.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def task_info(self, completed: bool = True, failures: tuple = ()) -> dict:
+        return {
+            'completed': completed,
+            'task': {'status': {'created': 10, 'total': 10}},
+            'response': {'failures': list(failures)},
+        }
+
+    def test_reindex(self):
+        self.tasks = {'task-MODULES-v1': self.task_info(), 'task-DRAFTS-v1': self.task_info()}
+
+        new_indices = bgr.reindex(self.opensearch_manager, self.indices, 'v1', mock.MagicMock())
+
+        self.assertEqual(new_indices, {OpenSearchIndices.MODULES: 'MODULES-v1', OpenSearchIndices.DRAFTS: 'DRAFTS-v1'})
+        self.assertEqual(self.opensearch_manager.finalize_versioned_index.call_count, 2)
+        self.opensearch.tasks.cancel.assert_not_called()
+        self.opensearch.indices.delete.assert_not_called()
+
+    def test_reindex_failed_copy_rolled_back(self):
+        self.tasks = {
+            'task-MODULES-v1': self.task_info(failures=({'cause': 'mapper_parsing_exception'},)),
+            'task-DRAFTS-v1': self.task_info(completed=False),
+        }
+
+        with self.assertRaises(RuntimeError):
+            bgr.reindex(self.opensearch_manager, self.indices, 'v1', mock.MagicMock())
+
+        self.opensearch.tasks.cancel.assert_called_once_with(task_id='task-DRAFTS-v1')
+        self.assertCountEqual(
+            self.opensearch.indices.delete.call_args_list,
+            [mock.call(index='MODULES-v1', ignore=[404]), mock.call(index='DRAFTS-v1', ignore=[404])],
+        )
+        self.opensearch_manager.finalize_versioned_index.assert_not_called()
+
+    def test_reindex_count_mismatch_rolled_back(self):
+        self.tasks = {'task-MODULES-v1': self.task_info(), 'task-DRAFTS-v1': self.task_info()}
+        self.opensearch.count.side_effect = lambda index: {'count': 9 if index == 'DRAFTS-v1' else 10}
+
+        with self.assertRaises(RuntimeError):
+            bgr.reindex(self.opensearch_manager, self.indices, 'v1', mock.MagicMock())
+
+        self.opensearch.tasks.cancel.assert_not_called()
+        self.assertEqual(self.opensearch.indices.delete.call_count, 2)
+
+
+class TestMainLocksClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.lock_file_cron = os.path.join(self.directory.name, 'cron.lock')
+        self.lock_file_drafts = os.path.join(self.directory.name, 'drafts.lock')
+        config = ConfigParser()
+        config.read_dict(
+            {
+                'Directory-Section': {
+                    'logs': self.directory.name,
+                    'lock-cron': self.lock_file_cron,
+                    'lock-drafts': self.lock_file_drafts,
+                    'index-generation': os.path.join(self.directory.name, 'index_generation'),
+                },
+            },
+        )
+        patchers = (
+            mock.patch.object(bgr, 'create_config', return_value=config),
+            mock.patch.object(bgr, 'OpenSearchManager'),
+            mock.patch.object(bgr.sys, 'argv', ['blue_green_reindex.py', '--indices', 'drafts']),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_main_locks_indexing_of_drafts(self):
+        locked = []
+
+        def reindex(*args, **kwargs):
+            locked.append((os.path.exists(self.lock_file_cron), os.path.exists(self.lock_file_drafts)))
+            return {OpenSearchIndices.DRAFTS: 'drafts-v1'}
+
+        with mock.patch.object(bgr, 'reindex', side_effect=reindex):
+            bgr.main()
+
+        self.assertEqual(locked, [(True, True)])
+        self.assertFalse(os.path.exists(self.lock_file_cron))
+        self.assertFalse(os.path.exists(self.lock_file_drafts))
+
+    def test_main_drafts_being_indexed(self):
+        open(self.lock_file_drafts, 'w').close()
+
+        with mock.patch.object(bgr, 'reindex') as mock_reindex, self.assertRaises(SystemExit):
+            bgr.main()
+
+        mock_reindex.assert_not_called()
+        self.assertFalse(os.path.exists(self.lock_file_cron))
+        self.assertTrue(os.path.exists(self.lock_file_drafts))
+
+
+if __name__ == '__main__':
+    unittest.main()
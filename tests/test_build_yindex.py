@@ -0,0 +1,97 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import unittest
+from unittest import mock
+
+from opensearch_indexing.build_yindex import identify_documents, push_module_indices
+from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+
+
+def yindex_document(path: str, description: str = '') -> dict:
+    return {
+        'module': 'yang-module',
+        'revision': '2020-01-01',
+        'organization': 'ietf',
+        'path': path,
+        'statement': 'leaf',
+        'argument': path.rsplit('/', 1)[-1],
+        'description': description,
+    }
+
+
+class TestBuildYindexClass(unittest.TestCase):
+    def test_identify_documents(self):
+        documents = [yindex_document('/ym:container/ym:leaf'), yindex_document('/ym:container/ym:leaf')]
+
+        identified_documents = identify_documents(documents)
+        identified_again = identify_documents([yindex_document('/ym:container/ym:leaf', 'changed'), documents[1]])
+
+        self.assertEqual(len(identified_documents), 2)
+        self.assertEqual(list(identified_documents), list(identified_again))
+        first_id, second_id = identified_documents
+        self.assertNotEqual(
+            identified_documents[first_id]['content-hash'],
+            identified_again[first_id]['content-hash'],
+        )
+        self.assertEqual(
+            identified_documents[second_id]['content-hash'],
+            identified_again[second_id]['content-hash'],
+        )
+
+    def test_push_module_indices_changed_documents_only(self):
+        unchanged = yindex_document('/ym:unchanged')
+        changed = yindex_document('/ym:changed', 'new description')
+        indexed_documents = identify_documents(
+            [unchanged, yindex_document('/ym:changed'), yindex_document('/ym:removed')]
+        )
+        unchanged_id, changed_id, removed_id = indexed_documents
+        opensearch_manager = mock.MagicMock()
+        opensearch_manager.get_content_hashes.return_value = {
+            document_id: document['content-hash'] for document_id, document in indexed_documents.items()
+        }
+        opensearch_manager.get_module_by_name_revision.return_value = []
+        module = {'name': 'yang-module', 'revision': '2020-01-01', 'organization': 'ietf', 'path': 'yang-module.yang'}
+
+        push_module_indices(
+            opensearch_manager,
+            module,
+            {'yindexes': {'yindex': [unchanged, changed]}, 'submodules': []},
+            mock.MagicMock(),
+        )
+
+        opensearch_manager.bulk_modules.assert_called_once()
+        index, actions = opensearch_manager.bulk_modules.call_args.args
+        self.assertEqual(index, OpenSearchIndices.YINDEX)
+        self.assertEqual(
+            {action['_id']: action.get('_op_type') for action in actions},
+            {
+                removed_id: 'delete',
+                changed_id: None,
+            },
+        )
+        self.assertNotIn(unchanged_id, [action['_id'] for action in actions])
+        opensearch_manager.index_module.assert_called_once_with(
+            OpenSearchIndices.AUTOCOMPLETE,
+            {'name': 'yang-module', 'revision': '2020-01-01', 'organization': 'ietf'},
+            document_id='yang-module@2020-01-01',
+        )
+        opensearch_manager.delete_from_index.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import unittest
+from unittest import mock
+
+from ddt import data, ddt, unpack
+
+import jobs.celery as jc
+from jobs.celery_configuration import BULK, INTERACTIVE, LEGACY_QUEUE, MAINTENANCE
+
+
+@ddt
+class TestCeleryRoutingClass(unittest.TestCase):
+    @data(
+        ('jobs.celery.test_task', INTERACTIVE),
+        ('jobs.celery.process', INTERACTIVE),
+        ('jobs.celery.process_vendor_deletion', INTERACTIVE),
+        ('jobs.celery.process_module_deletion', INTERACTIVE),
+        ('jobs.celery.github_populate', BULK),
+        ('jobs.celery.run_script', MAINTENANCE),
+        ('jobs.celery.unknown_task', INTERACTIVE),
+    )
+    @unpack
+    def test_route(self, task_name: str, queue: str):
+        self.assertEqual(jc.celery_app.amqp.router.route({}, task_name)['queue'].name, queue)
+        self.assertEqual(jc.get_task_class(task_name), queue)
+
+    def test_tasks_registered_under_their_names(self):
+        for task in (jc.process_module_deletion, jc.process_vendor_deletion, jc.run_script):
+            self.assertIn(task.name, jc.celery_app.conf.task_routes)
+
+
+@ddt
+class TestWorkerClassClass(unittest.TestCase):
+    def setUp(self):
+        self.worker_class_options = {
+            INTERACTIVE: {'concurrency': 4, 'prefetch_multiplier': 4},
+            BULK: {'concurrency': 1, 'prefetch_multiplier': 1},
+            MAINTENANCE: {'concurrency': 2, 'prefetch_multiplier': 1},
+        }
+        patcher = mock.patch.object(jc, 'worker_class_options', self.worker_class_options)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @data((INTERACTIVE, [INTERACTIVE, LEGACY_QUEUE]), (BULK, [BULK]), (MAINTENANCE, [MAINTENANCE]))
+    @unpack
+    def test_configure_worker_class_queues(self, task_class: str, queues: list[str]):
+        instance = mock.MagicMock()
+
+        jc.configure_worker_class_queues(f'{task_class}@host', instance, options={'queues': None})
+
+        instance.app.amqp.queues.select.assert_called_once_with(queues)
+
+    @data(('celery@host', {}), ('bulk@host', {'queues': 'maintenance'}))
+    @unpack
+    def test_configure_worker_class_queues_not_selected(self, hostname: str, options: dict):
+        instance = mock.MagicMock()
+
+        jc.configure_worker_class_queues(hostname, instance, options=options)
+
+        instance.app.amqp.queues.select.assert_not_called()
+
+    def test_configure_worker_class_options(self):
+        # the command line always passes the defaults read from the configuration
+        worker = mock.MagicMock(hostname='maintenance@host', concurrency=1, prefetch_multiplier=1)
+
+        jc.configure_worker_class_options(worker)
+
+        self.assertEqual(worker.concurrency, 2)
+        self.assertEqual(worker.prefetch_multiplier, 1)
+
+    def test_configure_worker_class_options_unknown_class(self):
+        worker = mock.MagicMock(hostname='worker@host', concurrency=8, prefetch_multiplier=4)
+
+        jc.configure_worker_class_options(worker)
+
+        self.assertEqual(worker.concurrency, 8)
+        self.assertEqual(worker.prefetch_multiplier, 4)
+
+    def test_worker_class_options_applied_before_pool(self):
+        """The options are applied by the worker_init signal, which the worker sends before creating its pool."""
+        worker = mock.MagicMock(hostname='interactive@host', concurrency=1, prefetch_multiplier=1)
+
+        jc.worker_init.send(sender=worker)
+
+        self.assertEqual(worker.concurrency, 4)
+        self.assertEqual(worker.prefetch_multiplier, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import shutil
+import threading
 import unittest
 from unittest import mock
 
@@ -28,7 +29,7 @@ from ddt import data, ddt
 from redis import Redis
 
 import jobs.celery
-from jobs.celery import process, process_module_deletion, process_vendor_deletion
+from jobs.celery import find_undeletable_modules, process, process_module_deletion, process_vendor_deletion
 from jobs.status_messages import StatusMessage
 from redisConnections.redis_enum import RedisEnum
 from redisConnections.redisConnection import RedisConnection
@@ -115,17 +116,8 @@ class CeleryAppMock:
         self.logger = logging.getLogger('test_celery_tasks')
         self.notify_indexing = config.get('General-Section', 'notify-index') == 'True'
         self.save_file_dir = config.get('Directory-Section', 'save-file-dir')
-        changes_cache_path = config.get('Directory-Section', 'changes-cache')
-        delete_cache_path = config.get('Directory-Section', 'delete-cache')
-        failed_changes_cache_path = config.get('Directory-Section', 'changes-cache-failed')
-        lock_file = config.get('Directory-Section', 'lock')
         self.yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
-        self.indexing_paths = ESIndexingPaths(
-            cache_path=changes_cache_path,
-            deletes_path=delete_cache_path,
-            failed_path=failed_changes_cache_path,
-            lock_path=lock_file,
-        )
+        self.indexing_paths = ESIndexingPaths(queue_path=config.get('Directory-Section', 'indexing-queue'))
         self.confd_credentials = config.get('Secrets-Section', 'confd-credentials').strip('"').split()
 
     def reload_cache(self):
@@ -319,6 +311,55 @@ class TestCeleryTasksClass(TestCeleryTasksBaseClass):
 
         self.assertEqual(status, StatusMessage.SUCCESS)
 
+    @mock.patch('jobs.celery.prepare_for_es_removal', mock.MagicMock)
+    def test_process_module_deletion_waits_for_catalog_write_lock(self):
+        """The deletion must not interleave with a catalog update of a worker of another task class."""
+        module_to_populate = self.test_data['module-deletion-tests']
+        self.redis_connection.populate_modules(module_to_populate)
+        self.redis_connection.reload_modules_cache()
+        modules_to_delete = [{'name': 'another-yang-module', 'revision': '2020-03-01', 'organization': 'ietf'}]
+        lock = self.redis_connection.catalog_write_lock()
+        lock.acquire()
+        try:
+            deletion = threading.Thread(target=process_module_deletion, args=(modules_to_delete,))
+            deletion.start()
+            deletion.join(1)
+
+            self.assertTrue(deletion.is_alive())
+            self.assertNotEqual(self.redis_connection.get_module('another-yang-module@2020-03-01/ietf'), '{}')
+        finally:
+            lock.release()
+        deletion.join(10)
+
+        self.assertFalse(deletion.is_alive())
+        self.assertEqual(self.redis_connection.get_module('another-yang-module@2020-03-01/ietf'), '{}')
+
+
+class TestFindUndeletableModulesClass(unittest.TestCase):
+    def test_find_undeletable_modules(self):
+        def module(name: str, dependencies: tuple[str, ...] = (), submodules: tuple[str, ...] = ()) -> dict:
+            return {
+                'name': name,
+                'revision': '2020-01-01',
+                'dependencies': [{'name': dependency, 'revision': '2020-01-01'} for dependency in dependencies],
+                'submodule': [{'name': submodule, 'revision': '2020-01-01'} for submodule in submodules],
+            }
+
+        all_modules = {
+            'existing@2020-01-01/ietf': module('existing', dependencies=('blocked',)),
+            'blocked@2020-01-01/ietf': module('blocked', submodules=('blocked-transitively',)),
+            'blocked-transitively@2020-01-01/ietf': module('blocked-transitively'),
+            'cycle-a@2020-01-01/ietf': module('cycle-a', dependencies=('cycle-b',)),
+            'cycle-b@2020-01-01/ietf': module('cycle-b', dependencies=('cycle-a',)),
+        }
+        candidates = {(name, '2020-01-01') for name in ('blocked', 'blocked-transitively', 'cycle-a', 'cycle-b')}
+
+        undeletable_modules = find_undeletable_modules(candidates, all_modules)
+
+        self.assertEqual(set(undeletable_modules), {('blocked', '2020-01-01'), ('blocked-transitively', '2020-01-01')})
+        self.assertIn('existing@2020-01-01/ietf', undeletable_modules['blocked', '2020-01-01'])
+        self.assertIn('blocked@2020-01-01', undeletable_modules['blocked-transitively', '2020-01-01'])
+
 
 @ddt
 class TestCeleryTasksVendorsDeletionClass(TestCeleryTasksBaseClass):
@@ -382,6 +423,19 @@ class TestCeleryTasksVendorsDeletionClass(TestCeleryTasksBaseClass):
                 implementation_key = self.redis_connection.create_implementation_key(implementation)
                 self.assertNotIn(deleted_vendor_branch, implementation_key)
 
+    @mock.patch('jobs.celery.prepare_for_es_removal')
+    def test_process_vendor_deletion_dependents(self, indexing_mock: mock.MagicMock):
+        indexing_mock.return_value = {}
+        params = {'vendor': 'fujitsu', 'platform': None, 'software-version': None, 'software-flavor': None}
+
+        status = process_vendor_deletion(params)
+
+        self.assertEqual(status, StatusMessage.SUCCESS)
+        self.assertEqual(self.redis_connection.get_module('fujitsu-alarms-ext@2017-04-21/fujitsu'), '{}')
+        huawei_module = json.loads(self.redis_connection.get_module('huawei-aaa@2020-07-01/huawei'))
+        self.assertEqual(huawei_module['dependents'], [])
+        self.assertEqual(len(huawei_module['implementations']['implementation']), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,149 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ddt import data, ddt
+
+from api.views.yang_search.completions import Completions, CompletionTrie
+from opensearch_indexing.index_generation import bump_index_generation
+from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
+
+
+@ddt
+class TestCompletionTrieClass(unittest.TestCase):
+    def setUp(self):
+        self.trie = CompletionTrie(
+            {
+                'ietf-rip': 2,
+                'ietf-restconf': 1,
+                'ietf-yang-types': 3,
+                'openconfig-bgp': 1,
+                'openconfig-isis': 1,
+                'Cisco-IOS-XR-ip-rip-cfg': 1,
+            },
+        )
+
+    def test_complete_ranked(self):
+        self.assertEqual(self.trie.complete('ietf-'), ['ietf-yang-types', 'ietf-rip', 'ietf-restconf'])
+
+    @data('IETF-R', 'ietf-r')
+    def test_complete_case_insensitive(self, pattern: str):
+        self.assertEqual(self.trie.complete(pattern), ['ietf-rip', 'ietf-restconf'])
+
+    def test_complete_parts(self):
+        self.assertEqual(self.trie.complete('-yang-'), ['ietf-yang-types'])
+        self.assertEqual(self.trie.complete('rip'), ['ietf-rip', 'Cisco-IOS-XR-ip-rip-cfg'])
+        self.assertEqual(self.trie.complete('ios-xr'), ['Cisco-IOS-XR-ip-rip-cfg'])
+
+    @data('ief-r', 'etf', 'ietf-rips', 'random')
+    def test_complete_no_results(self, pattern: str):
+        self.assertEqual(self.trie.complete(pattern), [])
+
+    def test_complete_size(self):
+        trie = CompletionTrie({f'module-{i:02}': i for i in range(30)}, size=15)
+
+        self.assertEqual(trie.complete('module'), [f'module-{i:02}' for i in range(29, 14, -1)])
+        self.assertEqual(trie.complete('module-0'), [f'module-{i:02}' for i in range(9, -1, -1)])
+
+
+class TestCompletionsClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.generation_path = os.path.join(self.directory.name, 'index_generation')
+        self.opensearch_manager = mock.MagicMock()
+        self.documents = {
+            OpenSearchIndices.AUTOCOMPLETE: [
+                {'name': 'ietf-rip', 'organization': 'ietf'},
+                {'name': 'ietf-rip', 'organization': 'ietf'},
+                {'name': 'openconfig-bgp', 'organization': 'openconfig'},
+            ],
+            OpenSearchIndices.DRAFTS: [{'draft': 'draft-ietf-netmod-foo-00'}],
+        }
+        self.loaded = threading.Event()
+        self.opensearch_manager.scan_all.side_effect = self.scan_all
+        self.now = 1000.0
+        monotonic_patcher = mock.patch('api.views.yang_search.completions.time.monotonic', side_effect=lambda: self.now)
+        monotonic_patcher.start()
+        self.addCleanup(monotonic_patcher.stop)
+        self.completions = Completions(
+            self.opensearch_manager,
+            self.generation_path,
+            mock.MagicMock(),
+            min_rebuild_interval=60,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def scan_all(self, index: OpenSearchIndices, source: list[str]):
+        self.loaded.wait(5)
+        return iter(list(self.documents[index]))
+
+    def load(self):
+        """Let the running rebuild load the documents and wait until it finishes."""
+        self.loaded.set()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and thread.daemon:
+                thread.join(5)
+        self.loaded.clear()
+
+    def test_complete(self):
+        self.assertIsNone(self.completions.complete('module', 'ietf'))
+        self.load()
+
+        self.assertEqual(self.completions.complete('module', 'ietf'), ['ietf-rip'])
+        self.assertEqual(self.completions.complete('organization', 'open'), ['openconfig'])
+        self.assertEqual(self.completions.complete('draft', 'netmod'), ['draft-ietf-netmod-foo-00'])
+        self.assertEqual(self.opensearch_manager.scan_all.call_count, 2)
+
+    def test_complete_rebuilt_on_new_generation(self):
+        self.completions.complete('module', 'ietf')
+        self.load()
+        self.documents[OpenSearchIndices.AUTOCOMPLETE].append({'name': 'ietf-restconf', 'organization': 'ietf'})
+        bump_index_generation(self.generation_path)
+        self.now += 60
+
+        self.assertEqual(self.completions.complete('module', 'ietf'), ['ietf-rip'])
+        self.load()
+        self.assertEqual(self.completions.complete('module', 'ietf'), ['ietf-rip', 'ietf-restconf'])
+
+    def test_complete_rebuild_debounced(self):
+        """Generations bumped by consecutive indexing batches don't rebuild the tries on every request."""
+        self.completions.complete('module', 'ietf')
+        self.load()
+        self.documents[OpenSearchIndices.AUTOCOMPLETE].append({'name': 'ietf-restconf', 'organization': 'ietf'})
+        for _ in range(3):
+            bump_index_generation(self.generation_path)
+            self.now += 10
+            self.assertEqual(self.completions.complete('module', 'ietf'), ['ietf-rip'])
+        self.assertEqual(self.opensearch_manager.scan_all.call_count, 2)
+
+        self.now += 30
+        self.completions.complete('module', 'ietf')
+        self.load()
+
+        self.assertEqual(self.completions.complete('module', 'ietf'), ['ietf-rip', 'ietf-restconf'])
+        self.assertEqual(self.opensearch_manager.scan_all.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,46 @@ class TestDumperClass(unittest.TestCase):
         # Compare properties/keys of desired and dumped module data objects
         self.compare_module_data(desired_module_data, dumped_module_data)
 
+    def test_dumper_dump_modules_jsonl(self):
+        """
+        Dumper object is created with the compressed line-delimited dump format and one SDO module is added.
+        Modules are then dumped into prepare.jsonl.gz file and read back record by record using load_dumped_modules().
+        """
+        file_name = 'prepare_jsonl'
+        yang = self.declare_sdo_module()
+
+        dumper = du.Dumper(yc_gc.logs_dir, file_name, dump_format='jsonl.gz')
+        dumper.add_module(yang)
+        dumper.dump_modules(yc_gc.temp_dir)
+
+        desired_module_data = self.test_data['dumped_module']['module']
+        self.assertEqual(
+            du.find_dump_file(yc_gc.temp_dir, file_name),
+            os.path.join(yc_gc.temp_dir, f'{file_name}.jsonl.gz'),
+        )
+        dumped_module_data = list(du.load_dumped_modules(yc_gc.temp_dir, file_name))
+        os.remove(os.path.join(yc_gc.temp_dir, f'{file_name}.jsonl.gz'))
+
+        self.compare_module_data(desired_module_data, dumped_module_data)
+
+    def test_find_dump_file_newest(self):
+        """
+        A leftover prepare.json of an older run must not hide the prepare.jsonl dumped afterwards.
+        """
+        file_name = 'prepare_leftover'
+        old_path = os.path.join(yc_gc.temp_dir, f'{file_name}.json')
+        new_path = os.path.join(yc_gc.temp_dir, f'{file_name}.jsonl')
+        for path in (old_path, new_path):
+            with open(path, 'w'):
+                pass
+        os.utime(old_path, (0, 0))
+
+        try:
+            self.assertEqual(du.find_dump_file(yc_gc.temp_dir, file_name), new_path)
+        finally:
+            os.remove(old_path)
+            os.remove(new_path)
+
     def test_dumper_dump_vendors(self):
         """
         Dumper object is initialized and key of one Modules object is added to 'yang_modules' dictionary.
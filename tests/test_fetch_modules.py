@@ -19,12 +19,15 @@ __email__ = 'dmytro.kyrychenko@pantheon.tech'
 
 import json
 import unittest
+from configparser import ConfigParser
 from unittest import mock
 
 import requests
 
+from redisConnections.redis_enum import RedisEnum
+from redisConnections.redisConnection import RedisConnection
 from utility.create_config import create_config
-from utility.fetch_modules import fetch_modules
+from utility.fetch_modules import fetch_modules, iter_modules
 from utility.log import get_logger
 
 
@@ -130,3 +133,44 @@ class TestFetchModules(unittest.TestCase):
 
         self.assertIsNotNone(modules)
         self.assertEqual(modules, self.test_modules['module'])
+
+    def test_redis_snapshot(self):
+        config = ConfigParser()
+        config.read_dict(self.config)
+        config.set('DB-Section', 'modules-source', 'redis')
+        redis_connection = RedisConnection(modules_db=RedisEnum.TEST_MODULES.value, config=self.config)
+        modules_data = {
+            f'{module["name"]}@2022-01-01/{module["organization"]}': module for module in self.test_modules['module']
+        }
+        redis_connection.set_module(modules_data, 'modules-data')
+        self.addCleanup(redis_connection.modulesDB.delete, 'modules-data')
+
+        with mock.patch('utility.fetch_modules.RedisConnection', return_value=redis_connection):
+            modules = fetch_modules(self.logger, config=config)
+            cisco_modules = fetch_modules(self.logger, config=config, organizations={'cisco'})
+            named_modules = list(iter_modules(self.logger, config=config, names={'draft-for-test'}))
+            missing_modules = fetch_modules(self.logger, config=config, names={'random'})
+
+        self.assertEqual(modules, self.test_modules['module'])
+        self.assertEqual(cisco_modules, self.test_modules['module'][1:])
+        self.assertEqual(named_modules, self.test_modules['module'][:1])
+        self.assertEqual(missing_modules, [])
+
+    def test_redis_snapshot_empty(self):
+        config = ConfigParser()
+        config.read_dict(self.config)
+        config.set('DB-Section', 'modules-source', 'redis')
+        redis_connection = RedisConnection(modules_db=RedisEnum.TEST_MODULES.value, config=self.config)
+        redis_connection.modulesDB.delete('modules-data')
+
+        with mock.patch('utility.fetch_modules.RedisConnection', return_value=redis_connection):
+            with self.assertRaises(RuntimeError):
+                fetch_modules(self.logger, config=config)
+
+    def test_filtered_request(self):
+        with mock.patch('requests.get', return_value=MockResponse(json_data=self.test_modules, status_code=200)):
+            cisco_modules = fetch_modules(self.logger, config=self.config, organizations={'cisco'})
+            named_modules = list(iter_modules(self.logger, config=self.config, names={'draft-for-test'}))
+
+        self.assertEqual(cisco_modules, self.test_modules['module'][1:])
+        self.assertEqual(named_modules, self.test_modules['module'][:1])
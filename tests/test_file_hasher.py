@@ -0,0 +1,67 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from parseAndPopulate.file_hasher import FileHasher, SqliteHashesStore
+
+
+class TestFileHasherSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.log_dir)
+
+    def test_merge_and_get(self):
+        file_hasher = FileHasher('hashes', self.cache_dir, True, self.log_dir, backend='sqlite')
+        file_hasher.merge_and_dump_hashed_files_list({'/a.yang': {'hash1': [], 'hash2': ['impl1']}})
+        file_hasher.merge_and_dump_hashed_files_list({'/a.yang': {'hash2': ['impl1', 'impl2']}})
+
+        self.assertEqual(file_hasher.files_hashes.get('/a.yang'), {'hash1': [], 'hash2': ['impl1', 'impl2']})
+        self.assertEqual(file_hasher.files_hashes.get('/b.yang', {}), {})
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'hashes.json')))
+
+    def test_json_import(self):
+        with open(os.path.join(self.cache_dir, 'hashes.json'), 'w') as f:
+            json.dump({'/a.yang': {'hash1': ['impl1']}}, f)
+
+        file_hasher = FileHasher('hashes', self.cache_dir, True, self.log_dir, backend='sqlite')
+
+        self.assertEqual(file_hasher.files_hashes.get('/a.yang'), {'hash1': ['impl1']})
+
+    def test_shared_store(self):
+        db_path = os.path.join(self.cache_dir, 'hashes.sqlite')
+        file_hasher = FileHasher('hashes', self.cache_dir, True, self.log_dir, backend='sqlite')
+        other_store = SqliteHashesStore(db_path, file_hasher.logger)
+        other_store.upsert('/a.yang', 'hash1', ['impl1'])
+
+        self.assertEqual(file_hasher.files_hashes.get('/a.yang'), {'hash1': ['impl1']})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            FileHasher('hashes', self.cache_dir, True, self.log_dir, backend='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import tempfile
+import unittest
+
+from opensearch_indexing.index_generation import bump_index_generation, get_index_generation
+
+
+class TestIndexGenerationClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.generation_path = os.path.join(self.directory.name, 'index_generation')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_index_generation_missing_file(self):
+        self.assertEqual(get_index_generation(self.generation_path), 0)
+
+    def test_bump_index_generation(self):
+        self.assertEqual(bump_index_generation(self.generation_path), 1)
+        self.assertEqual(bump_index_generation(self.generation_path), 2)
+        self.assertEqual(get_index_generation(self.generation_path), 2)
+        self.assertNotIn('index_generation.tmp', os.listdir(self.directory.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utility.indexing_queue import DELETE, INDEX, IndexingQueue
+
+
+class TestIndexingQueueClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = IndexingQueue(os.path.join(self.directory, 'indexing_queue.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_enqueue_and_claim(self):
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': '/var/yang/all_modules/yang-module@2020-01-01.yang'})
+        self.queue.enqueue(modules_to_delete=['another-yang-module@2020-03-01/ietf'])
+
+        items = self.queue.claim(10)
+
+        self.assertEqual(
+            [(item.action, item.module_key) for item in items],
+            [
+                (INDEX, 'yang-module@2020-01-01/ietf'),
+                (DELETE, 'another-yang-module@2020-03-01/ietf'),
+            ],
+        )
+        self.assertEqual(items[0].path, '/var/yang/all_modules/yang-module@2020-01-01.yang')
+        self.assertEqual(self.queue.claim(10), [])
+        self.assertEqual(len(self.queue), 2)
+
+    def test_ack(self):
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'path', 'another-yang-module@2020-03-01/ietf': 'path'})
+        items = self.queue.claim(10)
+
+        self.queue.ack(items[:1])
+
+        self.assertEqual(len(self.queue), 1)
+
+    def test_retry(self):
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'path'})
+        items = self.queue.claim(10)
+
+        self.queue.retry(items, delay=60)
+
+        self.assertEqual(self.queue.claim(10), [])
+        with mock.patch('utility.indexing_queue.time.time', return_value=1e12):
+            retried_items = self.queue.claim(10)
+        self.assertEqual(len(retried_items), 1)
+        self.assertEqual(retried_items[0].attempts, 1)
+
+    def test_claim_expired_lease(self):
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'path'})
+        self.queue.claim(10, lease=0)
+
+        items = self.queue.claim(10)
+
+        self.assertEqual(len(items), 1)
+
+    def test_claim_drops_superseded_items(self):
+        """A failed change waiting for its retry must not be processed after a newer deletion of the module."""
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'path', 'another-yang-module@2020-03-01/ietf': 'path'})
+        failed_item, other_item = self.queue.claim(10)
+        self.queue.retry([failed_item], delay=60)
+        self.queue.enqueue(modules_to_delete=['yang-module@2020-01-01/ietf'])
+
+        items = self.queue.claim(10)
+        self.queue.ack(items)
+
+        self.assertEqual([(item.action, item.module_key) for item in items], [(DELETE, 'yang-module@2020-01-01/ietf')])
+        self.assertEqual(len(self.queue), 1)
+        with mock.patch('utility.indexing_queue.time.time', return_value=1e12):
+            self.assertEqual([item.id for item in self.queue.claim(10)], [other_item.id])
+
+    def test_claim_keeps_claimed_superseded_items(self):
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'path'})
+        claimed_item = self.queue.claim(10)[0]
+        self.queue.enqueue({'yang-module@2020-01-01/ietf': 'new-path'})
+
+        items = self.queue.claim(10)
+
+        self.assertEqual([item.path for item in items], ['new-path'])
+        self.queue.ack([claimed_item])
+        self.assertEqual(len(self.queue), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,7 @@ from copy import deepcopy
 from unittest import mock
 
 from api.globalConfig import yc_gc
+from opensearch_indexing.pyang_plugin.json_tree import tree_fingerprint
 from parseAndPopulate.modulesComplicatedAlgorithms import ModulesComplicatedAlgorithms
 
 
@@ -340,6 +341,48 @@ class TestModulesComplicatedAlgorithmsClass(unittest.TestCase):
             '4.1.0',
         )
 
+    @mock.patch('requests.get')
+    def test_parse_semver_parallel(self, mock_requests_get: mock.MagicMock):
+        """
+        Check whether 'derived-semantic-version' properties derived by the worker processes are the same
+        as the ones derived serially, and whether they are merged to the modules of the parent process.
+
+        Arguments:
+            :param mock_requests_get    (mock.MagicMock) requests.get() method is patched to return only
+                                                         the necessary modules
+        """
+        modules = self.payloads['modulesComplicatedAlgorithms_prepare_json']['module']
+        modules = sorted(modules, key=lambda k: k['revision'])
+        existing_modules = {'module': deepcopy(modules[:4] + modules[5:])}
+
+        mock_requests_get.return_value.json.return_value = existing_modules
+        mock_requests_get.return_value.status_code = 200
+
+        derived_semvers = []
+        for workers in (1, 2):
+            module_to_parse = deepcopy(modules[4])
+            complicated_algorithms = ModulesComplicatedAlgorithms(
+                yc_gc.logs_dir,
+                self.yangcatalog_api_prefix,
+                yc_gc.credentials,
+                self.save_file_dir,
+                yc_gc.temp_dir,
+                {'module': [module_to_parse]},
+                yc_gc.yang_models,
+                yc_gc.temp_dir,
+                yc_gc.json_ytree,
+            )
+
+            complicated_algorithms.parse_semver(workers=workers)
+
+            new_modules = complicated_algorithms.new_modules['semver-test']
+            self.assertIs(new_modules['2020-05-01'], module_to_parse)
+            derived_semvers.append(
+                {revision: module['derived-semantic-version'] for revision, module in new_modules.items()},
+            )
+        self.assertEqual(derived_semvers[0], derived_semvers[1])
+        self.assertEqual(derived_semvers[1]['2020-05-01'], '4.1.0')
+
     @mock.patch('requests.get')
     def test_parse_non_requests_openconfig(self, mock_requests_get: mock.MagicMock):
         module = self.payloads['parse_tree_type']['module'][0]
@@ -441,5 +484,30 @@ class TestModulesComplicatedAlgorithmsClass(unittest.TestCase):
         self.assertNotIn('1', new['n2'])
 
 
+class TestTreeFingerprint(unittest.TestCase):
+    def test_tree_fingerprint(self):
+        tree = {
+            'name': 'module',
+            'description': 'Old description',
+            'children': [
+                {'name': 'a', 'flags': {'config': True}, 'children': []},
+                {'name': 'b', 'flags': {'config': False}, 'type_info': None},
+            ],
+        }
+        reordered_tree = {
+            'children': [
+                {'name': 'b', 'flags': {'config': False}, 'type_info': None, 'description': 'New description'},
+                {'children': [], 'flags': {'config': True}, 'name': 'a'},
+            ],
+            'name': 'module',
+        }
+        changed_tree = deepcopy(tree)
+        changed_tree['children'][1]['flags']['config'] = True
+
+        self.assertEqual(tree_fingerprint(tree), tree_fingerprint(reordered_tree))
+        self.assertNotEqual(tree_fingerprint(tree), tree_fingerprint(changed_tree))
+        self.assertNotEqual(tree_fingerprint(['a', 'a']), tree_fingerprint(['a', 'b']))
+
+
 if __name__ == '__main__':
     unittest.main()
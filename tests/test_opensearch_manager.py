@@ -20,9 +20,11 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 import json
 import os
 import unittest
+from unittest import mock
 
 from ddt import data, ddt
 from opensearchpy import OpenSearch
+from opensearchpy.exceptions import RequestError
 
 from opensearch_indexing.models.keywords_names import KeywordsNames
 from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
@@ -103,6 +105,11 @@ class TestOpenSearchManagerWithEmptyIndexClass(TestOpenSearchManagerClass):
 
         self.assertFalse(in_es)
 
+    def test_documents_exist(self):
+        in_es = self.opensearch_manager.documents_exist(self.test_index, [self.ietf_rip_module])
+
+        self.assertEqual(in_es, [False])
+
     def test_autocomplete_no_results(self):
         searched_term = 'ietf-'
         results = self.opensearch_manager.autocomplete(self.test_index, KeywordsNames.NAME, searched_term)
@@ -196,6 +203,17 @@ class TestOpenSearchManagerAutocompleteIndexClass(TestOpenSearchManagerClass):
 
         self.assertTrue(in_es)
 
+    def test_documents_exist(self):
+        modules = [
+            self.ietf_rip_module,
+            {'name': 'ietf-rip', 'revision': '2000-01-01', 'organization': 'ietf'},
+            {'name': 'random', 'revision': '2022-01-01', 'organization': 'random'},
+            {'name': 'openconfig-bgp', 'revision': '2021-12-01', 'organization': 'openconfig'},
+        ]
+        in_es = self.opensearch_manager.documents_exist(self.test_index, modules, chunk_size=2)
+
+        self.assertEqual(in_es, [True, False, False, True])
+
     def test_get_module_by_name_revision(self):
         hits = self.opensearch_manager.get_module_by_name_revision(self.test_index, self.ietf_rip_module)
 
@@ -233,6 +251,33 @@ class TestOpenSearchManagerAutocompleteIndexClass(TestOpenSearchManagerClass):
             self.assertIn('revision', module)
             self.assertIn('organization', module)
 
+    def test_scan_all_sliced(self):
+        documents = list(self.opensearch_manager.scan_all(self.test_index, page_size=2, slices=2))
+        all_documents = list(self.opensearch_manager.scan_all(self.test_index, page_size=2, slices=1))
+
+        self.assertNotEqual(documents, [])
+        self.assertCountEqual(documents, all_documents)
+
+
+class TestOpenSearchManagerFailingQueryClass(unittest.TestCase):
+    @mock.patch('opensearch_indexing.opensearch_manager.scan')
+    def test_documents_exist_failing_query(self, mock_scan: mock.MagicMock):
+        """Documents are not reported missing when the existence of some of them can't be checked."""
+        opensearch_manager = OpenSearchManager(mock.MagicMock())
+        mock_scan.side_effect = [
+            iter([{'_source': {'module': 'ietf-rip', 'revision': '2020-02-20'}}]),
+            RequestError(400, 'search_phase_execution_exception', {}),
+        ]
+        modules = [
+            {'name': 'ietf-rip', 'revision': '2020-02-20'},
+            {'name': 'ietf-rip', 'revision': '2000-01-01'},
+            {'name': 'openconfig-bgp', 'revision': '2021-12-01'},
+        ]
+
+        with self.assertRaises(RequestError):
+            opensearch_manager.documents_exist(OpenSearchIndices.MODULES, modules, chunk_size=2)
+        self.assertEqual(mock_scan.call_count, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
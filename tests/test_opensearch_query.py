@@ -0,0 +1,170 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import json
+import unittest
+from unittest import mock
+
+from redis import Redis
+
+import api.views.yang_search.search_params as sp
+from api.views.yang_search.opensearch_query import OpenSearchQuery
+from redisConnections.redis_enum import RedisEnum
+from redisConnections.redisConnection import RedisConnection
+from utility.create_config import create_config
+from utility.staticVariables import OUTPUT_COLUMNS, SCHEMA_TYPES
+
+
+def create_hit(module_name: str, revision: str, argument: str = 'leaf') -> dict:
+    return {
+        '_source': {
+            'argument': argument,
+            'revision': revision,
+            'statement': 'leaf',
+            'path': f'/{module_name}:{argument}',
+            'module': module_name,
+            'organization': 'ietf',
+            'description': '',
+        },
+    }
+
+
+def create_module(name: str, revision: str, yang_version: str = '1.1') -> dict:
+    return {
+        'name': name,
+        'revision': revision,
+        'organization': 'ietf',
+        'yang-version': yang_version,
+        'maturity-level': 'ratified',
+        'dependents': [{'name': 'dependent'}],
+        'compilation-status': 'passed',
+    }
+
+
+def create_search(
+    redis_connection: RedisConnection,
+    latest_revision: bool = False,
+    output_columns: list[str] = OUTPUT_COLUMNS,
+) -> OpenSearchQuery:
+    search_params = sp.SearchParams(
+        include_mibs=False,
+        latest_revision=latest_revision,
+        include_drafts=True,
+        subqueries=[sp.ModuleName('ietf', False, False)],
+        yang_versions=['1.0', '1.1'],
+        schema_types=SCHEMA_TYPES,
+        output_columns=list(output_columns),
+    )
+    return OpenSearchQuery('/var/yang/logs', mock.MagicMock(), redis_connection, search_params)
+
+
+class TestOpenSearchQueryClass(unittest.TestCase):
+    def test_process_hits(self):
+        redis_connection = mock.MagicMock()
+        redis_connection.get_modules.return_value = {
+            'ietf-a@2020-01-01/ietf': create_module('ietf-a', '2020-01-01'),
+            'ietf-c@2020-01-01/ietf': create_module('ietf-c', '2020-01-01', yang_version='1.2'),
+        }
+        search = create_search(redis_connection)
+        hits = [
+            create_hit('ietf-a', '2020-01-01', 'first'),
+            create_hit('ietf-a', '2020-01-01', 'second'),
+            create_hit('ietf-b', '2020-01-01'),
+            create_hit('ietf-b', '2020-01-01', 'second'),
+            create_hit('ietf-c', '2020-01-01'),
+        ]
+
+        rows = search._process_hits(hits)
+
+        redis_connection.get_modules.assert_called_once()
+        self.assertCountEqual(
+            redis_connection.get_modules.call_args.args[0],
+            ['ietf-a@2020-01-01/ietf', 'ietf-b@2020-01-01/ietf', 'ietf-c@2020-01-01/ietf'],
+        )
+        self.assertEqual([row['name'] for row in rows], ['first', 'second'])
+        self.assertEqual(rows[0]['dependents'], 1)
+        self.assertEqual(rows[0]['compilation-status'], 'passed')
+        self.assertEqual(search.alerts(), ['Module ietf-b@2020-01-01/ietf metadata does not exist in yangcatalog'])
+
+    def test_process_hits_latest_revision(self):
+        redis_connection = mock.MagicMock()
+        redis_connection.get_modules.return_value = {'ietf-a@2021-01-01/ietf': create_module('ietf-a', '2021-01-01')}
+        search = create_search(redis_connection, latest_revision=True)
+        search._latest_revisions = {'ietf-a': '2021-01-01'}
+
+        rows = search._process_hits([create_hit('ietf-a', '2020-01-01'), create_hit('ietf-a', '2021-01-01')])
+
+        redis_connection.get_modules.assert_called_once_with(['ietf-a@2021-01-01/ietf'])
+        self.assertEqual([row['revision'] for row in rows], ['2021-01-01'])
+
+    def test_process_hits_remove_duplicate_rows(self):
+        redis_connection = mock.MagicMock()
+        redis_connection.get_modules.return_value = {'ietf-a@2020-01-01/ietf': create_module('ietf-a', '2020-01-01')}
+        search = create_search(redis_connection, output_columns=['module-name'])
+
+        rows = search._process_hits([create_hit('ietf-a', '2020-01-01', 'first'), create_hit('ietf-a', '2020-01-01')])
+
+        self.assertEqual(rows, [{'module-name': 'ietf-a'}])
+
+
+class TestOpenSearchQueryBenchmarkClass(unittest.TestCase):
+    """Processing of large result sets with the modules stored in a real Redis database."""
+
+    hits_count = 5000
+    modules_count = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        config = create_config()
+        cls.redis_connection = RedisConnection(modules_db=RedisEnum.TEST_MODULES.value, config=config)
+        cls.modules_db = Redis(
+            host=config.get('DB-Section', 'redis-host'),
+            port=int(config.get('DB-Section', 'redis-port')),
+            db=RedisEnum.TEST_MODULES.value,
+        )
+        cls.modules_db.flushdb()
+        cls.modules_db.mset(
+            {
+                f'ietf-module-{i}@2020-01-01/ietf': json.dumps(create_module(f'ietf-module-{i}', '2020-01-01'))
+                for i in range(cls.modules_count)
+            },
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.modules_db.flushdb()
+
+    def test_process_hits_single_redis_request(self):
+        search = create_search(self.redis_connection)
+        hits = [
+            create_hit(f'ietf-module-{i % self.modules_count}', '2020-01-01', f'leaf-{i}')
+            for i in range(self.hits_count)
+        ]
+
+        with mock.patch.object(
+            self.redis_connection.modulesDB,
+            'execute_command',
+            wraps=self.redis_connection.modulesDB.execute_command,
+        ) as execute_command:
+            rows = search._process_hits(hits)
+
+        self.assertEqual(len(rows), self.hits_count)
+        self.assertEqual(execute_command.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
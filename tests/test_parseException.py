@@ -19,24 +19,46 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 
 import json
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 from api.globalConfig import yc_gc
-from utility.yangParser import ParseException
+from utility.yangParser import ParseException, UnparsableModulesRecorder, get_unparsable_modules_recorder
 
 
 class TestParseExceptionClass(unittest.TestCase):
     def test_parse_exception(self):
         """Test if ParseException is raised when non-existing path is passed as 'path' argument.
-        Load content of unparsable-modules.json file and check whether name of the module is stored in file.
+        Check whether name of the module is recorded, and whether it is stored in the unparsable-modules.json file
+        after the record is compacted.
         """
         ParseException('module.yang')
 
+        recorder = get_unparsable_modules_recorder(yc_gc.var_yang)
+        self.assertIn('module.yang', recorder.modules())
+
+        recorder.compact()
         with open(os.path.join(yc_gc.var_yang, 'unparsable-modules.json'), 'r') as f:
             modules = json.load(f)
 
         self.assertNotEqual(modules, [])
         self.assertIn('module.yang', modules)
+        self.assertIn('module.yang', recorder.modules())
+
+    def test_recorder_compacts_at_exit_only_after_add(self):
+        """Readers of the record must never compact it at exit, only the processes which appended to it."""
+        with tempfile.TemporaryDirectory() as var_path, mock.patch('utility.yangParser.atexit.register') as register:
+            recorder = UnparsableModulesRecorder(var_path)
+            modules = recorder.modules()
+            register.assert_not_called()
+
+            recorder.add('module.yang')
+            recorder.add('other.yang')
+
+            register.assert_called_once_with(recorder.compact)
+            self.assertIsInstance(modules, frozenset)
+            self.assertEqual(recorder.modules(), {'module.yang', 'other.yang'})
 
 
 if __name__ == '__main__':
@@ -55,6 +55,29 @@ class TestParseDirectoryClass(unittest.TestCase):
             },
         )
 
+    def test_save_files_incremental(self):
+        save_file_dir = self.resource('all_modules')
+        shutil.rmtree(save_file_dir, ignore_errors=True)
+        os.mkdir(save_file_dir)
+        manifest_path = os.path.join(save_file_dir, 'manifest.json')
+
+        file_mapping = pd.save_files(self.resource('sdo'), save_file_dir, incremental=True, manifest_path=manifest_path)
+        with mock.patch('parseAndPopulate.parse_directory.parse_name_and_revision') as mock_parse:
+            second_file_mapping = pd.save_files(
+                self.resource('sdo'),
+                save_file_dir,
+                incremental=True,
+                manifest_path=manifest_path,
+            )
+            mock_parse.assert_not_called()
+
+        self.assertListEqual(
+            sorted(os.listdir(save_file_dir)),
+            ['manifest.json', 'sdo-first@2022-08-05.yang', 'sdo-second@2022-08-05.yang', 'sdo-third@2022-08-05.yang'],
+        )
+        self.assertDictEqual(file_mapping, pd.save_files(self.resource('sdo'), save_file_dir))
+        self.assertDictEqual(file_mapping, second_file_mapping)
+
     @mock.patch('parseAndPopulate.parse_directory.SdoDirectory')
     def test_parse_sdo_generic(self, mock_sdo_directory_cls: mock.MagicMock):
         dumper = mock.MagicMock()
@@ -0,0 +1,126 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import opensearch_indexing.process_changed_mods as pcm
+from utility.indexing_queue import INDEX, IndexingQueueItem
+
+
+class ThreadParsePool(ThreadPoolExecutor):
+    """Parse pool running in threads, so the mocked parsing is shared with the test."""
+
+    def __init__(self, max_workers: int, mp_context=None):
+        super().__init__(max_workers)
+
+
+class TestChangeModulesInParallelClass(unittest.TestCase):
+    def setUp(self):
+        # the configuration is not needed by the processing itself
+        self.process_changed_mods = pcm.ProcessChangedMods.__new__(pcm.ProcessChangedMods)
+        self.process_changed_mods.logger = mock.MagicMock()
+        self.process_changed_mods.save_file_dir = '/var/yang/all_modules'
+        self.process_changed_mods.json_ytree = '/var/yang/ytrees'
+        self.process_changed_mods.parse_workers = 1
+        self.process_changed_mods.io_workers = 1
+        self.process_changed_mods.max_attempts = 3
+        self.process_changed_mods.retry_delay = 600
+        self.process_changed_mods.opensearch_manager = mock.MagicMock()
+        self.process_changed_mods.indexing_queue = self.indexing_queue = mock.MagicMock()
+        self.items = [
+            IndexingQueueItem(id=i, action=INDEX, module_key=f'module-{i}@2020-01-01/ietf', path='path', attempts=0)
+            for i in range(10)
+        ]
+        self.failed_parses: set[str] = set()
+        self.blocked_pushes: set[str] = set()
+        self.pushed = threading.Event()
+
+        pool_patcher = mock.patch.object(pcm, 'ProcessPoolExecutor', ThreadParsePool)
+        parse_patcher = mock.patch.object(pcm, 'parse_module_indices', side_effect=self.parse)
+        push_patcher = mock.patch.object(pcm, 'push_module_indices', side_effect=self.push)
+        pool_patcher.start()
+        self.parse_mock = parse_patcher.start()
+        self.push_mock = push_patcher.start()
+        for patcher in (pool_patcher, parse_patcher, push_patcher):
+            self.addCleanup(patcher.stop)
+
+    def parse(self, module, *args):
+        if module['name'] in self.failed_parses:
+            raise ValueError(f'{module["name"]} can not be parsed')
+        return {'name': module['name']}
+
+    def push(self, opensearch_manager, module, indices, logger):
+        if module['name'] in self.blocked_pushes:
+            self.pushed.wait(10)
+
+    def run_in_thread(self) -> tuple[threading.Thread, list[int]]:
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(self.process_changed_mods._change_modules_in_parallel(self.items)),
+        )
+        thread.start()
+        return thread, result
+
+    def acked_ids(self) -> list[int]:
+        return [item.id for call in self.indexing_queue.ack.call_args_list for item in call.args[0]]
+
+    def test_back_pressure(self):
+        """Parsing pauses while the modules can't be pushed to OpenSearch."""
+        self.blocked_pushes = {f'module-{i}' for i in range(10)}
+
+        thread, result = self.run_in_thread()
+        time.sleep(0.5)
+        parsed_while_blocked = self.parse_mock.call_count
+        self.pushed.set()
+        thread.join(10)
+
+        # at most 2 modules per parse worker and 2 per io worker are in progress, one more can be in between
+        self.assertLessEqual(parsed_while_blocked, 5)
+        self.assertEqual(self.parse_mock.call_count, 10)
+        self.assertEqual(result, [10])
+
+    def test_ack_as_soon_as_pushed(self):
+        self.blocked_pushes = {f'module-{i}' for i in range(1, 10)}
+
+        thread, _ = self.run_in_thread()
+        time.sleep(0.5)
+        acked_while_blocked = self.acked_ids()
+        self.pushed.set()
+        thread.join(10)
+
+        self.assertEqual(acked_while_blocked, [0])
+        self.assertCountEqual(self.acked_ids(), range(10))
+
+    def test_failed_module_retried(self):
+        self.failed_parses = {'module-3'}
+        self.blocked_pushes = {'module-3'}
+
+        thread, result = self.run_in_thread()
+        thread.join(10)
+
+        self.assertEqual(result, [9])
+        self.indexing_queue.retry.assert_called_once_with([self.items[3]], delay=self.process_changed_mods.retry_delay)
+        self.assertCountEqual(self.acked_ids(), [i for i in range(10) if i != 3])
+        self.assertNotIn('module-3', [call.args[1]['name'] for call in self.push_mock.call_args_list])
+
+
+if __name__ == '__main__':
+    unittest.main()
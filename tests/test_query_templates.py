@@ -0,0 +1,55 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from opensearch_indexing.query_templates import _load_template, get_template
+
+
+class TestQueryTemplatesClass(unittest.TestCase):
+    template_path = 'opensearch_indexing/json/module_search.json'
+
+    def setUp(self):
+        _load_template.cache_clear()
+
+    def test_get_template(self):
+        with open(os.path.join(os.environ['BACKEND'], self.template_path), encoding='utf-8') as reader:
+            expected_template = json.load(reader)
+
+        self.assertEqual(get_template(self.template_path), expected_template)
+
+    def test_get_template_loaded_once(self):
+        with mock.patch('builtins.open', wraps=open) as open_mock:
+            get_template(self.template_path)
+            get_template(self.template_path)
+
+        open_mock.assert_called_once()
+
+    def test_get_template_copy(self):
+        template = get_template(self.template_path)
+        template['query']['bool']['must'][0]['match_phrase']['name.keyword']['query'] = 'ietf-rip'
+
+        self.assertEqual(
+            get_template(self.template_path)['query']['bool']['must'][0]['match_phrase']['name.keyword'], {'query': ''}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
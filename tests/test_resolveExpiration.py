@@ -23,9 +23,9 @@ VI. Module is already expired - last draft revision before RFC
 VII. Module set to expired - new version of draft available
 VIII. Active draft - change expires property to date in the future
 IX. Datatracker unavailable - exception raised after GET request
+X. Shared datatracker client - concurrent, cached and conditional requests against a local stub
 """
 
-
 __author__ = 'Slavomir Mazur'
 __copyright__ = 'Copyright The IETF Trust 2021, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
@@ -33,11 +33,19 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 
 import json
 import os
+import threading
+import time
 import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import requests
 
 import utility.log as log
-from parseAndPopulate.resolvers.expiration import ExpirationResolver
+from parseAndPopulate.resolvers.expiration import DatatrackerClient, DatatrackerError, ExpirationResolver
 from redisConnections.redisConnection import RedisConnection
 
 
@@ -297,5 +305,99 @@ class TestResolveExpirationClass(unittest.TestCase):
         return loaded_result
 
 
+class DatatrackerStubHandler(BaseHTTPRequestHandler):
+    """Datatracker document API stub with injected latency and failures."""
+
+    latency = 0.05
+    failing = {'draft-failing'}
+    etag = '"documents-v1"'
+    requests_count: Counter = Counter()
+
+    def do_GET(self):
+        name = parse_qs(urlparse(self.path).query)['name'][0]
+        self.requests_count[name] += 1
+        time.sleep(self.latency)
+        if name in self.failing:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({'objects': [{'name': name, 'rev': '05', 'rfc': None, 'expires': '2099-01-01T00:00:00'}]})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDatatrackerClientClass(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), DatatrackerStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.logger = log.get_logger('resolve_expiration', '/var/yang/logs/jobs/resolve_expiration.log')
+
+    def setUp(self):
+        DatatrackerStubHandler.requests_count.clear()
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+
+    def test_concurrent_cached_requests(self):
+        datatracker = DatatrackerClient(self.logger, session=self.session, base_url=self.base_url, cache_ttl=3600)
+        modules = [
+            {
+                'name': 'ietf-test',
+                'revision': f'2021-01-{day:02d}',
+                'reference': f'https://datatracker.ietf.org/doc/draft-test/{rev}',
+                'expired': True,
+            }
+            for day, rev in enumerate(('03', '04', '05', '05'), start=1)
+        ]
+        modules.append(
+            {
+                'name': 'ietf-failing',
+                'revision': '2021-01-01',
+                'reference': 'https://datatracker.ietf.org/doc/draft-failing/01',
+            }
+        )
+        redis_connection = mock.MagicMock()
+        failures = []
+
+        def resolve(module: dict):
+            return ExpirationResolver(module, self.logger, failures, redis_connection, datatracker).resolve()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(resolve, modules))
+
+        self.assertEqual(results, [False, False, True, True, True])
+        self.assertEqual(DatatrackerStubHandler.requests_count['draft-test'], 1)
+        self.assertEqual(modules[2]['expires'], '2099-01-01T00:00:00')
+        self.assertEqual(modules[4]['expired'], 'not-applicable')
+        self.assertEqual(failures, [])
+
+    def test_conditional_request(self):
+        datatracker = DatatrackerClient(self.logger, session=self.session, base_url=self.base_url, cache_ttl=60)
+        documents = datatracker.get_documents('draft-test')
+        datatracker._cache['draft-test']['fetched'] -= 120
+
+        self.assertEqual(datatracker.get_documents('draft-test'), documents)
+        self.assertEqual(DatatrackerStubHandler.requests_count['draft-test'], 2)
+
+    def test_unavailable_datatracker(self):
+        datatracker = DatatrackerClient(self.logger, base_url='http://127.0.0.1:1', retries=2, retry_delay=0)
+
+        with self.assertRaises(DatatrackerError):
+            datatracker.get_documents('draft-test')
+
+
 if __name__ == '__main__':
     unittest.main()
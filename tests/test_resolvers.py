@@ -19,6 +19,8 @@ __email__ = 'dmytro.kyrychenko@pantheon.tech'
 
 import logging
 import os
+import shutil
+import tempfile
 import unittest
 from unittest import mock
 
@@ -30,6 +32,7 @@ from parseAndPopulate.models.submodule import Submodule
 from parseAndPopulate.models.vendor_modules import VendorInfo
 from parseAndPopulate.resolvers.basic import BasicResolver
 from parseAndPopulate.resolvers.expiration import ExpirationResolver
+from parseAndPopulate.resolvers.extractor import ModuleExtractor
 from parseAndPopulate.resolvers.generated_from import GeneratedFromResolver
 from parseAndPopulate.resolvers.implementations import ImplementationResolver
 from parseAndPopulate.resolvers.imports import ImportsResolver
@@ -573,6 +576,55 @@ class TestResolversClass(unittest.TestCase):
         res = nr.resolve()
         self.assertEqual(res, 'urn:ietf:params:xml:ns:yang:ietf-yang-types')
 
+    # ModuleExtractor
+    def test_module_extractor_indexed_search(self):
+        module_stmt = new_statement(None, None, None, 'module', 'test-module')
+        for keyword, arg in (('revision', '2022-01-01'), ('prefix', 'tm'), ('revision', '2021-01-01')):
+            module_stmt.substmts.append(new_statement(None, module_stmt, None, keyword, arg))
+
+        extractor = ModuleExtractor(module_stmt, self.logger, self.resources_path)
+
+        self.assertEqual(extractor.statement.search('revision'), module_stmt.search('revision'))
+        self.assertEqual(
+            extractor.statement.search_one('revision', arg='2021-01-01'),
+            module_stmt.search_one('revision', arg='2021-01-01'),
+        )
+        self.assertEqual(extractor.statement.search('contact'), [])
+        self.assertEqual(
+            extractor.resolve('revision', RevisionResolver(extractor.statement, self.logger)), '2022-01-01'
+        )
+        self.assertEqual(extractor.timings, {})
+
+    def test_module_extractor_profiling(self):
+        module_stmt = new_statement(None, None, None, 'module', 'test-module')
+        module_stmt.substmts.append(new_statement(None, module_stmt, None, 'prefix', 'tm'))
+
+        extractor = ModuleExtractor(module_stmt, self.logger, self.resources_path, profile=True)
+        res = extractor.resolve('prefix', PrefixResolver(extractor.statement, self.logger, '', None))
+
+        self.assertEqual(res, 'tm')
+        self.assertIn('prefix', extractor.timings)
+        self.assertIn('prefix', ModuleExtractor.total_timings)
+
+    def test_module_extractor_find_yang(self):
+        save_file_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, save_file_dir)
+        for file_name in ('test-module@2020-01-01.yang', 'test-module@2021-01-01.yang'):
+            open(os.path.join(save_file_dir, file_name), 'w').close()
+        module_stmt = new_statement(None, None, None, 'module', 'test-module')
+
+        extractor = ModuleExtractor(module_stmt, self.logger, save_file_dir)
+
+        self.assertEqual(
+            extractor.find_yang('test-module'),
+            os.path.join(save_file_dir, 'test-module@2021-01-01.yang'),
+        )
+        self.assertEqual(
+            extractor.find_yang('test-module', '2020-01-01'),
+            os.path.join(save_file_dir, 'test-module@2020-01-01.yang'),
+        )
+        self.assertIsNone(extractor.find_yang('missing-module'))
+
 
 if __name__ == '__main__':
     unittest.main()
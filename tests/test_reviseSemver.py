@@ -0,0 +1,80 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import tempfile
+import unittest
+
+import parseAndPopulate.reviseSemver as rs
+
+
+def create_module(name: str, revision: str, semver: str = '1.0.0', compilation_status: str = 'passed') -> dict:
+    module = {'name': name, 'revision': revision, 'organization': 'ietf', 'compilation-status': compilation_status}
+    if semver:
+        module['derived-semantic-version'] = semver
+    return module
+
+
+class TestReviseSemverWatermarkClass(unittest.TestCase):
+    def setUp(self):
+        self.modules = [
+            create_module('ietf-a', '2020-01-01'),
+            create_module('ietf-a', '2021-01-01', semver='2.0.0'),
+            create_module('ietf-b', '2020-01-01'),
+            # the semver of this family can not be derived
+            create_module('ietf-c', '2020-01-01', semver='', compilation_status='failed'),
+        ]
+
+    def test_watermark_round_trip(self):
+        signatures = rs.get_family_signatures(self.modules)
+        with tempfile.TemporaryDirectory() as directory:
+            watermark_path = os.path.join(directory, 'revise_semver_watermark.json')
+
+            self.assertEqual(rs.load_watermark(watermark_path), {})
+            rs.save_watermark(watermark_path, signatures)
+
+            self.assertEqual(rs.load_watermark(watermark_path), signatures)
+            self.assertEqual(os.listdir(directory), ['revise_semver_watermark.json'])
+
+    def test_family_signatures_ignore_order_and_semver(self):
+        signatures = rs.get_family_signatures(self.modules)
+        reordered = [*reversed(self.modules[:2]), *self.modules[2:]]
+        reordered[0] = {**reordered[0], 'derived-semantic-version': '3.0.0'}
+
+        self.assertEqual(set(signatures), {'ietf-a', 'ietf-b', 'ietf-c'})
+        self.assertEqual(rs.get_family_signatures(reordered), signatures)
+
+    def test_get_changed_families(self):
+        watermark = rs.get_family_signatures(self.modules)
+        self.modules.append(create_module('ietf-b', '2022-01-01', semver=''))
+        self.modules[0]['compilation-status'] = 'failed'
+        self.modules.append(create_module('ietf-d', '2020-01-01'))
+
+        changed = rs.get_changed_families(rs.get_family_signatures(self.modules), watermark)
+
+        self.assertEqual(changed, {'ietf-a', 'ietf-b', 'ietf-d'})
+
+    def test_get_changed_families_underivable_semver(self):
+        """A family revised by an earlier run is not revised again only because its semver is still missing."""
+        signatures = rs.get_family_signatures(self.modules)
+
+        self.assertEqual(rs.get_changed_families(signatures, {}), {'ietf-a', 'ietf-b', 'ietf-c'})
+        self.assertEqual(rs.get_changed_families(signatures, signatures), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
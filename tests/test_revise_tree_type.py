@@ -0,0 +1,133 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+import os
+import tempfile
+import unittest
+from collections import defaultdict
+from configparser import ConfigParser
+from unittest import mock
+
+import utility.revise_tree_type as rtt
+
+
+def create_module(name: str, revision: str) -> dict:
+    return {'name': name, 'revision': revision, 'tree-type': 'nmda-compatible', 'module-type': 'module'}
+
+
+class TestReviseTreeTypeClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.save_file_dir = self.directory.name
+        self.modules = [
+            create_module('ietf-a', '2020-01-01'),
+            create_module('ietf-a', '2021-01-01'),
+            create_module('ietf-b', '2020-01-01'),
+            create_module('ietf-b', '2021-01-01'),
+        ]
+        for module in self.modules:
+            with open(os.path.join(self.save_file_dir, f'{module["name"]}@{module["revision"]}.yang'), 'w') as f:
+                f.write(f'module {module["name"]} {{ revision {module["revision"]}; }}')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_complicated_algorithms(self, unresolvable: set[str]) -> mock.MagicMock:
+        complicated_algorithms = mock.MagicMock()
+        complicated_algorithms.new_modules = defaultdict(dict)
+        complicated_algorithms.check_if_latest_revision.side_effect = lambda module: module['revision'] == '2021-01-01'
+
+        def resolve_tree_type(modules: list[dict]):
+            for module in modules:
+                if module['name'] in unresolvable:
+                    # e.g. emit_tree failed, so the module is not written
+                    continue
+                complicated_algorithms.new_modules[module['name']][module['revision']] = {
+                    **module,
+                    'tree-type': 'split',
+                }
+
+        complicated_algorithms.resolve_tree_type.side_effect = resolve_tree_type
+        return complicated_algorithms
+
+    def test_revise_tree_types_unresolved_module_recomputed(self):
+        """Only modules whose tree-type was written get a fingerprint, the unresolved ones are recomputed next time."""
+        fingerprints = rtt.ModuleFingerprints(self.modules, self.save_file_dir)
+
+        revised, skipped, written = rtt.revise_tree_types(
+            self.create_complicated_algorithms({'ietf-b'}),
+            self.modules,
+            fingerprints,
+            {},
+        )
+
+        self.assertEqual((revised, skipped), (2, 0))
+        self.assertEqual(list(written), ['ietf-a@2020-01-01'])
+
+        # ietf-a@2020-01-01 is still listed as nmda-compatible, because the catalog did not catch up yet
+        complicated_algorithms = self.create_complicated_algorithms(set())
+        revised, skipped, written = rtt.revise_tree_types(complicated_algorithms, self.modules, fingerprints, written)
+
+        self.assertEqual((revised, skipped), (1, 1))
+        complicated_algorithms.resolve_tree_type.assert_called_once_with([self.modules[2]])
+        self.assertEqual(list(written), ['ietf-b@2020-01-01'])
+
+    def test_revise_tree_types_changed_fingerprint(self):
+        fingerprints = rtt.ModuleFingerprints(self.modules, self.save_file_dir)
+        _, _, written = rtt.revise_tree_types(self.create_complicated_algorithms(set()), self.modules, fingerprints, {})
+        with open(os.path.join(self.save_file_dir, 'ietf-a@2020-01-01.yang'), 'a') as f:
+            f.write('\n')
+
+        revised, skipped, _ = rtt.revise_tree_types(
+            self.create_complicated_algorithms(set()),
+            self.modules,
+            rtt.ModuleFingerprints(self.modules, self.save_file_dir),
+            written,
+        )
+
+        self.assertEqual((revised, skipped), (1, 1))
+
+    @mock.patch('utility.util.write_job_log')
+    @mock.patch('utility.revise_tree_type.fetch_modules')
+    @mock.patch('utility.revise_tree_type.create_config')
+    def test_main_populate_failed(self, mock_config: mock.MagicMock, mock_fetch: mock.MagicMock, _):
+        """Fingerprints written by an earlier run are dropped when the populate fails."""
+        config = ConfigParser()
+        config.read_dict(
+            {
+                'Directory-Section': {'cache': self.save_file_dir, 'save-file-dir': self.save_file_dir},
+                'Secrets-Section': {'confd-credentials': 'user password'},
+                'Web-Section': {'yangcatalog-api-prefix': 'http://localhost'},
+            },
+        )
+        mock_config.return_value = config
+        mock_fetch.return_value = self.modules
+        fingerprints_path = os.path.join(self.save_file_dir, 'revise_tree_type_fingerprints.json')
+        fingerprints = rtt.ModuleFingerprints(self.modules, self.save_file_dir)
+        rtt.save_fingerprints(fingerprints_path, {'ietf-a@2020-01-01': fingerprints.fingerprint('ietf-a@2020-01-01')})
+        complicated_algorithms = self.create_complicated_algorithms(set())
+        complicated_algorithms.populate.side_effect = RuntimeError('ConfD is not available')
+
+        with mock.patch('utility.revise_tree_type.ModulesComplicatedAlgorithms', return_value=complicated_algorithms):
+            rtt.main()
+
+        complicated_algorithms.resolve_tree_type.assert_called_once_with([self.modules[2]])
+        self.assertEqual(rtt.load_fingerprints(fingerprints_path), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
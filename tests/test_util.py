@@ -193,5 +193,36 @@ class TestUtilClass(unittest.TestCase):
             return {}
 
 
+class TestParseNameAndRevisionClass(unittest.TestCase):
+    license_header = (
+        '/*\n'
+        ' * This module contains a collection of YANG definitions.\n'
+        ' * Copyright (c) 2020 IETF Trust, revision 1999-01-01 of the license.\n'
+        ' */\n'
+    )
+
+    def test_parse_name_and_revision_multi_line_header(self):
+        text = (
+            f'{self.license_header}module ietf-foo {{\n'
+            '  namespace "urn:ietf:params:xml:ns:yang:ietf-foo";\n'
+            '  /* the newest revision\n     comes first */\n'
+            '  revision 2020-01-01;\n' + '  leaf bar { type string; }\n' * 2000 + '}\n'
+        )
+
+        with mock.patch.object(util, 'strip_comments', wraps=util.strip_comments) as strip_comments:
+            result = util.parse_name_and_revision(text, scan_size=512)
+
+        self.assertEqual(result, ('ietf-foo', '2020-01-01'))
+        self.assertEqual(
+            result, (util.parse_name(util.strip_comments(text)), util.parse_revision(util.strip_comments(text)))
+        )
+        self.assertEqual(strip_comments.call_count, 1)
+
+    def test_parse_name_and_revision_comment_over_prefix(self):
+        text = f'module ietf-foo {{\n  /*{" comment" * 200}\n  revision 1999-01-01;\n*/\n  revision 2020-01-01;\n}}\n'
+
+        self.assertEqual(util.parse_name_and_revision(text, scan_size=64), ('ietf-foo', '2020-01-01'))
+
+
 if __name__ == '__main__':
     unittest.main()
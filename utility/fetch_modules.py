@@ -19,10 +19,12 @@ __email__ = 'dmytro.kyrychenko@pantheon.tech'
 
 import logging
 import time
+import typing as t
 from configparser import ConfigParser
 
 import requests
 
+from redisConnections.redisConnection import RedisConnection
 from utility.create_config import create_config
 from utility.staticVariables import json_headers
 
@@ -30,7 +32,59 @@ SLEEP_TIME = 30
 N_RETRIES = 5
 
 
-def fetch_modules(logger: logging.Logger, config: ConfigParser = create_config()) -> list[dict]:
+def fetch_modules(
+    logger: logging.Logger,
+    config: ConfigParser = create_config(),
+    names: t.Optional[t.Container[str]] = None,
+    organizations: t.Optional[t.Container[str]] = None,
+) -> list[dict]:
+    """
+    Fetch all the modules of the catalog, optionally only the ones with the given names or organizations.
+    Use iter_modules() instead if the modules are processed one by one and the list is not needed.
+    """
+    modules = list(iter_modules(logger, config=config, names=names, organizations=organizations))
+    logger.debug(f'{len(modules)} modules fetched successfully')
+    return modules
+
+
+def iter_modules(
+    logger: logging.Logger,
+    config: ConfigParser = create_config(),
+    names: t.Optional[t.Container[str]] = None,
+    organizations: t.Optional[t.Container[str]] = None,
+) -> t.Iterator[dict]:
+    """
+    Iterate over the modules of the catalog, optionally only the ones with the given names or organizations.
+    Depending on the 'modules-source' option of the DB-Section, the modules are either requested
+    from the /search/modules endpoint of the API ('api', default), or streamed directly from the Redis
+    catalog snapshot ('redis'), in which case they are decoded and filtered one at a time.
+
+    Arguments:
+        :param logger           (Logger)
+        :param config           (ConfigParser) Configuration with the DB-Section and the Web-Section
+        :param names            (Optional[Container[str]]) Names of the modules to return, all if None
+        :param organizations    (Optional[Container[str]]) Organizations of the modules to return, all if None
+        :return                 (Iterator[dict]) Iterator of the modules
+    """
+    if config.get('DB-Section', 'modules-source', fallback='api') == 'redis':
+        logger.info('Reading the modules from the Redis catalog snapshot')
+        empty = True
+        for module in RedisConnection(config=config).iter_modules_snapshot(names=names, organizations=organizations):
+            empty = False
+            yield module
+        if empty and names is None and organizations is None:
+            raise RuntimeError('Failed to read modules from Redis.')
+        return
+
+    for module in _request_modules(logger, config):
+        if names is not None and module.get('name') not in names:
+            continue
+        if organizations is not None and module.get('organization') not in organizations:
+            continue
+        yield module
+
+
+def _request_modules(logger: logging.Logger, config: ConfigParser) -> list[dict]:
     yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
     fetch_url = f'{yangcatalog_api_prefix}/search/modules'
 
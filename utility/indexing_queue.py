@@ -0,0 +1,149 @@
+# Copyright The IETF Trust 2024, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__copyright__ = 'Copyright The IETF Trust 2024, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+
+"""
+Durable queue of modules waiting to be indexed in, or deleted from OpenSearch, stored in an SQLite database.
+Producers enqueue all the modules of a request in a single transaction, without waiting for the consumer.
+The consumer claims the items in batches for a limited time (lease) and acknowledges them one by one,
+so items claimed by a consumer which crashed are claimed again once their lease expires.
+Only the newest item of each module is processed, older unclaimed items of the module, e.g. a failed change
+waiting to be retried, are dropped once a newer item is claimed, so they can't override it afterwards.
+"""
+
+import os
+import sqlite3
+import time
+import typing as t
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+
+INDEX = 'index'
+DELETE = 'delete'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT NOT NULL,
+    module_key TEXT NOT NULL,
+    path TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    claimed_until REAL
+);
+CREATE INDEX IF NOT EXISTS items_available_at ON items (available_at);
+CREATE INDEX IF NOT EXISTS items_module_key ON items (module_key, id);
+"""
+
+
+@dataclass
+class IndexingQueueItem:
+    id: int
+    action: str
+    module_key: str
+    path: t.Optional[str]
+    attempts: int
+
+
+class IndexingQueue:
+    def __init__(self, path: str, timeout: float = 30):
+        """
+        Arguments:
+            :param path     (str) path to the SQLite database file, created if it doesn't exist
+            :param timeout  (float) seconds to wait for a concurrent write transaction to finish
+        """
+        self.path = path
+        self.timeout = timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self) -> t.Iterator[sqlite3.Connection]:
+        # a new connection is opened for each transaction, so the queue can be used from threads and forked processes
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    def enqueue(self, modules_to_index: t.Optional[dict[str, str]] = None, modules_to_delete: t.Iterable[str] = ()):
+        """
+        Atomically add the modules to the queue.
+
+        Arguments:
+            :param modules_to_index     (dict[str, str]) paths of the modules to index by name@revision/organization
+            :param modules_to_delete    (Iterable[str]) name@revision/organization of the modules to delete
+        """
+        now = time.time()
+        rows = [(INDEX, module_key, path, now) for module_key, path in (modules_to_index or {}).items()]
+        rows += [(DELETE, module_key, None, now) for module_key in modules_to_delete]
+        if not rows:
+            return
+        with self._transaction() as connection:
+            connection.executemany(
+                'INSERT INTO items (action, module_key, path, available_at) VALUES (?, ?, ?, ?)',
+                rows,
+            )
+
+    def claim(self, limit: int, lease: float = 3600) -> list[IndexingQueueItem]:
+        """
+        Claim at most limit of the oldest available items for the lease seconds.
+        Items which are not acknowledged or retried before the lease expires become available again.
+        Unclaimed items superseded by a newer item of the same module are removed from the queue.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                'DELETE FROM items WHERE (claimed_until IS NULL OR claimed_until <= ?) AND EXISTS ('
+                'SELECT 1 FROM items AS newer WHERE newer.module_key = items.module_key AND newer.id > items.id)',
+                (now,),
+            )
+            rows = connection.execute(
+                'SELECT id, action, module_key, path, attempts FROM items '
+                'WHERE available_at <= ? AND (claimed_until IS NULL OR claimed_until <= ?) ORDER BY id LIMIT ?',
+                (now, now, limit),
+            ).fetchall()
+            connection.executemany(
+                'UPDATE items SET claimed_until = ? WHERE id = ?',
+                [(now + lease, row[0]) for row in rows],
+            )
+        return [IndexingQueueItem(*row) for row in rows]
+
+    def ack(self, items: t.Iterable[IndexingQueueItem]):
+        """Remove the processed items from the queue."""
+        with self._transaction() as connection:
+            connection.executemany('DELETE FROM items WHERE id = ?', [(item.id,) for item in items])
+
+    def retry(self, items: t.Iterable[IndexingQueueItem], delay: float = 0):
+        """Release the items which failed to be processed, so they can be claimed again after the delay seconds."""
+        available_at = time.time() + delay
+        with self._transaction() as connection:
+            connection.executemany(
+                'UPDATE items SET attempts = attempts + 1, available_at = ?, claimed_until = NULL WHERE id = ?',
+                [(available_at, item.id) for item in items],
+            )
+
+    def __len__(self) -> int:
+        with self._transaction() as connection:
+            return connection.execute('SELECT COUNT(*) FROM items').fetchone()[0]
@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import time
 import typing as t
 from dataclasses import dataclass
 
@@ -11,6 +10,7 @@ from opensearch_indexing.models.opensearch_indices import OpenSearchIndices
 from opensearch_indexing.opensearch_manager import OpenSearchManager
 from redisConnections.redisConnection import RedisConnection
 from utility import message_factory
+from utility.indexing_queue import IndexingQueue
 from utility.staticVariables import json_headers
 
 ESIndexingBody = t.TypedDict(
@@ -25,65 +25,27 @@ ESIndexingBody = t.TypedDict(
 
 @dataclass
 class ESIndexingPaths:
-    cache_path: str
-    deletes_path: str
-    failed_path: str
-    lock_path: str
+    queue_path: str
 
 
 def send_for_es_indexing(body_to_send: ESIndexingBody, logger: logging.Logger, paths: ESIndexingPaths):
     """
-    Creates a json file that will be used for OpenSearch indexing.
+    Adds the modules to the indexing queue, which is consumed by the process_changed_mods.py script.
 
     Arguments:
         :param body_to_send:        (dict) body that needs to be indexed
         :param logger:              (logging.Logger) Logger used for logging
-        :param paths                (dict) dict containing paths to the necessary files
+        :param paths                (ESIndexingPaths) paths to the necessary files
     """
-    logger.info(f'Updating metadata for elk - file creation in {paths.cache_path} or {paths.deletes_path}')
-    while os.path.exists(paths.lock_path):
-        time.sleep(10)
+    logger.info(f'Updating metadata for elk - adding modules to the indexing queue {paths.queue_path}')
     try:
-        try:
-            open(paths.lock_path, 'w').close()
-        except Exception:
-            raise Exception(f'Failed to obtain lock {paths.lock_path}')
-
-        changes_cache = {}
-        delete_cache = []
-        if os.path.exists(paths.cache_path) and os.path.getsize(paths.cache_path) > 0:
-            with open(paths.cache_path, 'r') as reader:
-                changes_cache = json.load(reader)
-        if os.path.exists(paths.deletes_path) and os.path.getsize(paths.deletes_path) > 0:
-            with open(paths.deletes_path, 'r') as reader:
-                delete_cache = json.load(reader)
-
-        if body_to_send.get('modules-to-index') is None:
-            body_to_send['modules-to-index'] = {}
-
-        if body_to_send.get('modules-to-delete') is None:
-            body_to_send['modules-to-delete'] = []
-
-        for mname, mpath in body_to_send['modules-to-index'].items():
-            changes_cache[mname] = mpath
-        for mname in body_to_send['modules-to-delete']:
-            exists = False
-            for existing in delete_cache:
-                if mname == existing:
-                    exists = True
-            if not exists:
-                delete_cache.append(mname)
-
-        with open(paths.cache_path, 'w') as writer:
-            json.dump(changes_cache, writer, indent=2)
-
-        with open(paths.deletes_path, 'w') as writer:
-            json.dump(delete_cache, writer, indent=2)
+        IndexingQueue(paths.queue_path).enqueue(
+            body_to_send.get('modules-to-index'),
+            body_to_send.get('modules-to-delete', []),
+        )
     except Exception as e:
         logger.exception('Problem while sending modules to indexing')
-        os.unlink(paths.lock_path)
         raise Exception(f'Caught exception {e}')
-    os.unlink(paths.lock_path)
 
 
 def prepare_for_es_removal(
@@ -133,7 +95,7 @@ def prepare_for_es_removal(
 
 def prepare_for_es_indexing(
     yc_api_prefix: str,
-    modules_to_index: str,
+    modules_to_index: t.Iterable[dict],
     logger: logging.Logger,
     save_file_dir: str,
     force_indexing: bool = False,
@@ -145,19 +107,18 @@ def prepare_for_es_indexing(
 
     Arguments:
         :param yc_api_prefix        (str) prefix for sending request to API
-        :param modules_to_index     (str) path to the prepare.json file generated while parsing
+        :param modules_to_index     (Iterable[dict]) modules dumped into the prepare file while parsing
         :param logger               (logging.Logger) formated logger with the specified name
         :param save_file_dir        (str) path to the directory where all the yang files will be saved
         :param force_indexing       (bool) Whether we should force indexing even if module exists in cache.
     """
     mf = message_factory.MessageFactory()
     opensearch_manager = OpenSearchManager()
-    with open(modules_to_index, 'r') as reader:
-        sdos_json = json.load(reader)
-        logger.debug(f'{len(sdos_json.get("module", []))} modules loaded from prepare.json')
     post_body = {}
     load_new_files_to_github = False
-    for module in sdos_json.get('module', []):
+    modules_count = 0
+    for module in modules_to_index:
+        modules_count += 1
         url = f'{yc_api_prefix}/search/modules/{module["name"]},{module["revision"]},{module["organization"]}'
         response = requests.get(url, headers=json_headers)
         code = response.status_code
@@ -173,6 +134,7 @@ def prepare_for_es_indexing(
             path = f'{save_file_dir}/{module.get("name")}@{module.get("revision")}.yang'
             key = f'{module["name"]}@{module["revision"]}/{module["organization"]}'
             post_body[key] = path
+    logger.debug(f'{modules_count} modules loaded from the prepare file')
 
     if post_body:
         post_body = {'modules-to-index': post_body}
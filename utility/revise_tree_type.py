@@ -17,6 +17,10 @@
 This script is run by a cronjob. It searches for modules that
 are no longer the latest revision and have tree-type nmda-compatible.
 The tree-type for these modules is reevaluated.
+Tree-type of a module depends only on the content of the module and its imports,
+so the fingerprints of these contents are stored for the modules whose new tree-type was written.
+If such a module is still listed as nmda-compatible by the next run with the same fingerprint,
+the catalog did not catch up with the write yet and the module is skipped for that run.
 """
 
 __author__ = 'Richard Zilincik'
@@ -25,6 +29,8 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'richard.zilincik@pantheon.tech'
 
 
+import hashlib
+import json
 import os
 
 import utility.log as log
@@ -33,7 +39,7 @@ from utility.create_config import create_config
 from utility.fetch_modules import fetch_modules
 from utility.script_config_dict import script_config_dict
 from utility.scriptConfig import ScriptConfig
-from utility.util import job_log
+from utility.util import JobLogMessage, job_log
 
 BASENAME = os.path.basename(__file__)
 FILENAME = BASENAME.split('.py')[0]
@@ -44,13 +50,117 @@ DEFAULT_SCRIPT_CONFIG = ScriptConfig(
 )
 
 
+class ModuleFingerprints:
+    """
+    Content-hash fingerprints of modules covering the module and all of its transitive dependencies.
+    Dependencies without a specified revision are resolved to the latest revision in the catalog.
+    """
+
+    def __init__(self, all_modules: list[dict], save_file_dir: str):
+        self.save_file_dir = save_file_dir
+        self._dependencies: dict[str, list[str]] = {}
+        self._latest_revisions: dict[str, str] = {}
+        self._file_hashes: dict[str, str] = {}
+        for module in all_modules:
+            name = module['name']
+            self._latest_revisions[name] = max(module['revision'], self._latest_revisions.get(name, ''))
+        for module in all_modules:
+            dependencies = []
+            for dependency in module.get('dependencies', []):
+                revision = dependency.get('revision') or self._latest_revisions.get(dependency['name'])
+                if revision:
+                    dependencies.append(f'{dependency["name"]}@{revision}')
+            self._dependencies[f'{module["name"]}@{module["revision"]}'] = dependencies
+
+    def fingerprint(self, name_revision: str) -> str:
+        visited = {name_revision}
+        to_visit = [name_revision]
+        while to_visit:
+            for dependency in self._dependencies.get(to_visit.pop(), []):
+                if dependency not in visited:
+                    visited.add(dependency)
+                    to_visit.append(dependency)
+        digest = hashlib.sha256()
+        for module in sorted(visited):
+            digest.update(f'{module}:{self._file_hash(module)}\n'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _file_hash(self, name_revision: str) -> str:
+        file_hash = self._file_hashes.get(name_revision)
+        if file_hash is None:
+            try:
+                with open(os.path.join(self.save_file_dir, f'{name_revision}.yang'), 'rb') as f:
+                    file_hash = hashlib.sha256(f.read()).hexdigest()
+            except FileNotFoundError:
+                file_hash = ''
+            self._file_hashes[name_revision] = file_hash
+        return file_hash
+
+
+def load_fingerprints(path: str) -> dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_fingerprints(path: str, fingerprints: dict[str, str]):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(fingerprints, f)
+    os.replace(tmp_path, path)
+
+
+def revise_tree_types(
+    complicated_algorithms: ModulesComplicatedAlgorithms,
+    modules: list[dict],
+    module_fingerprints: ModuleFingerprints,
+    written_fingerprints: dict[str, str],
+) -> tuple[int, int, dict[str, str]]:
+    """
+    Resolve and populate the tree-types of the modules which are not the latest revision, but are nmda-compatible.
+
+    Arguments:
+        :param complicated_algorithms   (ModulesComplicatedAlgorithms) Algorithms used to resolve the tree-types
+        :param modules                  (list[dict]) All the modules of the catalog
+        :param module_fingerprints      (ModuleFingerprints) Fingerprints of the modules of the catalog
+        :param written_fingerprints     (dict[str, str]) Fingerprints of the modules written by the previous run
+        :return                         (tuple[int, int, dict[str, str]]) Numbers of the recomputed and skipped modules,
+            and fingerprints of the modules whose new tree-type was written
+    """
+    modules_revise = []
+    fingerprints = {}
+    skipped = 0
+    for module in modules:
+        if module.get('tree-type') != 'nmda-compatible':
+            continue
+        if not complicated_algorithms.check_if_latest_revision(module):
+            name_revision = f'{module["name"]}@{module["revision"]}'
+            fingerprint = fingerprints[name_revision] = module_fingerprints.fingerprint(name_revision)
+            if written_fingerprints.get(name_revision) == fingerprint:
+                skipped += 1
+                continue
+            modules_revise.append(module)
+    complicated_algorithms.resolve_tree_type(modules_revise)
+    complicated_algorithms.populate()
+    # modules whose tree-type could not be resolved are not written, so they are recomputed by the next run
+    written = {
+        f'{name}@{revision}' for name, revisions in complicated_algorithms.new_modules.items() for revision in revisions
+    }
+    new_fingerprints = {
+        name_revision: fingerprint for name_revision, fingerprint in fingerprints.items() if name_revision in written
+    }
+    return len(modules_revise), skipped, new_fingerprints
+
+
 @job_log(file_basename=BASENAME)
-def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()):
+def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()) -> list[JobLogMessage]:
     config = create_config()
     temp_dir = config.get('Directory-Section', 'temp', fallback='/var/yang/tmp')
     log_directory = config.get('Directory-Section', 'logs', fallback='/var/yang/logs')
     save_file_dir = config.get('Directory-Section', 'save-file-dir', fallback='/var/yang/all_modules')
     yang_models = config.get('Directory-Section', 'yang-models-dir', fallback='/var/yang/nonietf/yangmodels/yang')
+    cache_dir = config.get('Directory-Section', 'cache', fallback='/var/yang/cache')
     credentials = config.get('Secrets-Section', 'confd-credentials').strip('"').split(' ')
     json_ytree = config.get('Directory-Section', 'json-ytree', fallback='/var/yang/ytrees')
     yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
@@ -59,6 +169,12 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()):
     logger.info('Starting Cron job for revise_tree_type')
     direc = '/var/yang/tmp'
 
+    logger.info('Fetching all of the modules from API.')
+    try:
+        modules = fetch_modules(logger, config=config)
+    except RuntimeError as e:
+        raise RuntimeError(f'Failed to fetch modules from API. Full exception:\n{e}')
+
     complicated_algorithms = ModulesComplicatedAlgorithms(
         log_directory,
         yangcatalog_api_prefix,
@@ -69,24 +185,30 @@ def main(script_conf: ScriptConfig = DEFAULT_SCRIPT_CONFIG.copy()):
         yang_models,
         temp_dir,
         json_ytree,
+        existing_modules=modules,
     )
 
-    modules_revise = []
-    logger.info('Fetching all of the modules from API.')
+    fingerprints_path = os.path.join(cache_dir, 'revise_tree_type_fingerprints.json')
+    module_fingerprints = ModuleFingerprints(modules, save_file_dir)
+    written_fingerprints = load_fingerprints(fingerprints_path)
     try:
-        modules = fetch_modules(logger, config=config)
-    except RuntimeError as e:
-        raise RuntimeError(f'Failed to fetch modules from API. Full exception:\n{e}')
-
-    for module in modules:
-        if module.get('tree-type') != 'nmda-compatible':
-            continue
-        if not complicated_algorithms.check_if_latest_revision(module):
-            modules_revise.append(module)
-    logger.info(f'Resolving tree-types for {len(modules_revise)} modules')
-    complicated_algorithms.resolve_tree_type(modules_revise)
-    complicated_algorithms.populate()
+        revised, skipped, new_fingerprints = revise_tree_types(
+            complicated_algorithms,
+            modules,
+            module_fingerprints,
+            written_fingerprints,
+        )
+    except Exception:
+        # nothing is known to be written by a failed run, so the next run must not skip any module
+        save_fingerprints(fingerprints_path, {})
+        raise
+    logger.info(f'Tree-types resolved for {revised} modules, {skipped} modules written by the last run skipped')
+    save_fingerprints(fingerprints_path, new_fingerprints)
     logger.info('Job finished successfully')
+    return [
+        {'label': 'Modules recomputed', 'message': revised},
+        {'label': 'Modules skipped', 'message': skipped},
+    ]
 
 
 if __name__ == '__main__':
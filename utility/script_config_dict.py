@@ -291,6 +291,18 @@ script_config_dict: dict[str, ScriptConfigInfo] = {
                 'type': str,
                 'default': os.environ['YANGCATALOG_CONFIG_PATH'],
             },
+            {
+                'flag': '--names',
+                'help': 'Comma-separated names of the modules to add to the dictionary, all the modules if empty',
+                'type': str,
+                'default': '',
+            },
+            {
+                'flag': '--organizations',
+                'help': 'Comma-separated organizations of the modules to add to the dictionary, all if empty',
+                'type': str,
+                'default': '',
+            },
         ],
     },
     'opensearch_recovery': {
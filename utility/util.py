@@ -42,7 +42,7 @@ from utility.staticVariables import BACKUP_DATE_FORMAT, JobLogStatuses
 from utility.yangParser import create_context
 
 single_line_re = re.compile(r'//.*')
-multi_line_re = re.compile(r'/\*.*?\*/', flags=re.MULTILINE)
+multi_line_re = re.compile(r'/\*.*?\*/', flags=re.DOTALL)
 name_re = re.compile(r'(sub)?module[\s\n\r]+"?([\w_\-\.]+)')
 revision_re = re.compile(r'revision[\s\n\r]+"?(\d{4}-\d{2}-\d{2})')
 
@@ -63,6 +63,33 @@ def parse_revision(text: str):
     return match.groups()[0] if match else '1970-01-01'
 
 
+def parse_name_and_revision(text: str, scan_size: int = 8192) -> tuple[str, str]:
+    """
+    Parse the module name and the first revision from the beginning of the module text.
+    Only a growing prefix of the text is stripped of comments and searched, so the whole module is processed
+    only if the revision statement is not found sooner. The result is the same as
+    parse_name(strip_comments(text)) and parse_revision(strip_comments(text)).
+
+    Arguments:
+        :param text         (str) Content of the yang module
+        :param scan_size    (int) Size of the first scanned prefix, doubled on each unsuccessful attempt
+    """
+    while True:
+        whole_text = scan_size >= len(text)
+        header = strip_comments(text if whole_text else text[:scan_size])
+        if not whole_text:
+            # Cut off the unterminated comment and any statement possibly cut in half at the end of the prefix
+            header = header.split('/*', 1)[0]
+            header = header[: max(header.rfind('\n'), 0)]
+        name_match = name_re.search(header)
+        revision_match = revision_re.search(header)
+        if whole_text or (name_match and revision_match):
+            name = name_match.groups()[1] if name_match else 'foobar'
+            revision = revision_match.groups()[0] if revision_match else '1970-01-01'
+            return name, revision
+        scan_size *= 2
+
+
 def resolve_revision(filename: str):
     with open(filename) as f:
         text = f.read()
@@ -347,3 +374,21 @@ def hash_pw(password: str) -> str:
 def yang_url(name, revision, config: ConfigParser = create_config()) -> str:
     domain_prefix = config.get('Web-Section', 'domain-prefix')
     return f'{domain_prefix}/all_modules/{name}@{revision}.yang'
+
+
+def chunked(iterable: t.Iterable, chunk_size: int) -> t.Iterator[list]:
+    """
+    Split an iterable into lists of at most chunk_size items, without loading the whole iterable into memory.
+
+    Arguments:
+        :param iterable     (Iterable) Items to split
+        :param chunk_size   (int) Maximal number of items in a chunk
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -20,6 +20,8 @@ __copyright__ = 'Copyright 2018 Cisco and its affiliates, Copyright The IETF Tru
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
+import atexit
+import fcntl
 import json
 import os.path
 import typing as t
@@ -157,7 +159,7 @@ def create_context(path: str = '.') -> OptsContext:
 
     # make a map of features to support, per module (taken from pyang bin)
     for feature_name in opts.features:
-        (module_name, features) = _parse_features_string(feature_name)
+        module_name, features = _parse_features_string(feature_name)
         ctx.features[module_name] = features
 
     # apply deviations (taken from pyang bin)
@@ -170,23 +172,110 @@ def create_context(path: str = '.') -> OptsContext:
     return ctx
 
 
+class UnparsableModulesRecorder:
+    """
+    Record of the modules which failed to be parsed.
+
+    Each failure is appended as a single line to the unparsable-modules.log file.
+    The appended lines are periodically compacted into the unparsable-modules.json file,
+    which contains the list of all the recorded modules. Both files are read by the modules() method,
+    whose result is cached until the modification time or size of one of the files changes.
+    Processes which append failures also compact the files when they exit, processes which only read them never do.
+    """
+
+    def __init__(self, var_path: str, compact_every: int = 1000):
+        """
+        Arguments:
+            :param var_path         (str) Directory where the files are stored
+            :param compact_every    (int) Number of appended failures after which the files are compacted
+        """
+        self.json_path = os.path.join(var_path, 'unparsable-modules.json')
+        self.log_path = os.path.join(var_path, 'unparsable-modules.log')
+        self.compact_every = compact_every
+        self._appended = 0
+        self._recorded: set[str] = set()
+        self._cached_modules: t.Optional[frozenset[str]] = None
+        self._cached_stats: t.Optional[tuple[tuple[int, int], tuple[int, int]]] = None
+
+    def add(self, module: str):
+        """Append the module to the record, if it wasn't already recorded by this process."""
+        if module in self._recorded:
+            return
+        with open(self.log_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            f.write(f'{module}\n')
+        if not self._recorded:
+            atexit.register(self.compact)
+        self._recorded.add(module)
+        self._appended += 1
+        if self._appended >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Merge the appended failures into the unparsable-modules.json file and truncate the log file."""
+        with open(self.log_path, 'a+') as log_file:
+            fcntl.flock(log_file, fcntl.LOCK_EX)
+            log_file.seek(0)
+            appended = [line.strip() for line in log_file if line.strip()]
+            if appended:
+                modules = dict.fromkeys(self._load_json())
+                modules.update(dict.fromkeys(appended))
+                tmp_path = f'{self.json_path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(list(modules), f)
+                os.replace(tmp_path, self.json_path)
+                log_file.truncate(0)
+        self._appended = 0
+
+    def modules(self) -> frozenset[str]:
+        """Return names of all the recorded modules."""
+        stats = (self._stat(self.json_path), self._stat(self.log_path))
+        if self._cached_modules is None or stats != self._cached_stats:
+            modules = set(self._load_json())
+            try:
+                with open(self.log_path, 'r') as f:
+                    modules.update(line.strip() for line in f if line.strip())
+            except FileNotFoundError:
+                pass
+            self._cached_modules = frozenset(modules)
+            self._cached_stats = stats
+        return self._cached_modules
+
+    def _load_json(self) -> list[str]:
+        try:
+            with open(self.json_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return []
+
+    @staticmethod
+    def _stat(path: str) -> tuple[int, int]:
+        try:
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            return 0, 0
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+
+_unparsable_modules_recorders: dict[str, UnparsableModulesRecorder] = {}
+
+
+def get_unparsable_modules_recorder(var_path: str) -> UnparsableModulesRecorder:
+    """Return the process-wide recorder of unparsable modules stored in the var_path directory."""
+    recorder = _unparsable_modules_recorders.get(var_path)
+    if recorder is None:
+        recorder = _unparsable_modules_recorders[var_path] = UnparsableModulesRecorder(var_path)
+    return recorder
+
+
 class ParseException(Exception):
     def __init__(self, path: t.Optional[str]):
         if path is not None:
             config = create_config()
             var_path = config.get('Directory-Section', 'var')
             self.msg = f'Failed to parse module on path {path}'
-            unparsable_modules_path = os.path.join(var_path, 'unparsable-modules.json')
-            try:
-                with open(unparsable_modules_path, 'r') as f:
-                    modules = json.load(f)
-            except (FileNotFoundError, json.decoder.JSONDecodeError):
-                modules = []
             module = path.split('/')[-1]
-            if module not in modules:
-                modules.append(module)
-            with open(unparsable_modules_path, 'w') as f:
-                json.dump(modules, f)
+            get_unparsable_modules_recorder(var_path).add(module)
 
 
 def parse(path: str) -> Statement: